@@ -0,0 +1,168 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Coalescing of the alerts repeated in a trap storm.
+
+The first alert of a storage with an alert id, resource and severity is
+exported at once, the same alerts received in the following
+alert_coalesce_window seconds are only counted. When the window is over,
+the latest of them is exported with the number of occurrences in the window
+in 'occurrence_count'. Traps identical to one already translated in the
+window are counted without being parsed by the driver again.
+"""
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+alert_coalescer_opts = [
+    cfg.IntOpt('alert_coalesce_window',
+               default=60,
+               min=0,
+               help='Seconds the repeated alerts are coalesced into one, '
+                    '0 disables the coalescing.'),
+    cfg.IntOpt('alert_coalesce_max_entries',
+               default=10000,
+               min=1,
+               help='Maximum number of alerts coalescing at the same time, '
+                    'the least recently received are closed first.'),
+]
+
+CONF.register_opts(alert_coalescer_opts)
+
+# Seconds between the exports of the coalesced alerts
+FLUSH_INTERVAL_SEC = 10
+# Trap fields changing in the resent traps, e.g. sysUpTime
+VOLATILE_TRAP_FIELDS = ('1.3.6.1.2.1.1.3.0',)
+
+
+class CoalescingAlert(object):
+    def __init__(self, alert_model, now):
+        self.alert_model = alert_model
+        self.first_seen = now
+        # Occurrences after the first one
+        self.duplicates = 0
+        self.trap_keys = set()
+
+    def summary(self):
+        alert_model = dict(self.alert_model)
+        alert_model['occurrence_count'] = self.duplicates + 1
+        return alert_model
+
+
+class AlertCoalescer(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._alerts = collections.OrderedDict()
+        # Key of the trap to the key of its alert
+        self._trap_keys = {}
+        # Closed alerts to be exported by the next flush
+        self._closed = []
+        self.stats = collections.Counter()
+
+    @staticmethod
+    def get_trap_key(alert):
+        """Key of the raw alert info of a trap."""
+        return tuple(sorted((key, value) for key, value in alert.items()
+                            if key not in VOLATILE_TRAP_FIELDS))
+
+    @staticmethod
+    def get_alert_key(alert_model):
+        return (alert_model.get('storage_id'), alert_model.get('alert_id'),
+                alert_model.get('resource_type'),
+                alert_model.get('location'), alert_model.get('severity'))
+
+    def _is_open(self, alert, now):
+        return now - alert.first_seen < CONF.alert_coalesce_window
+
+    def _close(self, key):
+        alert = self._alerts.pop(key)
+        for trap_key in alert.trap_keys:
+            self._trap_keys.pop(trap_key, None)
+        if alert.duplicates:
+            self._closed.append(alert.summary())
+
+    def count_trap(self, trap_key):
+        """Count a trap identical to one translated in the window.
+
+        :returns: True if the trap is counted and needn't be translated
+        """
+        if not CONF.alert_coalesce_window:
+            return False
+        with self._lock:
+            key = self._trap_keys.get(trap_key)
+            if key is None:
+                return False
+            alert = self._alerts[key]
+            if not self._is_open(alert, time.time()):
+                return False
+            alert.duplicates += 1
+            self._alerts.move_to_end(key)
+            self.stats['coalesced_traps'] += 1
+            return True
+
+    def add(self, alert_model, trap_key=None):
+        """Coalesce an alert translated from a trap.
+
+        :returns: the alert model if it's to be exported now, else None
+        """
+        if not CONF.alert_coalesce_window:
+            return alert_model
+        now = time.time()
+        key = self.get_alert_key(alert_model)
+        with self._lock:
+            alert = self._alerts.get(key)
+            if alert is not None and not self._is_open(alert, now):
+                self._close(key)
+                alert = None
+
+            if alert is None:
+                alert = CoalescingAlert(alert_model, now)
+                self._alerts[key] = alert
+                while len(self._alerts) > CONF.alert_coalesce_max_entries:
+                    self._close(next(iter(self._alerts)))
+                    self.stats['evicted'] += 1
+                result = alert_model
+            else:
+                alert.alert_model = alert_model
+                alert.duplicates += 1
+                self._alerts.move_to_end(key)
+                self.stats['coalesced_alerts'] += 1
+                result = None
+
+            if trap_key is not None:
+                alert.trap_keys.add(trap_key)
+                self._trap_keys[trap_key] = key
+            return result
+
+    def flush(self):
+        """Close the alerts whose window is over.
+
+        :returns: the alert models of the closed alerts with duplicates
+        """
+        now = time.time()
+        with self._lock:
+            for key, alert in list(self._alerts.items()):
+                if not self._is_open(alert, now):
+                    self._close(key)
+            closed, self._closed = self._closed, []
+        return closed
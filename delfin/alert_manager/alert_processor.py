@@ -20,6 +20,7 @@ from delfin import context
 from delfin import coordination
 from delfin import db
 from delfin import exception
+from delfin.alert_manager import alert_source_cache
 from delfin.common import alert_util
 from delfin.drivers import api as driver_manager
 from delfin.exporter import base_exporter
@@ -38,8 +39,15 @@ class AlertProcessor(object):
 
     def process_alert_info(self, alert):
         """Fills alert model using driver manager interface."""
+        alert_model = self.translate_alert(alert)
+        if alert_model:
+            self.export_alerts([alert_model])
+
+    def translate_alert(self, alert):
+        """Alert model of the trap info, None if not to be exported."""
         ctxt = context.get_admin_context()
-        storage = db.storage_get(ctxt, alert['storage_id'])
+        storage = alert_source_cache.ALERT_SOURCE_CACHE.get_storage(
+            ctxt, alert['storage_id'])
         alert_model = {}
 
         try:
@@ -58,17 +66,22 @@ class AlertProcessor(object):
         except exception.AlertSourceNotFound:
             LOG.info("Could not identify alert source from parsed alert. "
                      "Skipping the dispatch of alert")
-            return
+            return None
         except Exception as e:
             LOG.error(e)
             raise exception.InvalidResults(
                 "Failed to fill the alert model from driver.")
 
-        # Export to base exporter which handles dispatch for all exporters
-        if alert_model:
+        return alert_model
+
+    def export_alerts(self, alert_models):
+        """Export the alert models in one batch."""
+        ctxt = context.get_admin_context()
+        for alert_model in alert_models:
             LOG.info("Dispatching one SNMP Trap to {} with sn {}".format(
                 alert_model['storage_id'], alert_model['serial_number']))
-            self.exporter_manager.dispatch(ctxt, [alert_model])
+        # Export to base exporter which handles dispatch for all exporters
+        self.exporter_manager.dispatch(ctxt, alert_models)
 
     def get_storage_from_parsed_alert(self, ctxt, storage, alert_model):
         # If parse_alert sets 'serial_number' or 'storage_name' in the
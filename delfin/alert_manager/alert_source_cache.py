@@ -0,0 +1,150 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cache of the alert sources, the storages and the controllers looked up for
+every trap received.
+
+The alert sources are indexed by the ips of their hosts. They are reloaded
+when the snmp configs are synced, and the controllers of a storage when its
+controllers are synced, so traps are processed without querying the
+database unless the cache has expired.
+"""
+
+import collections
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log
+
+from delfin import db
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+alert_source_cache_opts = [
+    cfg.IntOpt('alert_source_cache_expiration',
+               default=300,
+               min=0,
+               help='Seconds the alert sources, storages and controllers '
+                    'looked up for the traps are cached, 0 disables the '
+                    'cache.'),
+]
+
+CONF.register_opts(alert_source_cache_opts)
+
+
+class AlertSourceCache(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # All alert sources and the index of them by ip
+        self._alert_sources = None
+        self._hosts = {}
+        self._loaded_at = 0
+        # storage id to (loaded time, storage)
+        self._storages = {}
+        # storage id to (loaded time, dict of mgmt ip to controller name)
+        self._controllers = {}
+        self.stats = collections.Counter()
+
+    @staticmethod
+    def _is_valid(loaded_at):
+        return time.time() - loaded_at < CONF.alert_source_cache_expiration
+
+    def _load_alert_sources(self, ctxt):
+        alert_sources = db.alert_source_get_all(ctxt)
+        hosts = collections.defaultdict(list)
+        for alert_source in alert_sources:
+            for host in (alert_source.get('host') or '').split(','):
+                if host.strip():
+                    hosts[host.strip()].append(alert_source)
+        self._alert_sources = alert_sources
+        self._hosts = dict(hosts)
+        self._loaded_at = time.time()
+        self.stats['alert_source_loads'] += 1
+
+    def get_alert_sources(self, ctxt, source_ip):
+        """Alert sources whose host contains the ip."""
+        if not CONF.alert_source_cache_expiration:
+            return db.alert_source_get_all(ctxt, filters={'host~': source_ip})
+
+        with self._lock:
+            if self._alert_sources is None \
+                    or not self._is_valid(self._loaded_at):
+                self._load_alert_sources(ctxt)
+            alert_sources = self._hosts.get(source_ip)
+            if alert_sources is None:
+                # Same as the host~ filter, for the hosts not split by comma
+                alert_sources = [alert_source for alert_source
+                                 in self._alert_sources
+                                 if source_ip in (alert_source.get('host')
+                                                  or '')]
+                self._hosts[source_ip] = alert_sources
+            return list(alert_sources)
+
+    def get_storage(self, ctxt, storage_id):
+        if not CONF.alert_source_cache_expiration:
+            return db.storage_get(ctxt, storage_id)
+
+        with self._lock:
+            loaded_at, storage = self._storages.get(storage_id, (0, None))
+            if storage is not None and self._is_valid(loaded_at):
+                return storage
+        storage = db.storage_get(ctxt, storage_id)
+        with self._lock:
+            self._storages[storage_id] = (time.time(), storage)
+        return storage
+
+    def get_controller_name(self, ctxt, storage_id, mgmt_ip):
+        """Name of the controller of the storage with the management ip."""
+        if not CONF.alert_source_cache_expiration:
+            controllers = db.controller_get_all(
+                ctxt, filters={'mgmt_ip': mgmt_ip, 'storage_id': storage_id})
+            return controllers[0].get('name') if controllers else None
+
+        with self._lock:
+            loaded_at, names = self._controllers.get(storage_id, (0, None))
+        if names is None or not self._is_valid(loaded_at):
+            names = {}
+            for controller in db.controller_get_all(
+                    ctxt, filters={'storage_id': storage_id}):
+                names.setdefault(controller.get('mgmt_ip'),
+                                 controller.get('name'))
+            with self._lock:
+                self._controllers[storage_id] = (time.time(), names)
+            self.stats['controller_loads'] += 1
+        return names.get(mgmt_ip)
+
+    def invalidate_alert_sources(self):
+        """Reload the alert sources, and the storages they belong to."""
+        with self._lock:
+            self._alert_sources = None
+            self._hosts = {}
+            self._storages.clear()
+
+    def invalidate_controllers(self, storage_id):
+        with self._lock:
+            self._controllers.pop(storage_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._alert_sources = None
+            self._hosts = {}
+            self._storages.clear()
+            self._controllers.clear()
+
+
+ALERT_SOURCE_CACHE = AlertSourceCache()
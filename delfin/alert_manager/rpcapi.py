@@ -29,9 +29,10 @@ class AlertAPI(object):
 
     API version history:
         1.0 - Initial version.
+        1.1 - Add invalidate_controller_cache.
     """
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self):
         super(AlertAPI, self).__init__()
@@ -46,6 +47,12 @@ class AlertAPI(object):
                                  snmp_config_to_del=snmp_config_to_del,
                                  snmp_config_to_add=snmp_config_to_add)
 
+    def invalidate_controller_cache(self, ctxt, storage_id):
+        call_context = self.client.prepare(version='1.1', fanout=True)
+        return call_context.cast(ctxt,
+                                 'invalidate_controller_cache',
+                                 storage_id=storage_id)
+
     def check_snmp_config(self, ctxt, snmp_config):
         call_context = self.client.prepare(version='1.0')
         return call_context.cast(ctxt,
@@ -0,0 +1,164 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Queue of the traps received, processed by a pool of workers.
+
+The snmp dispatcher only decodes a trap and puts it in the queue, so the
+translation and the export of the alerts never delay reading the traps
+from the socket. The traps of one source are handled by the same worker in
+the order they are received, and the alerts of the traps a worker has
+taken together are exported in one batch.
+"""
+
+import collections
+import queue
+import threading
+import zlib
+
+from oslo_config import cfg
+from oslo_log import log
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+trap_queue_opts = [
+    cfg.IntOpt('trap_queue_size',
+               default=10000,
+               min=1,
+               help='Maximum number of traps waiting to be processed, the '
+                    'traps received when the queue is full are dropped.'),
+    cfg.IntOpt('trap_workers',
+               default=8,
+               min=1,
+               help='Number of workers translating and exporting the '
+                    'traps.'),
+    cfg.IntOpt('trap_export_batch_size',
+               default=100,
+               min=1,
+               help='Maximum number of alerts exported in one batch.'),
+]
+
+CONF.register_opts(trap_queue_opts)
+
+_STOP = object()
+# Log every this many dropped traps
+DROP_LOG_INTERVAL = 1000
+STATS_LOG_INTERVAL_SEC = 600
+
+
+class TrapQueue(object):
+    """Bounded queues of the traps, one per worker.
+
+    :param translate: called with a trap by a worker, returns the alert
+                      model to export or None
+    :param export: called with a list of alert models
+    """
+
+    def __init__(self, translate, export):
+        self._translate = translate
+        self._export = export
+        self._workers = []
+        self._queues = []
+        self._lock = threading.Lock()
+        self.stats = collections.Counter()
+
+    def start(self):
+        worker_count = CONF.trap_workers
+        # The bound is shared by the queues of the workers
+        maxsize = -(-CONF.trap_queue_size // worker_count)
+        self._queues = [queue.Queue(maxsize=maxsize)
+                        for _ in range(worker_count)]
+        for trap_queue in self._queues:
+            worker = threading.Thread(target=self._work, args=(trap_queue,))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+        LOG.info('Started %d trap workers', worker_count)
+
+    def stop(self, timeout=None):
+        """Process the traps queued and stop the workers."""
+        for trap_queue in self._queues:
+            trap_queue.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+        self._queues = []
+
+    def put(self, source, trap):
+        """Queue a trap to be processed after the former ones of the source.
+
+        :returns: False if the trap is dropped as the queue is full
+        """
+        trap_queue = self._queues[zlib.crc32(source.encode('utf-8'))
+                                  % len(self._queues)]
+        try:
+            trap_queue.put_nowait(trap)
+        except queue.Full:
+            with self._lock:
+                self.stats['dropped'] += 1
+                dropped = self.stats['dropped']
+            if dropped % DROP_LOG_INTERVAL == 1:
+                LOG.warning('Trap queue is full, %d traps dropped so far',
+                            dropped)
+            return False
+        with self._lock:
+            self.stats['received'] += 1
+        return True
+
+    def _get_batch(self, trap_queue):
+        batch = [trap_queue.get()]
+        while batch[-1] is not _STOP \
+                and len(batch) < CONF.trap_export_batch_size:
+            try:
+                batch.append(trap_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self, trap_queue):
+        stopped = False
+        while not stopped:
+            alerts = []
+            failed = 0
+            for trap in self._get_batch(trap_queue):
+                if trap is _STOP:
+                    stopped = True
+                    continue
+                try:
+                    alert = self._translate(trap)
+                except Exception as e:
+                    failed += 1
+                    LOG.exception('Failed to process trap: %s', e)
+                    continue
+                if alert:
+                    alerts.append(alert)
+
+            if alerts:
+                try:
+                    self._export(alerts)
+                except Exception as e:
+                    failed += len(alerts)
+                    alerts = []
+                    LOG.exception('Failed to export alerts: %s', e)
+            with self._lock:
+                self.stats['exported'] += len(alerts)
+                self.stats['failed'] += failed
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats['queued'] = sum(trap_queue.qsize()
+                              for trap_queue in self._queues)
+        return stats
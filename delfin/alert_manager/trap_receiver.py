@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import socket
+
 import six
+from oslo_config import cfg
 from oslo_log import log
 from oslo_service import periodic_task
 from oslo_utils import encodeutils
@@ -23,25 +26,29 @@ from pysnmp.proto.api import v2c
 from pysnmp.smi import builder, view
 from retrying import retry
 
-from delfin import context, cryptor
+from delfin import context, coordination, cryptor
 from delfin import db
 from delfin import exception
 from delfin import manager
+from delfin.alert_manager import alert_coalescer
 from delfin.alert_manager import alert_processor
+from delfin.alert_manager import alert_source_cache
 from delfin.alert_manager import constants
 from delfin.alert_manager import rpcapi
 from delfin.alert_manager import snmp_validator
+from delfin.alert_manager import trap_queue
 from delfin.common import constants as common_constants
 from delfin.db import api as db_api
 from delfin.i18n import _
 
 LOG = log.getLogger(__name__)
+CONF = cfg.CONF
 
 
 class TrapReceiver(manager.Manager):
     """Trap listening and processing functions"""
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self, service_name=None, *args, **kwargs):
         self.mib_view_controller = kwargs.get('mib_view_controller')
@@ -51,6 +58,9 @@ class TrapReceiver(manager.Manager):
         self.alert_processor = alert_processor.AlertProcessor()
         self.snmp_validator = snmp_validator.SNMPValidator()
         self.alert_rpc_api = rpcapi.AlertAPI()
+        self.alert_coalescer = alert_coalescer.AlertCoalescer()
+        self.trap_queue = None
+        self.heart_beat_lock = None
         super(TrapReceiver, self).__init__(host=kwargs.get('host'))
 
     def sync_snmp_config(self, ctxt, snmp_config_to_del=None,
@@ -58,10 +68,17 @@ class TrapReceiver(manager.Manager):
         if snmp_config_to_del:
             self._delete_snmp_config(ctxt, snmp_config_to_del)
 
+        # The alert sources are changed, reload them for the next trap
+        alert_source_cache.ALERT_SOURCE_CACHE.invalidate_alert_sources()
+
         if snmp_config_to_add:
             self.snmp_validator.validate(ctxt, snmp_config_to_add)
             self._add_snmp_config(ctxt, snmp_config_to_add)
 
+    def invalidate_controller_cache(self, ctxt, storage_id):
+        alert_source_cache.ALERT_SOURCE_CACHE.invalidate_controllers(
+            storage_id)
+
     def _add_snmp_config(self, ctxt, new_config):
         storage_id = new_config.get("storage_id")
         LOG.info("Start to add snmp trap config for storage: %s",
@@ -176,10 +193,16 @@ class TrapReceiver(manager.Manager):
     def _add_transport(self):
         """Configures the transport parameters for the snmp engine."""
         try:
+            transport = udp.UdpTransport()
+            if CONF.trap_receiver_workers > 1:
+                # The worker processes bind the same port, the kernel
+                # balances the traps between their sockets by source
+                transport.socket.setsockopt(socket.SOL_SOCKET,
+                                            socket.SO_REUSEPORT, 1)
             config.addTransport(
                 self.snmp_engine,
                 udp.domainName,
-                udp.UdpTransport().openServerMode(
+                transport.openServerMode(
                     (self.trap_receiver_address, int(self.trap_receiver_port)))
             )
         except Exception as e:
@@ -190,11 +213,11 @@ class TrapReceiver(manager.Manager):
     @staticmethod
     def _get_alert_source_by_host(source_ip):
         """Gets alert source for given source ip address."""
-        filters = {'host~': source_ip}
         ctxt = context.RequestContext()
 
         # Using the known filter and db exceptions are handled by api
-        alert_sources = db.alert_source_get_all(ctxt, filters=filters)
+        alert_sources = alert_source_cache.ALERT_SOURCE_CACHE \
+            .get_alert_sources(ctxt, source_ip)
         if not alert_sources:
             raise exception.AlertSourceNotFoundWithHost(source_ip)
 
@@ -204,13 +227,16 @@ class TrapReceiver(manager.Manager):
             # Clear invalid alert_source
             for alert_source in alert_sources:
                 try:
-                    db.storage_get(ctxt, alert_source['storage_id'])
+                    alert_source_cache.ALERT_SOURCE_CACHE.get_storage(
+                        ctxt, alert_source['storage_id'])
                 except exception.StorageNotFound:
                     LOG.warning('Found redundancy alert source for storage %s'
                                 % alert_source['storage_id'])
                     try:
                         db.alert_source_delete(
                             ctxt, alert_source['storage_id'])
+                        alert_source_cache.ALERT_SOURCE_CACHE \
+                            .invalidate_alert_sources()
                     except Exception as e:
                         LOG.warning('Delete the invalid alert source failed, '
                                     'reason is %s' % six.text_type(e))
@@ -228,16 +254,34 @@ class TrapReceiver(manager.Manager):
 
     def _cb_fun(self, state_reference, context_engine_id, context_name,
                 var_binds, cb_ctx):
-        """Callback function to process the incoming trap."""
+        """Callback function to queue the incoming trap."""
         exec_context = self.snmp_engine.observer.getExecutionContext(
             'rfc3412.receiveMessage:request')
         LOG.debug("Get notification from: %s" %
                   "#".join([str(x) for x in exec_context['transportAddress']]))
-        alert = {}
 
         try:
             # transportAddress contains both ip and port, extract ip address
             source_ip = exec_context['transportAddress'][0]
+            trap = {
+                'source_ip': source_ip,
+                'security_model': exec_context['securityModel'],
+                'context_name': str(context_name),
+                # Raw oid and values
+                'var_binds': [(str(oid), str(val)) for oid, val in var_binds],
+            }
+            # Processed by the workers, the dispatcher goes on reading
+            self.trap_queue.put(source_ip, trap)
+        except Exception as e:
+            err_msg = six.text_type(e)
+            LOG.exception(err_msg)
+
+    def _translate_trap(self, trap):
+        """Translate a trap queued by _cb_fun to the alert model."""
+        alert = {}
+
+        try:
+            source_ip = trap['source_ip']
             alert_source = self._get_alert_source_by_host(source_ip)
 
             # In case of non v3 version, community string is used to map the
@@ -248,30 +292,38 @@ class TrapReceiver(manager.Manager):
             # verify that community name is configured at alert source db for
             # the storage which is sending traps.
             # context_name contains the incoming community string value
-            if exec_context['securityModel'] != constants.SNMP_V3_INT \
+            if trap['security_model'] != constants.SNMP_V3_INT \
                     and cryptor.decode(alert_source['community_string']) \
-                    != str(context_name):
+                    != trap['context_name']:
                 msg = (_("Community string not matching with alert source %s, "
                          "dropping it.") % source_ip)
                 raise exception.InvalidResults(msg)
 
-            for oid, val in var_binds:
+            for oid_str, val_str in trap['var_binds']:
                 # Fill raw oid and values
-                oid_str = str(oid)
-                alert[oid_str] = str(val)
+                alert[oid_str] = val_str
 
             # Fill additional info to alert info
             alert['transport_address'] = source_ip
             alert['storage_id'] = alert_source['storage_id']
-            filters = {'mgmt_ip': source_ip,
-                       'storage_id': alert_source['storage_id']}
             ctxt = context.RequestContext()
-            controllers = db.controller_get_all(ctxt, filters=filters)
-            if controllers:
-                alert['controller_name'] = controllers[0].get('name')
-
-            # Handover to alert processor for model translation and export
-            self.alert_processor.process_alert_info(alert)
+            controller_name = alert_source_cache.ALERT_SOURCE_CACHE \
+                .get_controller_name(ctxt, alert_source['storage_id'],
+                                     source_ip)
+            if controller_name:
+                alert['controller_name'] = controller_name
+
+            # A resent trap of an alert coalescing needn't be parsed again
+            trap_key = self.alert_coalescer.get_trap_key(alert)
+            if self.alert_coalescer.count_trap(trap_key):
+                return None
+
+            # Handover to alert processor for model translation, the alerts
+            # are exported in batches by the trap queue
+            alert_model = self.alert_processor.translate_alert(alert)
+            if not alert_model:
+                return None
+            return self.alert_coalescer.add(alert_model, trap_key)
         except exception.DelfinException as e:
             # Log and end the trap processing error flow
             err_msg = _("Failed to process alert report (%s).") % e.msg
@@ -279,6 +331,7 @@ class TrapReceiver(manager.Manager):
         except Exception as e:
             err_msg = six.text_type(e)
             LOG.exception(err_msg)
+        return None
 
     def _load_snmp_config(self):
         """Load snmp config from database when service start."""
@@ -310,6 +363,11 @@ class TrapReceiver(manager.Manager):
 
             self._load_snmp_config()
 
+            if self.trap_queue is None:
+                self.trap_queue = trap_queue.TrapQueue(
+                    self._translate_trap, self.alert_processor.export_alerts)
+                self.trap_queue.start()
+
             # Register callback for notification receiver
             ntfrcv.NotificationReceiver(snmp_engine, self._cb_fun)
 
@@ -335,11 +393,63 @@ class TrapReceiver(manager.Manager):
         # process as it is shutdown
         if self.snmp_engine:
             self.snmp_engine.transportDispatcher.closeDispatcher()
+        if self.trap_queue:
+            self.trap_queue.stop()
+            self.trap_queue = None
+        if self.heart_beat_lock:
+            try:
+                self.heart_beat_lock.release()
+            except Exception as e:
+                LOG.warning('Failed to release the snmp heart beat lock: '
+                            '%s', e)
+            self.heart_beat_lock = None
         LOG.info("Trap receiver stopped.")
 
+    @periodic_task.periodic_task(
+        spacing=alert_coalescer.FLUSH_INTERVAL_SEC)
+    def flush_coalesced_alerts(self, ctxt):
+        """Periodical task to export the alerts coalesced in a window."""
+        alert_models = self.alert_coalescer.flush()
+        if alert_models:
+            LOG.info("Exporting %d coalesced alerts.", len(alert_models))
+            self.alert_processor.export_alerts(alert_models)
+
+    def _is_heart_beat_worker(self):
+        """Whether this worker spawns the snmp heart beat checks of the host.
+
+        With several trap receiver workers, the one holding the heart beat
+        lock of the host spawns them, another worker takes the lock over
+        when it is gone.
+        """
+        if CONF.trap_receiver_workers <= 1:
+            return True
+        if self.heart_beat_lock is not None:
+            return True
+        try:
+            lock = coordination.Lock('trap-receiver-heart-beat-{host}',
+                                     {'host': self.host})
+            if not lock.acquire(blocking=False):
+                return False
+        except Exception as e:
+            LOG.warning('Failed to get the snmp heart beat lock, spawn the '
+                        'checks anyway: %s', e)
+            return True
+        # Kept for the life of the worker
+        self.heart_beat_lock = lock
+        return True
+
+    @periodic_task.periodic_task(spacing=trap_queue.STATS_LOG_INTERVAL_SEC)
+    def log_trap_stats(self, ctxt):
+        """Periodical task to log the traps processed by this worker."""
+        if self.trap_queue:
+            LOG.info("Trap queue: %s", self.trap_queue.get_stats())
+
     @periodic_task.periodic_task(spacing=1800, run_immediately=True)
     def heart_beat_task_spawn(self, ctxt):
         """Periodical task to spawn snmp heart beat check."""
+        if not self._is_heart_beat_worker():
+            LOG.debug("Snmp heart beat checks spawned by another worker.")
+            return
         LOG.info("Spawn the snmp heart beat check task.")
         alert_source_list = db.alert_source_get_all(ctxt)
         for alert_source in alert_source_list:
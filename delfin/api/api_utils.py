@@ -14,12 +14,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 import six
+import webob
 
 from oslo_config import cfg
 from oslo_log import log
+from oslo_serialization import jsonutils
 from oslo_utils import strutils
 
 from delfin.common import constants
+from delfin.common import sqlalchemyutils
 from delfin import exception
 from delfin.i18n import _
 
@@ -28,7 +31,11 @@ api_common_opts = [
                default=1000,
                help='The maximum number of items that a collection '
                     'resource returns in a single response'),
-
+    cfg.IntOpt('api_stream_chunk_size',
+               default=100,
+               min=1,
+               help='The number of items serialized in one chunk of a '
+                    'streamed collection response'),
 ]
 
 CONF = cfg.CONF
@@ -36,6 +43,11 @@ CONF.register_opts(api_common_opts)
 
 LOG = log.getLogger(__name__)
 
+JSON_CONTENT_TYPE = 'application/json'
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+# Streamed lists are not limited unless the limit param is given
+STREAM_MAX_LIMIT = constants.DB_MAX_INT
+
 
 def remove_invalid_options(context, search_options, allowed_search_options):
     """Remove search options that are not valid for API/context."""
@@ -64,12 +76,38 @@ def validate_integer(value, name, min_value=None, max_value=None):
         raise exception.InvalidInput(six.text_type(e))
 
 
+def get_stream_param(req, params):
+    """Extract the stream mode of a list request.
+
+    The list is streamed when the 'stream' param is true, or when the client
+    accepts application/x-ndjson, one item per line, rather than JSON.
+
+    :param req: `wsgi.Request` of the list
+    :param params: `wsgi.Request`'s GET dictionary
+    :returns: content type of the streamed list, or None if not streamed
+    """
+    stream = params.pop('stream', None)
+    content_type = req.accept.best_match([JSON_CONTENT_TYPE,
+                                          NDJSON_CONTENT_TYPE])
+    if content_type == NDJSON_CONTENT_TYPE:
+        return NDJSON_CONTENT_TYPE
+    try:
+        if stream is not None and strutils.bool_from_string(stream,
+                                                            strict=True):
+            return JSON_CONTENT_TYPE
+    except ValueError as e:
+        raise exception.InvalidInput(six.text_type(e))
+    return None
+
+
 def get_pagination_params(params, max_limit=None):
     """Return marker, limit, offset tuple from request.
 
     :param params: `wsgi.Request`'s GET dictionary, possibly containing
-                   'marker',  'limit', and 'offset' variables. 'marker' is the
-                   id of the last element the client has seen, 'limit' is the
+                   'marker', 'cursor', 'limit', and 'offset' variables.
+                   'marker' is the id of the last element the client has seen,
+                   'cursor' is the next_cursor of the previous page and
+                   replaces the marker, 'limit' is the
                    maximum number of items to return and 'offset' is the number
                    of items to skip from the marker or from the first element.
                    If 'limit' is not specified, or > max_limit, we default to
@@ -107,8 +145,35 @@ def _get_limit_param(params, max_limit=None):
 
 
 def _get_marker_param(params):
-    """Extract marker id from request's dictionary (defaults to None)."""
-    return params.pop('marker', None)
+    """Extract marker id or cursor from request's dictionary (defaults to
+    None).
+    """
+    marker = params.pop('marker', None)
+    cursor = params.pop('cursor', None)
+    if cursor is None:
+        return marker
+    if marker is not None:
+        msg = _('marker and cursor params can not be used together')
+        raise exception.InvalidInput(msg)
+    return sqlalchemyutils.Cursor.decode(cursor)
+
+
+def set_next_cursor(view, items, limit, sort_keys, sort_dirs):
+    """Add the cursor of the next page to the view of a list.
+
+    The cursor is the position of the last item, and is added only when
+    the page is full, i.e. there may be more items.
+
+    :param view: dict view of the items
+    :param items: items of the page, sorted by sort_keys and then id
+    :returns: the view
+    """
+    if limit and len(items) >= limit:
+        sort_keys, sort_dirs = sqlalchemyutils.get_sort_params(sort_keys,
+                                                               sort_dirs)
+        view['next_cursor'] = sqlalchemyutils.Cursor.from_item(
+            items[-1], sort_keys, sort_dirs).encode()
+    return view
 
 
 def _get_offset_param(params):
@@ -157,3 +222,64 @@ def get_sort_params(params, default_key='created_at', default_dir='desc'):
         sort_keys.append(sort_key.strip())
         sort_dirs.append(sort_dir.strip())
     return sort_keys, sort_dirs
+
+
+def _iter_chunks(items, build_view):
+    chunk = []
+    for item in items:
+        chunk.append(jsonutils.dumps(build_view(item)))
+        if len(chunk) >= CONF.api_stream_chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _iter_json(collection, items, build_view):
+    yield ('{"%s": [' % collection).encode('utf-8')
+    separator = ''
+    for chunk in _iter_chunks(items, build_view):
+        yield (separator + ', '.join(chunk)).encode('utf-8')
+        separator = ', '
+    yield b']}'
+
+
+def _iter_ndjson(items, build_view):
+    for chunk in _iter_chunks(items, build_view):
+        yield ''.join(line + '\n' for line in chunk).encode('utf-8')
+
+
+def _log_stream_error(body):
+    try:
+        for data in body:
+            yield data
+    except Exception:
+        # The status is sent already, the client sees a truncated body
+        LOG.exception('Failed to stream the response')
+        raise
+
+
+def stream_list(req, collection, items, build_view, content_type):
+    """Response streaming the views of a list of items.
+
+    Each item is serialized as soon as it is iterated, and the body is sent
+    in chunks with chunked transfer encoding, so neither the items nor the
+    body are ever all in memory.
+
+    :param collection: name of the list, e.g. volumes
+    :param items: iterator of the items, e.g. db.resource_get_all_iter
+    :param build_view: builds the view of an item
+    :param content_type: application/json for the same body as the list
+                         response, application/x-ndjson for one item per line
+    :returns: webob.Response
+    """
+    if content_type == NDJSON_CONTENT_TYPE:
+        body = _iter_ndjson(items, build_view)
+    else:
+        body = _iter_json(collection, items, build_view)
+    response = webob.Response(app_iter=_log_stream_error(body),
+                              content_type=content_type, charset=None)
+    context = req.environ.get('delfin.context')
+    if context:
+        response.headers['x-compute-request-id'] = context.request_id
+    return response
@@ -754,6 +754,7 @@ class Resource(wsgi.Application):
             # Run post-processing extensions
             if resp_obj:
                 _set_request_id_header(request, resp_obj)
+                _set_etag_header(request, resp_obj)
                 # Do a preserialize to set up the response object
                 serializers = getattr(meth, 'wsgi_serializers', {})
                 resp_obj._bind_method_serializers(serializers)
@@ -968,3 +969,9 @@ def _set_request_id_header(req, headers):
     context = req.environ.get('delfin.context')
     if context:
         headers['x-compute-request-id'] = context.request_id
+
+
+def _set_etag_header(req, headers):
+    etag = req.environ.get('delfin.etag')
+    if etag:
+        headers['ETag'] = '"%s"' % etag
@@ -0,0 +1,149 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Conditional GET and caching of the inventory list responses.
+
+The resources of a storage only change when a resource sync of the storage
+writes changes, which increases the generation of the storage. The ETag of
+a list is the hash of the request and the generations of the storages it
+lists, so a poll of an unchanged list is answered with 304 Not Modified if
+the client sends the ETag back in If-None-Match, or else from the cache
+without querying the resources.
+"""
+
+import collections
+import functools
+import hashlib
+import json
+import threading
+
+import webob
+from oslo_config import cfg
+from oslo_log import log
+
+from delfin import db
+from delfin.api import api_utils
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+response_cache_opts = [
+    cfg.IntOpt('api_response_cache_size',
+               default=256,
+               min=0,
+               help='Maximum number of the inventory list responses cached '
+                    'by the API, 0 disables the ETag and the cache'),
+]
+
+CONF.register_opts(response_cache_opts)
+
+
+class ResponseCache(object):
+    """Views of the list responses keyed by their ETag, least recently
+    used are evicted first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = collections.OrderedDict()
+
+    def get(self, etag):
+        with self._lock:
+            view = self._views.get(etag)
+            if view is not None:
+                self._views.move_to_end(etag)
+            return view
+
+    def set(self, etag, view):
+        with self._lock:
+            self._views[etag] = view
+            self._views.move_to_end(etag)
+            while len(self._views) > CONF.api_response_cache_size:
+                self._views.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def _is_stream(req):
+    try:
+        return api_utils.get_stream_param(req, dict(req.GET)) is not None
+    except Exception:
+        # Leave the invalid param to the action
+        return True
+
+
+def _get_etag(req, storage_id, storage_changes):
+    ctxt = req.environ['delfin.context']
+    generations = db.storage_generations_get(ctxt, storage_id)
+    if not storage_changes:
+        # The list of the resources doesn't change with the storages
+        generations = [(id, generation, deleted)
+                       for id, generation, updated_at, deleted
+                       in generations]
+    state = [req.path, sorted(req.GET.items()), generations]
+    return hashlib.sha1(json.dumps(state, default=str)
+                        .encode('utf-8')).hexdigest()
+
+
+def _not_modified(req, etag):
+    response = webob.Response(status=304)
+    response.etag = etag
+    ctxt = req.environ.get('delfin.context')
+    if ctxt:
+        response.headers['x-compute-request-id'] = ctxt.request_id
+    return response
+
+
+def conditional(scoped=False, storage_changes=False):
+    """Decorator of the list actions answering conditional GET.
+
+    :param scoped: the id of the action is the id of the storage listed,
+                   e.g. /storages/{id}/masking-views
+    :param storage_changes: the list also changes when the storages are
+                            updated, e.g. the list of the storages
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, req, *args, **kwargs):
+            if CONF.api_response_cache_size <= 0 or _is_stream(req):
+                return func(self, req, *args, **kwargs)
+
+            storage_id = req.GET.get('storage_id',
+                                     kwargs.get('id') if scoped else None)
+            try:
+                etag = _get_etag(req, storage_id, storage_changes)
+            except Exception as e:
+                LOG.warning('Failed to get the ETag of %s: %s', req.path, e)
+                return func(self, req, *args, **kwargs)
+
+            if etag in req.if_none_match:
+                return _not_modified(req, etag)
+
+            view = RESPONSE_CACHE.get(etag)
+            if view is None:
+                view = func(self, req, *args, **kwargs)
+                RESPONSE_CACHE.set(etag, view)
+            # Set as the ETag header of the response by wsgi.Resource
+            req.environ['delfin.etag'] = etag
+            return view
+
+        return wrapper
+
+    return decorator
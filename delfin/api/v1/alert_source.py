@@ -70,9 +70,10 @@ class AlertSourceController(wsgi.Controller):
 
         snmp_config_to_del = self._get_snmp_config_brief(ctx, id)
         if snmp_config_to_del is not None:
+            # Deleted before the trap receivers reload the alert sources
+            db.alert_source_delete(ctx, id)
             self.alert_rpcapi.sync_snmp_config(ctx, snmp_config_to_del,
                                                None)
-            db.alert_source_delete(ctx, id)
         else:
             raise exception.AlertSourceNotFound(id)
 
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import controllers as controller_view
 
@@ -29,20 +30,33 @@ class ControllerController(wsgi.Controller):
         """Return controllers search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional()
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(
             ctxt, query_params, self._get_controllers_search_options())
 
+        if stream:
+            controllers = db.resource_get_all_iter(
+                ctxt, 'controllers', marker, limit, sort_keys, sort_dirs,
+                query_params, offset)
+            return api_utils.stream_list(
+                req, 'controllers', controllers,
+                controller_view.build_controller, stream)
+
         controllers = db.controller_get_all(ctxt, marker, limit, sort_keys,
                                             sort_dirs, query_params, offset)
-        return controller_view.build_controllers(controllers)
+        view = controller_view.build_controllers(controllers)
+        return api_utils.set_next_cursor(view, controllers, limit,
+                                         sort_keys, sort_dirs)
 
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import masking_views
 
@@ -34,21 +35,34 @@ class MaskingViewController(wsgi.Controller):
         """Return masking view search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional(scoped=True)
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
         query_params = {"storage_id": id}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # Update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # Strip out options except supported search  options
         api_utils.remove_invalid_options(
             ctxt, query_params, self._get_masking_view_search_options())
 
+        if stream:
+            masking_view_lists = db.resource_get_all_iter(
+                ctxt, 'masking_views', marker, limit, sort_keys, sort_dirs,
+                query_params, offset)
+            return api_utils.stream_list(
+                req, 'masking_views', masking_view_lists,
+                masking_views.build_masking_view, stream)
+
         masking_view_lists = db.masking_views_get_all(ctxt, marker, limit,
                                                       sort_keys, sort_dirs,
                                                       query_params, offset)
-        return masking_views.build_masking_views(masking_view_lists)
+        view = masking_views.build_masking_views(masking_view_lists)
+        return api_utils.set_next_cursor(view, masking_view_lists, limit,
+                                         sort_keys, sort_dirs)
 
 
 def create_resource():
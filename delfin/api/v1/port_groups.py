@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import port_groups as port_group_view
 
@@ -29,6 +30,7 @@ class PortGroupController(wsgi.Controller):
         """Return port group search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional(scoped=True)
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
         query_params = {"storage_id": id}
@@ -58,7 +60,9 @@ class PortGroupController(wsgi.Controller):
 
             port_group['ports'] = native_port_id_list
 
-        return port_group_view.build_port_groups(port_groups)
+        view = port_group_view.build_port_groups(port_groups)
+        return api_utils.set_next_cursor(view, port_groups, limit,
+                                         sort_keys, sort_dirs)
 
 
 def create_resource():
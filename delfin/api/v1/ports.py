@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import ports as port_view
 
@@ -29,20 +30,32 @@ class PortController(wsgi.Controller):
         """Return ports search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional()
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(ctxt, query_params,
                                          self._get_ports_search_options())
 
+        if stream:
+            ports = db.resource_get_all_iter(
+                ctxt, 'ports', marker, limit, sort_keys, sort_dirs,
+                query_params, offset)
+            return api_utils.stream_list(
+                req, 'ports', ports, port_view.build_port, stream)
+
         ports = db.port_get_all(ctxt, marker, limit, sort_keys,
                                 sort_dirs, query_params, offset)
-        return port_view.build_ports(ports)
+        view = port_view.build_ports(ports)
+        return api_utils.set_next_cursor(view, ports, limit,
+                                         sort_keys, sort_dirs)
 
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
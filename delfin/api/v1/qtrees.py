@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import qtrees as qtree_view
 
@@ -30,20 +31,32 @@ class QtreeController(wsgi.Controller):
         """Return qtrees search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional()
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(ctxt, query_params,
                                          self._get_qtrees_search_options())
 
+        if stream:
+            qtrees = db.resource_get_all_iter(
+                ctxt, 'qtrees', marker, limit, sort_keys, sort_dirs,
+                query_params, offset)
+            return api_utils.stream_list(
+                req, 'qtrees', qtrees, qtree_view.build_qtree, stream)
+
         qtrees = db.qtree_get_all(ctxt, marker, limit, sort_keys,
                                   sort_dirs, query_params, offset)
-        return qtree_view.build_qtrees(qtrees)
+        view = qtree_view.build_qtrees(qtrees)
+        return api_utils.set_next_cursor(view, qtrees, limit,
+                                         sort_keys, sort_dirs)
 
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
@@ -57,6 +57,11 @@ class APIRouter(common.APIRouter):
                        action="get_capabilities",
                        conditions={"method": ["GET"]})
 
+        mapper.connect("storages", "/storages/{id}/sync-states",
+                       controller=self.resources['storages'],
+                       action="get_sync_states",
+                       conditions={"method": ["GET"]})
+
         self.resources['access_info'] = access_info.create_resource()
         mapper.connect("storages", "/storages/{id}/access-info",
                        controller=self.resources['access_info'],
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import storage_host_groups as storage_host_group_view
 
@@ -29,6 +30,7 @@ class StorageHostGroupController(wsgi.Controller):
         """Return storage host group search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional(scoped=True)
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
         query_params = {"storage_id": id}
@@ -59,8 +61,10 @@ class StorageHostGroupController(wsgi.Controller):
 
             host_group['storage_hosts'] = native_storage_host_id_list
 
-        return storage_host_group_view\
-            .build_storage_host_groups(storage_host_groups)
+        view = storage_host_group_view.build_storage_host_groups(
+            storage_host_groups)
+        return api_utils.set_next_cursor(view, storage_host_groups, limit,
+                                         sort_keys, sort_dirs)
 
 
 def create_resource():
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import storage_host_initiators as \
     storage_host_initiator_view
@@ -31,22 +32,36 @@ class StorageHostInitiatorController(wsgi.Controller):
         """Return storage host initiator search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional(scoped=True)
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
         query_params = {"storage_id": id}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # Update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # Strip out options except supported search  options
         api_utils.remove_invalid_options(
             ctxt, query_params,
             self._get_storage_host_initiator_search_options())
 
+        if stream:
+            storage_host_initiators = db.resource_get_all_iter(
+                ctxt, 'storage_host_initiators', marker, limit, sort_keys,
+                sort_dirs, query_params, offset)
+            return api_utils.stream_list(
+                req, 'storage_host_initiators', storage_host_initiators,
+                storage_host_initiator_view.build_storage_host_initiator,
+                stream)
+
         storage_host_initiators = db.storage_host_initiators_get_all(
             ctxt, marker, limit, sort_keys, sort_dirs, query_params, offset)
-        return storage_host_initiator_view.build_storage_host_initiators(
+        view = storage_host_initiator_view.build_storage_host_initiators(
             storage_host_initiators)
+        return api_utils.set_next_cursor(view, storage_host_initiators, limit,
+                                         sort_keys, sort_dirs)
 
 
 def create_resource():
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import storage_hosts as storage_host_view
 
@@ -42,6 +43,7 @@ class StorageHostController(wsgi.Controller):
                 storage_host_initiator['native_storage_host_initiator_id'])
         return storage_host_initiator_list
 
+    @response_cache.conditional(scoped=True)
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
         query_params = {"storage_id": id}
@@ -60,7 +62,9 @@ class StorageHostController(wsgi.Controller):
             storage_host['storage_host_initiators'] \
                 = self._fill_storage_host_initiators(ctxt, storage_host, id)
 
-        return storage_host_view.build_storage_hosts(storage_hosts)
+        view = storage_host_view.build_storage_hosts(storage_hosts)
+        return api_utils.set_next_cursor(view, storage_hosts, limit,
+                                         sort_keys, sort_dirs)
 
 
 def create_resource():
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import storage_pools as storage_pool_view
 
@@ -33,20 +34,33 @@ class StoragePoolController(wsgi.Controller):
         pool = db.storage_pool_get(ctxt, id)
         return storage_pool_view.build_storage_pool(pool)
 
+    @response_cache.conditional()
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(
             ctxt, query_params, self._get_storage_pools_search_options())
 
+        if stream:
+            storage_pools = db.resource_get_all_iter(
+                ctxt, 'storage_pools', marker, limit, sort_keys, sort_dirs,
+                query_params, offset)
+            return api_utils.stream_list(
+                req, 'storage_pools', storage_pools,
+                storage_pool_view.build_storage_pool, stream)
+
         storage_pools = db.storage_pool_get_all(
             ctxt, marker, limit, sort_keys, sort_dirs, query_params, offset)
-        return storage_pool_view.build_storage_pools(storage_pools)
+        view = storage_pool_view.build_storage_pools(storage_pools)
+        return api_utils.set_next_cursor(view, storage_pools, limit,
+                                         sort_keys, sort_dirs)
 
 
 def create_resource():
@@ -23,6 +23,7 @@ from delfin import coordination
 from delfin import db
 from delfin import exception
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api import validation
 from delfin.api.common import wsgi
 from delfin.api.schemas import storages as schema_storages
@@ -50,20 +51,32 @@ class StorageController(wsgi.Controller):
         """Return storages search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional(storage_changes=True)
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(ctxt, query_params,
                                          self._get_storages_search_options())
 
+        if stream:
+            storages = db.resource_get_all_iter(
+                ctxt, 'storages', marker, limit, sort_keys, sort_dirs,
+                query_params, offset)
+            return api_utils.stream_list(
+                req, 'storages', storages, storage_view.build_storage, stream)
+
         storages = db.storage_get_all(ctxt, marker, limit, sort_keys,
                                       sort_dirs, query_params, offset)
-        return storage_view.build_storages(storages)
+        view = storage_view.build_storages(storages)
+        return api_utils.set_next_cursor(view, storages, limit,
+                                         sort_keys, sort_dirs)
 
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
@@ -128,11 +141,9 @@ class StorageController(wsgi.Controller):
         ctxt = req.environ['delfin.context']
         storage = db.storage_get(ctxt, id)
 
-        for subclass in resources.StorageResourceTask.__subclasses__():
+        for resource_task in _get_resource_tasks():
             self.task_rpcapi.remove_storage_resource(
-                ctxt,
-                storage['id'],
-                subclass.__module__ + '.' + subclass.__name__)
+                ctxt, storage['id'], resource_task)
 
         self.task_rpcapi.remove_storage_in_cache(ctxt, storage['id'])
         perf_job_controller.delete_perf_job(ctxt, storage['id'])
@@ -160,12 +171,8 @@ class StorageController(wsgi.Controller):
                             % (storage['id'], e.msg))
                 continue
             else:
-                for subclass in \
-                        resources.StorageResourceTask.__subclasses__():
-                    self.task_rpcapi.sync_storage_resource(
-                        ctxt,
-                        storage['id'],
-                        subclass.__module__ + '.' + subclass.__name__)
+                self.task_rpcapi.sync_storage_resources(
+                    ctxt, storage['id'], _get_resource_tasks())
 
     @wsgi.response(202)
     def sync(self, req, id):
@@ -178,11 +185,8 @@ class StorageController(wsgi.Controller):
         storage = db.storage_get(ctxt, id)
         resource_count = len(resources.StorageResourceTask.__subclasses__())
         _set_synced_if_ok(ctxt, storage['id'], resource_count)
-        for subclass in resources.StorageResourceTask.__subclasses__():
-            self.task_rpcapi.sync_storage_resource(
-                ctxt,
-                storage['id'],
-                subclass.__module__ + '.' + subclass.__name__)
+        self.task_rpcapi.sync_storage_resources(ctxt, storage['id'],
+                                                _get_resource_tasks())
 
     def _storage_exist(self, context, access_info):
         access_info_dict = copy.deepcopy(access_info)
@@ -225,11 +229,30 @@ class StorageController(wsgi.Controller):
 
         return storage_view.build_capabilities(storage_info, capabilities)
 
+    def get_sync_states(self, req, id):
+        """The API lists the last sync state of each resource type of the
+        storage device.
+        """
+        ctxt = req.environ['delfin.context']
+        # Check storage existence with storage_id
+        db.storage_get(ctxt, id)
+
+        sync_states = db.resource_sync_state_get_all(
+            ctxt, sort_keys=['resource_type'], sort_dirs=['asc'],
+            filters={'storage_id': id})
+        return storage_view.build_sync_states(sync_states)
+
 
 def create_resource():
     return wsgi.Resource(StorageController())
 
 
+def _get_resource_tasks():
+    """Full class names of all the resource sync tasks."""
+    return [subclass.__module__ + '.' + subclass.__name__
+            for subclass in resources.StorageResourceTask.__subclasses__()]
+
+
 @coordination.synchronized('{storage_id}')
 def _set_synced_if_ok(context, storage_id, resource_count):
     try:
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import volume_groups as volume_group_view
 
@@ -29,6 +30,7 @@ class VolumeGroupController(wsgi.Controller):
         """Return volume group search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional(scoped=True)
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
         query_params = {"storage_id": id}
@@ -58,7 +60,9 @@ class VolumeGroupController(wsgi.Controller):
 
             volume_group['volumes'] = native_volume_id_list
 
-        return volume_group_view.build_volume_groups(volume_groups)
+        view = volume_group_view.build_volume_groups(volume_groups)
+        return api_utils.set_next_cursor(view, volume_groups, limit,
+                                         sort_keys, sort_dirs)
 
 
 def create_resource():
@@ -14,6 +14,7 @@
 
 from delfin import db
 from delfin.api import api_utils
+from delfin.api import response_cache
 from delfin.api.common import wsgi
 from delfin.api.views import volumes as volume_view
 
@@ -29,20 +30,32 @@ class VolumeController(wsgi.Controller):
         """Return volumes search options allowed ."""
         return self.search_options
 
+    @response_cache.conditional()
     def index(self, req):
         ctxt = req.environ['delfin.context']
         query_params = {}
         query_params.update(req.GET)
+        stream = api_utils.get_stream_param(req, query_params)
         # update options  other than filters
         sort_keys, sort_dirs = api_utils.get_sort_params(query_params)
-        marker, limit, offset = api_utils.get_pagination_params(query_params)
+        marker, limit, offset = api_utils.get_pagination_params(
+            query_params, api_utils.STREAM_MAX_LIMIT if stream else None)
         # strip out options except supported search  options
         api_utils.remove_invalid_options(ctxt, query_params,
                                          self._get_volumes_search_options())
 
+        if stream:
+            volumes = db.resource_get_all_iter(
+                ctxt, 'volumes', marker, limit, sort_keys, sort_dirs,
+                query_params, offset)
+            return api_utils.stream_list(
+                req, 'volumes', volumes, volume_view.build_volume, stream)
+
         volumes = db.volume_get_all(ctxt, marker, limit, sort_keys,
                                     sort_dirs, query_params, offset)
-        return volume_view.build_volumes(volumes)
+        view = volume_view.build_volumes(volumes)
+        return api_utils.set_next_cursor(view, volumes, limit,
+                                         sort_keys, sort_dirs)
 
     def show(self, req, id):
         ctxt = req.environ['delfin.context']
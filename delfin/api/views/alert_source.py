@@ -11,12 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 from delfin import cryptor
 
 
 def build_alert_source(value):
-    view = copy.deepcopy(value)
+    view = dict(value)
     view.pop("auth_key")
     view.pop("privacy_key")
     version = view['version']
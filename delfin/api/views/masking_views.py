@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_masking_views(masking_views):
@@ -22,5 +21,4 @@ def build_masking_views(masking_views):
 
 
 def build_masking_view(masking_view):
-    view = copy.deepcopy(masking_view)
-    return dict(view)
+    return dict(masking_view)
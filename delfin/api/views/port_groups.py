@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_port_groups(port_groups):
@@ -22,5 +21,4 @@ def build_port_groups(port_groups):
 
 
 def build_port_group(port_group):
-    view = copy.deepcopy(port_group)
-    return dict(view)
+    return dict(port_group)
@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_storage_host_groups(storage_host_groups):
@@ -22,5 +21,4 @@ def build_storage_host_groups(storage_host_groups):
 
 
 def build_storage_host_group(storage_host_group):
-    view = copy.deepcopy(storage_host_group)
-    return dict(view)
+    return dict(storage_host_group)
@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_storage_pools(storage_pools):
@@ -22,5 +21,4 @@ def build_storage_pools(storage_pools):
 
 
 def build_storage_pool(storage_pool):
-    view = copy.deepcopy(storage_pool)
-    return dict(view)
+    return dict(storage_pool)
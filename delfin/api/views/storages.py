@@ -11,8 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
-
 from delfin.common import constants
 
 
@@ -24,7 +22,7 @@ def build_storages(storages):
 
 
 def build_storage(storage):
-    view = copy.deepcopy(storage)
+    view = dict(storage)
     if view['sync_status'] == constants.SyncStatus.SYNCED:
         view['sync_status'] = 'SYNCED'
     else:
@@ -44,3 +42,10 @@ def build_capabilities(storage_info, capabilities):
     view['metadata'] = metadata
     view['spec'] = capabilities
     return view
+
+
+def build_sync_states(sync_states):
+    # Build list of resource sync states
+    views = [dict(sync_state)
+             for sync_state in sync_states]
+    return dict(sync_states=views)
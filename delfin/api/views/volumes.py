@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 
 
 def build_volumes(volumes):
@@ -22,5 +21,4 @@ def build_volumes(volumes):
 
 
 def build_volume(volume):
-    view = copy.deepcopy(volume)
-    return dict(view)
+    return dict(volume)
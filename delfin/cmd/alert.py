@@ -45,8 +45,15 @@ def main():
     # Launch alert manager service
     alert_manager = service.AlertService.create(binary='delfin-alert',
                                                 coordination=True)
-    service.serve(alert_manager)
-    service.wait()
+    if CONF.trap_receiver_workers > 1:
+        # Each worker process has its own snmp engine on the shared port
+        launcher = service.multi_process_launcher()
+        launcher.launch_service(alert_manager,
+                                workers=CONF.trap_receiver_workers)
+        launcher.wait()
+    else:
+        service.serve(alert_manager)
+        service.wait()
 
 
 if __name__ == '__main__':
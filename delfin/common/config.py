@@ -92,6 +92,12 @@ global_opts = [
     cfg.IntOpt('sync_task_expiration',
                default=1800,
                help='Sync task expiration in seconds.'),
+    cfg.IntOpt('resource_fingerprint_expiration',
+               default=3600,
+               help='Time in seconds the fingerprints of synced resources are '
+                    'cached in memory. While cached, resources are compared '
+                    'with their fingerprints instead of the database rows. '
+                    '0 disables the cache.'),
     cfg.BoolOpt('snmp_validation_enabled',
                 default=True,
                 help='Whether alert source configuration to be validated '
@@ -150,6 +156,35 @@ telemetry_opts = [
     cfg.IntOpt('node_weight',
                default=100,
                help='Weight for the node in the Hash Ring'),
+    cfg.BoolOpt('collection_spread',
+                default=True,
+                help='Spread the performance collections over their '
+                     'interval with a fixed phase for each task, instead of '
+                     'starting them one interval after they are scheduled'),
+    cfg.IntOpt('collection_workers',
+               default=4,
+               min=1,
+               help='Maximum number of performance collections of one '
+                    'driver type running at the same time in one executor'),
+    cfg.DictOpt('driver_collection_workers',
+                default={},
+                help='Maximum number of performance collections running at '
+                     'the same time for the given driver types, keyed by '
+                     'driver vendor or "vendor model", e.g. '
+                     '"dellemc:2,hpe 3par:6"'),
+    cfg.StrOpt('collection_overrun_policy',
+               default='coalesce',
+               choices=['skip', 'coalesce', 'queue'],
+               help='What to do when a performance collection is due while '
+                    'the previous one of the task is still running: skip it, '
+                    'coalesce the missed windows into one collection after '
+                    'the running one, or queue a collection for each '
+                    'missed window'),
+    cfg.IntOpt('collection_queue_size',
+               default=3,
+               min=1,
+               help='Maximum number of collections of one task queued '
+                    'behind its running one with the queue overrun policy'),
 ]
 
 CONF.register_opts(telemetry_opts, "telemetry")
@@ -378,6 +378,14 @@ class ResourceSync(object):
     FAILED = 101
 
 
+class ResourceSyncStatus(object):
+    SYNCING = 'syncing'
+    SYNCED = 'synced'
+    FAILED = 'failed'
+
+    ALL = (SYNCING, SYNCED, FAILED)
+
+
 class TelemetryCollection(object):
     """Performance monitoring task name"""
     PERFORMANCE_TASK_METHOD = "delfin.task_manager.scheduler.schedulers." \
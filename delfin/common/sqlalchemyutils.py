@@ -18,13 +18,13 @@
 #    under the License.
 
 """Implementation of paginate query."""
+import base64
 import datetime
 
 from oslo_log import log as logging
-from six.moves import range
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
 import sqlalchemy
-import sqlalchemy.sql as sa_sql
-from sqlalchemy.sql import type_api
 
 from delfin.db import api
 from delfin import exception
@@ -33,58 +33,98 @@ from delfin.i18n import _
 
 LOG = logging.getLogger(__name__)
 
-_TYPE_SCHEMA = {
-    'datetime': datetime.datetime(1900, 1, 1),
-    'big_integer': 0,
-    'integer': 0,
-    'string': ''
-}
+_DATETIME_TAG = '__datetime__'
 
 
-def _get_default_column_value(model, column_name):
-    """Return the default value of the columns from DB table.
+class Cursor(object):
+    """Position of a row in a sorted result.
 
-    In postgreDB case, if no right default values are being set, an
-    psycopg2.DataError will be thrown.
+    The position is given by the values of the sort keys of the row, and is
+    passed to the API users as an opaque token to fetch the next page.
     """
-    attr = getattr(model, column_name)
-    # Return the default value directly if the model contains. Otherwise return
-    # a default value which is not None.
-    if attr.default and isinstance(attr.default, type_api.TypeEngine):
-        return attr.default.arg
 
-    attr_type = attr.type
-    return _TYPE_SCHEMA[attr_type.__visit_name__]
+    def __init__(self, sort_keys, sort_dirs, values):
+        self.sort_keys = list(sort_keys)
+        self.sort_dirs = list(sort_dirs)
+        self.values = list(values)
+
+    @classmethod
+    def from_item(cls, item, sort_keys, sort_dirs):
+        """Cursor of an item, a model object or a dict of its fields."""
+        return cls(sort_keys, sort_dirs, [item[key] for key in sort_keys])
+
+    def encode(self):
+        values = [{_DATETIME_TAG: value.isoformat()}
+                  if isinstance(value, datetime.datetime) else value
+                  for value in self.values]
+        data = jsonutils.dump_as_bytes([self.sort_keys, self.sort_dirs,
+                                        values])
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    @classmethod
+    def decode(cls, token):
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            sort_keys, sort_dirs, values = jsonutils.loads(data)
+            values = [timeutils.parse_isotime(value[_DATETIME_TAG])
+                      .replace(tzinfo=None)
+                      if isinstance(value, dict) else value
+                      for value in values]
+        except Exception:
+            raise exception.InvalidInput(_('Invalid cursor %s') % token)
+        if len(sort_keys) != len(values) or len(sort_dirs) != len(values):
+            raise exception.InvalidInput(_('Invalid cursor %s') % token)
+        return cls(sort_keys, sort_dirs, values)
+
+
+def _is_never_null(model, sort_key):
+    """Whether the column is never NULL, either not nullable or filled
+    with its default value.
+    """
+    column = model.__table__.columns.get(sort_key)
+    return column is not None and (not column.nullable or
+                                   column.default is not None)
+
+
+def _after(attr, value, sort_dir, never_null):
+    """Criteria of the values of a column after the marker value, NULL
+    being lower than any value as in MySQL and SQLite.
+    """
+    if sort_dir == 'asc':
+        return attr.isnot(None) if value is None else attr > value
+    if value is None:
+        return sqlalchemy.sql.false()
+    if never_null:
+        return attr < value
+    return sqlalchemy.sql.or_(attr < value, attr.is_(None))
+
+
+def _equal(attr, value):
+    return attr.is_(None) if value is None else attr == value
 
 
-# TODO(wangxiyuan): Use oslo_db.sqlalchemy.utils.paginate_query once it is
-# stable and afforded by the minimum version in requirement.txt.
-# copied from glance/db/sqlalchemy/api.py
 def paginate_query(query, model, limit, sort_keys, marker=None,
                    sort_dir=None, sort_dirs=None, offset=None):
     """Returns a query with sorting / pagination criteria added.
 
-    Pagination works by requiring a unique sort_key, specified by sort_keys.
-    (If sort_keys is not unique, then we risk looping through values.)
-    We use the last row in the previous page as the 'marker' for pagination.
-    So we must return values that follow the passed marker in the order.
-    With a single-valued sort_key, this would be easy: sort_key > X.
-    With a compound-values sort_key, (k1, k2, k3) we must do this to repeat
-    the lexicographical ordering:
+    The rows are sorted by the sort keys and then by the primary key of the
+    model, so the order is total and no row is skipped or repeated between
+    the pages. The marker is the position of the last row of the previous
+    page, and the rows after it are sought by comparing the sort keys with
+    the marker values. With compound sort keys (k1, k2, k3) we must do this
+    to repeat the lexicographical ordering:
     (k1 > X1) or (k1 == X1 && k2 > X2) or (k1 == X1 && k2 == X2 && k3 > X3)
 
-    We also have to cope with different sort_directions.
-
-    Typically, the id of the last row is used as the client-facing pagination
-    marker, then the actual marker object must be fetched from the db and
-    passed in to us as marker.
+    Besides, the redundant criteria k1 >= X1 lets the database seek to the
+    marker with an index on the sort keys instead of scanning all the rows
+    before it, so the last page costs the same as the first one.
 
     :param query: the query object to which we should add paging/sorting
     :param model: the ORM model class
     :param limit: maximum number of items to return
     :param sort_keys: array of attributes by which results should be sorted
-    :param marker: the last item of the previous page; we returns the next
-                    results after this value.
+    :param marker: the Cursor of the last item of the previous page, or the
+                    item itself; we returns the next results after this value.
     :param sort_dir: direction in which results should be sorted (asc, desc)
     :param sort_dirs: per-column array of sort_dirs, corresponding to sort_keys
     :param offset: the number of items to skip from the marker or from the
@@ -109,12 +149,21 @@ def paginate_query(query, model, limit, sort_keys, marker=None,
         raise AssertionError(
             'sort_dirs length is not equal to sort_keys length.')
 
+    sort_keys, sort_dirs = get_sort_params(
+        sort_keys, sort_dirs,
+        [column.name for column in model.__table__.primary_key.columns])
+
     # Add sorting
+    sort_attrs = []
     for current_sort_key, current_sort_dir in zip(sort_keys, sort_dirs):
-        sort_dir_func = {
-            'asc': sqlalchemy.asc,
-            'desc': sqlalchemy.desc,
-        }[current_sort_dir]
+        try:
+            sort_dir_func = {
+                'asc': sqlalchemy.asc,
+                'desc': sqlalchemy.desc,
+            }[current_sort_dir]
+        except KeyError:
+            raise ValueError(_("Unknown sort direction, "
+                               "must be 'desc' or 'asc'"))
 
         try:
             sort_key_attr = getattr(model, current_sort_key)
@@ -123,46 +172,35 @@ def paginate_query(query, model, limit, sort_keys, marker=None,
         if not api.is_orm_value(sort_key_attr):
             raise exception.InvalidInput('Invalid sort key')
         query = query.order_by(sort_dir_func(sort_key_attr))
+        sort_attrs.append(sort_key_attr)
 
     # Add pagination
     if marker is not None:
-        marker_values = []
-        for sort_key in sort_keys:
-            v = getattr(marker, sort_key)
-            if v is None:
-                v = _get_default_column_value(model, sort_key)
-            marker_values.append(v)
+        if not isinstance(marker, Cursor):
+            marker = Cursor.from_item(marker, sort_keys, sort_dirs)
+        elif marker.sort_keys != sort_keys or marker.sort_dirs != sort_dirs:
+            raise exception.InvalidInput(
+                _('The cursor does not match the sort keys and directions'))
+        never_null = [_is_never_null(model, sort_key)
+                      for sort_key in sort_keys]
 
         # Build up an array of sort criteria as in the docstring
         criteria_list = []
-        for i in range(0, len(sort_keys)):
-            crit_attrs = []
-            for j in range(0, i):
-                model_attr = getattr(model, sort_keys[j])
-                default = _get_default_column_value(model, sort_keys[j])
-                attr = sa_sql.expression.case([(model_attr.isnot(None),
-                                                model_attr), ],
-                                              else_=default)
-                crit_attrs.append((attr == marker_values[j]))
-
-            model_attr = getattr(model, sort_keys[i])
-            default = _get_default_column_value(model, sort_keys[i])
-            attr = sa_sql.expression.case([(model_attr.isnot(None),
-                                            model_attr), ],
-                                          else_=default)
-            if sort_dirs[i] == 'desc':
-                crit_attrs.append((attr < marker_values[i]))
-            elif sort_dirs[i] == 'asc':
-                crit_attrs.append((attr > marker_values[i]))
-            else:
-                raise ValueError(_("Unknown sort direction, "
-                                   "must be 'desc' or 'asc'"))
-
-            criteria = sqlalchemy.sql.and_(*crit_attrs)
-            criteria_list.append(criteria)
-
-        f = sqlalchemy.sql.or_(*criteria_list)
-        query = query.filter(f)
+        for i in range(len(sort_keys)):
+            crit_attrs = [_equal(sort_attrs[j], marker.values[j])
+                          for j in range(i)]
+            crit_attrs.append(_after(sort_attrs[i], marker.values[i],
+                                     sort_dirs[i], never_null[i]))
+            criteria_list.append(sqlalchemy.sql.and_(*crit_attrs))
+        query = query.filter(sqlalchemy.sql.or_(*criteria_list))
+
+        # Bound of the first sort key to seek to the marker
+        first_value = marker.values[0]
+        if first_value is not None:
+            if sort_dirs[0] == 'asc':
+                query = query.filter(sort_attrs[0] >= first_value)
+            elif never_null[0]:
+                query = query.filter(sort_attrs[0] <= first_value)
 
     if limit is not None:
         query = query.limit(limit)
@@ -171,3 +209,16 @@ def paginate_query(query, model, limit, sort_keys, marker=None,
         query = query.offset(offset)
 
     return query
+
+
+def get_sort_params(sort_keys, sort_dirs, primary_keys=('id',)):
+    """Append the primary keys to the sort keys, in the direction of the
+    first sort key, so that the order is total.
+    """
+    sort_keys = list(sort_keys)
+    sort_dirs = list(sort_dirs)
+    for primary_key in primary_keys:
+        if primary_key not in sort_keys:
+            sort_keys.append(primary_key)
+            sort_dirs.append(sort_dirs[0] if sort_dirs else 'asc')
+    return sort_keys, sort_dirs
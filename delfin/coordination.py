@@ -325,12 +325,19 @@ def _get_redis_backend_url():
 
 
 class ConsistentHashing(Coordinator):
+    """Consistent hash ring of the task executors.
+
+    The ring is built once from the group members and then follows the
+    members joining and leaving, when the group changes are watched by
+    watch_group_change.
+    """
     GROUP_NAME = 'partitioner_group'
     PARTITIONS = 2**5
 
     def __init__(self):
         super(ConsistentHashing, self). \
             __init__(agent_id=CONF.host, prefix="")
+        self._partitioner = None
 
     def join_group(self):
         try:
@@ -341,20 +348,46 @@ class ConsistentHashing(Coordinator):
         except coordination.MemberAlreadyExist:
             LOG.info('Member %s already in partitioner_group' % CONF.host)
 
+    def _get_partitioner(self):
+        if self._partitioner is None:
+            self._partitioner = partitioner.Partitioner(
+                self.coordinator, self.GROUP_NAME, partitions=self.PARTITIONS)
+        return self._partitioner
+
     def get_task_executor(self, task_id):
-        part = partitioner.Partitioner(self.coordinator, self.GROUP_NAME)
-        members = part.members_for_object(task_id)
+        members = self._get_partitioner().members_for_object(task_id)
         for member in members:
             LOG.info('For task id %s, host should be %s' % (task_id, member))
             return member.decode('utf-8')
 
+    def get_task_executors(self, task_ids):
+        """Get the executors of the tasks in one pass on the ring.
+
+        :returns: dict of task id to its executor
+        """
+        part = self._get_partitioner()
+        executors = {}
+        for task_id in task_ids:
+            for member in part.members_for_object(task_id):
+                executors[task_id] = member.decode('utf-8')
+        return executors
+
     def register_watcher_func(self, on_node_join, on_node_leave):
+        # The ring watches the group first, so that it's already updated
+        # when the callbacks get the executors
+        self._get_partitioner()
         self.coordinator.watch_join_group(self.GROUP_NAME, on_node_join)
         self.coordinator.watch_leave_group(self.GROUP_NAME, on_node_leave)
 
     def watch_group_change(self):
         self.coordinator.run_watchers()
 
+    def stop(self):
+        if self._partitioner is not None:
+            self._partitioner.stop()
+            self._partitioner = None
+        super(ConsistentHashing, self).stop()
+
 
 class GroupMembership(Coordinator):
 
@@ -48,6 +48,16 @@ db_opts = [
     cfg.StrOpt('db_backend',
                default='sqlalchemy',
                help='The backend to use for database.'),
+    cfg.IntOpt('resource_batch_size',
+               default=500,
+               min=1,
+               help='Maximum number of resource records written to database '
+                    'in one transaction during resource sync.'),
+    cfg.IntOpt('stream_batch_size',
+               default=500,
+               min=1,
+               help='Number of resource records fetched from database at a '
+                    'time when streaming a resource list.'),
 ]
 
 CONF = cfg.CONF
@@ -63,6 +73,13 @@ def register_db():
     IMPL.register_db()
 
 
+def resource_digest_get(context, table_name, storage_id):
+    """Get the count and the latest change times of a storage's resources
+    in the table, used to detect resource changes cheaply.
+    """
+    return IMPL.resource_digest_get(context, table_name, storage_id)
+
+
 def storage_get(context, storage_id):
     """Retrieve a storage device."""
     return IMPL.storage_get(context, storage_id)
@@ -108,6 +125,58 @@ def storage_delete(context, storage_id):
     return IMPL.storage_delete(context, storage_id)
 
 
+def storage_sync_status_decrease(context, storage_id, value):
+    """Atomically decrease the sync status of a storage until it's synced."""
+    return IMPL.storage_sync_status_decrease(context, storage_id, value)
+
+
+def storage_generation_increase(context, storage_id):
+    """Atomically increase the generation of a storage, which is increased
+    whenever the resources of the storage are changed.
+    """
+    return IMPL.storage_generation_increase(context, storage_id)
+
+
+def storage_generations_get(context, storage_id=None):
+    """Get (id, generation, updated_at, deleted) of all the storages, or
+    of the given one, whose changes change the resource lists.
+    """
+    return IMPL.storage_generations_get(context, storage_id)
+
+
+def resource_sync_state_update(context, storage_id, resource_type, values):
+    """Update or create the sync state of a resource type of a storage."""
+    return IMPL.resource_sync_state_update(context, storage_id,
+                                           resource_type, values)
+
+
+def resource_sync_state_get_all(context, marker=None, limit=None,
+                                sort_keys=None, sort_dirs=None, filters=None,
+                                offset=None):
+    """Retrieves all resource sync states.
+
+    :param context: context of this request, it's helpful to trace the request
+    :param marker: the last item of the previous page, used to determine the
+                   next page of results to return
+    :param limit: maximum number of items to return
+    :param sort_keys: list of attributes by which results should be sorted,
+                      paired with corresponding item in sort_dirs
+    :param sort_dirs: list of directions in which results should be sorted,
+                      paired with corresponding item in sort_keys, for example
+                      'desc' for descending order
+    :param filters: dictionary of filters
+    :param offset: number of items to skip
+    :returns: list of resource sync states
+    """
+    return IMPL.resource_sync_state_get_all(context, marker, limit, sort_keys,
+                                            sort_dirs, filters, offset)
+
+
+def resource_sync_state_delete_by_storage(context, storage_id):
+    """Delete all the resource sync states of a storage."""
+    return IMPL.resource_sync_state_delete_by_storage(context, storage_id)
+
+
 def volume_create(context, values):
     """Create a volume from the values dictionary."""
     return IMPL.volume_create(context, values)
@@ -636,6 +705,29 @@ def share_get_all(context, marker=None, limit=None, sort_keys=None,
                               sort_dirs, filters, offset)
 
 
+def resource_get_all_iter(context, table_name, marker=None, limit=None,
+                          sort_keys=None, sort_dirs=None, filters=None,
+                          offset=None):
+    """Iterate over the resources of a table without loading them all.
+
+    :param context: context of this request, it's helpful to trace the request
+    :param table_name: table of the resources, e.g. volumes
+    :param marker: the last item of the previous page, used to determine the
+                   next page of results to return
+    :param limit: maximum number of items to return
+    :param sort_keys: list of attributes by which results should be sorted,
+                      paired with corresponding item in sort_dirs
+    :param sort_dirs: list of directions in which results should be sorted,
+                      paired with corresponding item in sort_keys, for example
+                      'desc' for descending order
+    :param filters: dictionary of filters
+    :param offset: number of items to skip
+    :returns: iterator of the resources
+    """
+    return IMPL.resource_get_all_iter(context, table_name, marker, limit,
+                                      sort_keys, sort_dirs, filters, offset)
+
+
 def access_info_create(context, values):
     """Create a storage access information that used to connect
     to a specific storage device.
@@ -742,6 +834,21 @@ def task_update(context, task_id, values):
     return IMPL.task_update(context, task_id, values)
 
 
+def task_executors_update(context, executors):
+    """Update the executors of the tasks.
+
+    :param executors: dict of task id to its executor
+    """
+    return IMPL.task_executors_update(context, executors)
+
+
+def tasks_get_by_ids(context, task_ids):
+    """Get the tasks of the ids with IN queries, the ids not found are
+    skipped.
+    """
+    return IMPL.tasks_get_by_ids(context, task_ids)
+
+
 def task_get(context, task_id):
     """Get a task or raise an exception if it does not exist."""
     return IMPL.task_get(context, task_id)
@@ -794,6 +901,21 @@ def failed_task_update(context, failed_task_id, values):
     return IMPL.failed_task_update(context, failed_task_id, values)
 
 
+def failed_task_executors_update(context, executors):
+    """Update the executors of the failed tasks.
+
+    :param executors: dict of failed task id to its executor
+    """
+    return IMPL.failed_task_executors_update(context, executors)
+
+
+def failed_tasks_get_by_ids(context, failed_task_ids):
+    """Get the failed tasks of the ids with IN queries, the ids not found
+    are skipped.
+    """
+    return IMPL.failed_tasks_get_by_ids(context, failed_task_ids)
+
+
 def failed_task_get(context, failed_task_id):
     """Get a failed task or raise an exception if it does not exist."""
     return IMPL.failed_task_get(context, failed_task_id)
@@ -0,0 +1,53 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Database setup and migration commands."""
+
+import os
+
+from alembic import command as alembic_command
+from alembic import config as alembic_config
+from alembic import migration as alembic_migration
+
+from delfin.db.sqlalchemy import api as db_api
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), 'migrations',
+                           'alembic.ini')
+
+
+def _alembic_config(connection=None):
+    config = alembic_config.Config(ALEMBIC_INI)
+    if connection is not None:
+        config.attributes['connection'] = connection
+    return config
+
+
+def db_sync(version=None, connection=None):
+    """Upgrade the database schema to the given version.
+
+    :param version: the revision to upgrade to, the latest by default
+    :param connection: the connection to upgrade, the one of the [database]
+                       connection option by default
+    """
+    alembic_command.upgrade(_alembic_config(connection), version or 'head')
+
+
+def db_version(connection=None):
+    """The current revision of the database schema."""
+    if connection is not None:
+        return alembic_migration.MigrationContext.configure(
+            connection).get_current_revision()
+    with db_api.get_engine().connect() as connection:
+        return alembic_migration.MigrationContext.configure(
+            connection).get_current_revision()
@@ -0,0 +1,475 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Initial schema
+
+Creates the tables of the schema created by register_db before the
+migrations were introduced. Tables that already exist are left untouched, so
+databases created by the previous releases are upgraded in place.
+
+Revision ID: 001
+Revises: None
+"""
+
+from alembic import op
+from oslo_db.sqlalchemy.types import JsonEncodedDict
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '001'
+down_revision = None
+
+
+def _create_table(name, *columns, **kwargs):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns, **kwargs)
+
+
+def upgrade():
+    _create_table(
+        'access_info',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=False),
+        sa.Column('storage_name', sa.String(length=255), nullable=True),
+        sa.Column('vendor', sa.String(length=255), nullable=True),
+        sa.Column('model', sa.String(length=255), nullable=True),
+        sa.Column('rest', JsonEncodedDict(), nullable=True),
+        sa.Column('ssh', JsonEncodedDict(), nullable=True),
+        sa.Column('cli', JsonEncodedDict(), nullable=True),
+        sa.Column('smis', JsonEncodedDict(), nullable=True),
+        sa.Column('extra_attributes', JsonEncodedDict(), nullable=True),
+        sa.PrimaryKeyConstraint('storage_id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'alert_source',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=False),
+        sa.Column('host', sa.String(length=255), nullable=True),
+        sa.Column('version', sa.String(length=255), nullable=True),
+        sa.Column('community_string', sa.String(length=255), nullable=True),
+        sa.Column('username', sa.String(length=255), nullable=True),
+        sa.Column('security_level', sa.String(length=255), nullable=True),
+        sa.Column('auth_key', sa.String(length=255), nullable=True),
+        sa.Column('auth_protocol', sa.String(length=255), nullable=True),
+        sa.Column('privacy_protocol', sa.String(length=255), nullable=True),
+        sa.Column('privacy_key', sa.String(length=255), nullable=True),
+        sa.Column('engine_id', sa.String(length=255), nullable=True),
+        sa.Column('port', sa.Integer(), nullable=True),
+        sa.Column('context_name', sa.String(length=255), nullable=True),
+        sa.Column('retry_num', sa.Integer(), nullable=True),
+        sa.Column('expiration', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('storage_id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'controllers',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_controller_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('soft_version', sa.String(length=255), nullable=True),
+        sa.Column('cpu_info', sa.String(length=255), nullable=True),
+        sa.Column('cpu_count', sa.Integer(), nullable=True),
+        sa.Column('memory_size', sa.BigInteger(), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('mgmt_ip', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'disks',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_disk_id', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('physical_type', sa.String(length=255), nullable=True),
+        sa.Column('logical_type', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=255), nullable=True),
+        sa.Column('native_disk_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('serial_number', sa.String(length=255), nullable=True),
+        sa.Column('manufacturer', sa.String(length=255), nullable=True),
+        sa.Column('model', sa.String(length=255), nullable=True),
+        sa.Column('firmware', sa.String(length=255), nullable=True),
+        sa.Column('speed', sa.Integer(), nullable=True),
+        sa.Column('capacity', sa.BigInteger(), nullable=True),
+        sa.Column('health_score', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'failed_tasks',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=True),
+        sa.Column('interval', sa.Integer(), nullable=True),
+        sa.Column('start_time', sa.BIGINT(), nullable=True),
+        sa.Column('end_time', sa.BIGINT(), nullable=True),
+        sa.Column('retry_count', sa.Integer(), nullable=True),
+        sa.Column('method', sa.String(length=255), nullable=True),
+        sa.Column('result', sa.String(length=255), nullable=True),
+        sa.Column('job_id', sa.String(length=36), nullable=True),
+        sa.Column('executor', sa.String(length=255), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'filesystems',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_filesystem_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('type', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('native_pool_id', sa.String(length=255), nullable=True),
+        sa.Column('security_mode', sa.String(length=255), nullable=True),
+        sa.Column('total_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('used_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('free_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('compressed', sa.Boolean(), nullable=True),
+        sa.Column('deduplicated', sa.Boolean(), nullable=True),
+        sa.Column('worm', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'masking_views',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_volume_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_port_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_volume_id', sa.String(length=255), nullable=True),
+        sa.Column('native_masking_view_id',
+                  sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'port_groups',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('native_port_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'port_grp_port_rels',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('native_port_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_port_id', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'ports',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_port_id', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('type', sa.String(length=255), nullable=True),
+        sa.Column('logical_type', sa.String(length=255), nullable=True),
+        sa.Column('connection_status', sa.String(length=255), nullable=True),
+        sa.Column('health_status', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('native_parent_id', sa.String(length=255), nullable=True),
+        sa.Column('speed', sa.Integer(), nullable=True),
+        sa.Column('max_speed', sa.Integer(), nullable=True),
+        sa.Column('wwn', sa.String(length=255), nullable=True),
+        sa.Column('mac_address', sa.String(length=255), nullable=True),
+        sa.Column('ipv4', sa.String(length=255), nullable=True),
+        sa.Column('ipv4_mask', sa.String(length=255), nullable=True),
+        sa.Column('ipv6', sa.String(length=255), nullable=True),
+        sa.Column('ipv6_mask', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'qtrees',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_qtree_id', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('path', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('native_filesystem_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('security_mode', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'quota',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_quota_id', sa.String(length=255), nullable=True),
+        sa.Column('type', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('native_filesystem_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_qtree_id', sa.String(length=255), nullable=True),
+        sa.Column('capacity_hard_limit', sa.BigInteger(), nullable=True),
+        sa.Column('capacity_soft_limit', sa.BigInteger(), nullable=True),
+        sa.Column('file_hard_limit', sa.BigInteger(), nullable=True),
+        sa.Column('file_soft_limit', sa.BigInteger(), nullable=True),
+        sa.Column('file_count', sa.BigInteger(), nullable=True),
+        sa.Column('used_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('user_group_name', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'resource_sync_states',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('resource_type', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=True),
+        sa.Column('end_time', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('storage_id', 'resource_type',
+                            name='uniq_resource_sync_states0storage_id0'
+                                 'resource_type'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'shares',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_share_id', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('path', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('native_filesystem_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_qtree_id', sa.String(length=255), nullable=True),
+        sa.Column('protocol', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'storage_host_groups',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'storage_host_grp_host_rels',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_id',
+                  sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'storage_host_initiators',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('alias', sa.String(length=255), nullable=True),
+        sa.Column('wwn', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('type', sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_initiator_id',
+                  sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'storage_hosts',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('os_type', sa.String(length=255), nullable=True),
+        sa.Column('ip_address', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('native_storage_host_id',
+                  sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'storage_pools',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_storage_pool_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('storage_type', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('total_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('used_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('free_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('subscribed_capacity', sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'storages',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('sync_status', sa.Integer(), nullable=True),
+        sa.Column('vendor', sa.String(length=255), nullable=True),
+        sa.Column('model', sa.String(length=255), nullable=True),
+        sa.Column('serial_number', sa.String(length=255), nullable=True),
+        sa.Column('firmware_version', sa.String(length=255), nullable=True),
+        sa.Column('total_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('used_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('free_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('raw_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('subscribed_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'tasks',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('interval', sa.Integer(), nullable=True),
+        sa.Column('method', sa.String(length=255), nullable=True),
+        sa.Column('args', JsonEncodedDict(), nullable=True),
+        sa.Column('last_run_time', sa.Integer(), nullable=True),
+        sa.Column('job_id', sa.String(length=36), nullable=True),
+        sa.Column('executor', sa.String(length=255), nullable=True),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.Column('deleted', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'vol_grp_vol_rels',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('native_volume_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('native_volume_id', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'volume_groups',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('native_volume_group_id',
+                  sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
+
+    _create_table(
+        'volumes',
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('native_volume_id', sa.String(length=255), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('type', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=255), nullable=True),
+        sa.Column('storage_id', sa.String(length=36), nullable=True),
+        sa.Column('native_storage_pool_id',
+                  sa.String(length=255), nullable=True),
+        sa.Column('wwn', sa.String(length=255), nullable=True),
+        sa.Column('total_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('used_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('free_capacity', sa.BigInteger(), nullable=True),
+        sa.Column('compressed', sa.Boolean(), nullable=True),
+        sa.Column('deduplicated', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB')
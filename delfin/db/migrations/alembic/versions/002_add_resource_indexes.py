@@ -0,0 +1,79 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add the indexes of the resource tables
+
+The resources are looked up by the storage they belong to and their native
+id, and the tasks by their executor, so these columns are indexed.
+
+Revision ID: 002
+Revises: 001
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_volumes_storage_native', 'volumes',
+     ['storage_id', 'native_volume_id']),
+    ('ix_storage_pools_storage_native', 'storage_pools',
+     ['storage_id', 'native_storage_pool_id']),
+    ('ix_disks_storage_native', 'disks', ['storage_id', 'native_disk_id']),
+    ('ix_controllers_storage_native', 'controllers',
+     ['storage_id', 'native_controller_id']),
+    ('ix_ports_storage_native', 'ports', ['storage_id', 'native_port_id']),
+    ('ix_filesystems_storage_native', 'filesystems',
+     ['storage_id', 'native_filesystem_id']),
+    ('ix_qtrees_storage_native', 'qtrees', ['storage_id', 'native_qtree_id']),
+    ('ix_quota_storage_native', 'quota', ['storage_id', 'native_quota_id']),
+    ('ix_shares_storage_native', 'shares', ['storage_id', 'native_share_id']),
+    ('ix_tasks_executor_deleted', 'tasks', ['executor', 'deleted']),
+    ('ix_tasks_storage_id', 'tasks', ['storage_id']),
+    ('ix_failed_tasks_executor_deleted', 'failed_tasks',
+     ['executor', 'deleted']),
+    ('ix_failed_tasks_storage_id', 'failed_tasks', ['storage_id']),
+    ('ix_failed_tasks_task_id', 'failed_tasks', ['task_id']),
+    ('ix_storage_host_initiators_storage_native', 'storage_host_initiators',
+     ['storage_id', 'native_storage_host_initiator_id']),
+    ('ix_storage_hosts_storage_native', 'storage_hosts',
+     ['storage_id', 'native_storage_host_id']),
+    ('ix_storage_host_groups_storage_native', 'storage_host_groups',
+     ['storage_id', 'native_storage_host_group_id']),
+    ('ix_port_groups_storage_native', 'port_groups',
+     ['storage_id', 'native_port_group_id']),
+    ('ix_volume_groups_storage_native', 'volume_groups',
+     ['storage_id', 'native_volume_group_id']),
+    ('ix_masking_views_storage_native', 'masking_views',
+     ['storage_id', 'native_masking_view_id']),
+    ('ix_storage_host_grp_host_rels_storage_native',
+     'storage_host_grp_host_rels',
+     ['storage_id', 'native_storage_host_group_id']),
+    ('ix_port_grp_port_rels_storage_native', 'port_grp_port_rels',
+     ['storage_id', 'native_port_group_id']),
+    ('ix_vol_grp_vol_rels_storage_native', 'vol_grp_vol_rels',
+     ['storage_id', 'native_volume_group_id']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing = [index['name'] for index in inspector.get_indexes(table)]
+        if name not in existing:
+            op.create_index(name, table, columns)
@@ -0,0 +1,58 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add the indexes of the resource lists
+
+The resources are listed sorted by created_at by default, and then by id so
+that the order is total, so these columns are indexed for the list queries
+to seek to the cursor of a page.
+
+Revision ID: 003
+Revises: 002
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+
+TABLES = [
+    'storages',
+    'volumes',
+    'storage_pools',
+    'disks',
+    'controllers',
+    'ports',
+    'filesystems',
+    'qtrees',
+    'quota',
+    'shares',
+    'storage_host_initiators',
+    'storage_hosts',
+    'storage_host_groups',
+    'port_groups',
+    'volume_groups',
+    'masking_views',
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        name = 'ix_%s_created_at_id' % table
+        existing = [index['name'] for index in inspector.get_indexes(table)]
+        if name not in existing:
+            op.create_index(name, table, ['created_at', 'id'])
@@ -0,0 +1,34 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Add the generation of the storages
+
+Revision ID: 004
+Revises: 003
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+
+
+def upgrade():
+    columns = [column['name'] for column
+               in sa.inspect(op.get_bind()).get_columns('storages')]
+    if 'generation' not in columns:
+        op.add_column('storages', sa.Column('generation', sa.BigInteger(),
+                                            server_default='0'))
@@ -24,7 +24,7 @@ from oslo_config import cfg
 from oslo_db.sqlalchemy import models
 from oslo_db.sqlalchemy.types import JsonEncodedDict
 from sqlalchemy import Column, Integer, String, Boolean, BigInteger, \
-    DateTime, BIGINT
+    DateTime, BIGINT, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 
 from delfin.common import constants
@@ -65,6 +65,9 @@ class Storage(BASE, DelfinBase):
     """Represents a storage object."""
 
     __tablename__ = 'storages'
+    __table_args__ = (
+        Index('ix_storages_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     name = Column(String(255))
     description = Column(String(255))
@@ -80,13 +83,35 @@ class Storage(BASE, DelfinBase):
     free_capacity = Column(BigInteger)
     raw_capacity = Column(BigInteger)
     subscribed_capacity = Column(BigInteger)
+    # Increased whenever the resources of the storage are changed
+    generation = Column(BigInteger, default=0)
     deleted_at = Column(DateTime)
     deleted = Column(Boolean, default=False)
 
 
+class ResourceSyncState(BASE, DelfinBase):
+    """Represents the last sync state of a resource type of a storage."""
+    __tablename__ = 'resource_sync_states'
+    __table_args__ = (
+        UniqueConstraint('storage_id', 'resource_type',
+                         name='uniq_resource_sync_states0storage_id0'
+                              'resource_type'),
+        {'mysql_engine': 'InnoDB'})
+    id = Column(String(36), primary_key=True)
+    storage_id = Column(String(36))
+    resource_type = Column(String(255))
+    status = Column(String(255))
+    start_time = Column(DateTime)
+    end_time = Column(DateTime)
+
+
 class Volume(BASE, DelfinBase):
     """Represents a volume object."""
     __tablename__ = 'volumes'
+    __table_args__ = (
+        Index('ix_volumes_storage_native', 'storage_id', 'native_volume_id'),
+        Index('ix_volumes_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_volume_id = Column(String(255))
     name = Column(String(255))
@@ -106,6 +131,11 @@ class Volume(BASE, DelfinBase):
 class StoragePool(BASE, DelfinBase):
     """Represents a storage_pool object."""
     __tablename__ = 'storage_pools'
+    __table_args__ = (
+        Index('ix_storage_pools_storage_native',
+              'storage_id', 'native_storage_pool_id'),
+        Index('ix_storage_pools_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_storage_pool_id = Column(String(255))
     name = Column(String(255))
@@ -122,6 +152,10 @@ class StoragePool(BASE, DelfinBase):
 class Disk(BASE, DelfinBase):
     """Represents a disk object."""
     __tablename__ = 'disks'
+    __table_args__ = (
+        Index('ix_disks_storage_native', 'storage_id', 'native_disk_id'),
+        Index('ix_disks_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_disk_id = Column(String(255))
     name = Column(String(255))
@@ -143,6 +177,11 @@ class Disk(BASE, DelfinBase):
 class Controller(BASE, DelfinBase):
     """Represents a controller object."""
     __tablename__ = 'controllers'
+    __table_args__ = (
+        Index('ix_controllers_storage_native',
+              'storage_id', 'native_controller_id'),
+        Index('ix_controllers_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_controller_id = Column(String(255))
     name = Column(String(255))
@@ -159,6 +198,10 @@ class Controller(BASE, DelfinBase):
 class Port(BASE, DelfinBase):
     """Represents a port object."""
     __tablename__ = 'ports'
+    __table_args__ = (
+        Index('ix_ports_storage_native', 'storage_id', 'native_port_id'),
+        Index('ix_ports_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_port_id = Column(String(255))
     name = Column(String(255))
@@ -182,6 +225,11 @@ class Port(BASE, DelfinBase):
 class Filesystem(BASE, DelfinBase):
     """Represents a filesystem object."""
     __tablename__ = 'filesystems'
+    __table_args__ = (
+        Index('ix_filesystems_storage_native',
+              'storage_id', 'native_filesystem_id'),
+        Index('ix_filesystems_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_filesystem_id = Column(String(255))
     name = Column(String(255))
@@ -201,6 +249,10 @@ class Filesystem(BASE, DelfinBase):
 class Qtree(BASE, DelfinBase):
     """Represents a qtree object."""
     __tablename__ = 'qtrees'
+    __table_args__ = (
+        Index('ix_qtrees_storage_native', 'storage_id', 'native_qtree_id'),
+        Index('ix_qtrees_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_qtree_id = Column(String(255))
     name = Column(String(255))
@@ -213,6 +265,10 @@ class Qtree(BASE, DelfinBase):
 class Quota(BASE, DelfinBase):
     """Represents a qtree object."""
     __tablename__ = 'quota'
+    __table_args__ = (
+        Index('ix_quota_storage_native', 'storage_id', 'native_quota_id'),
+        Index('ix_quota_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_quota_id = Column(String(255))
     type = Column(String(255))
@@ -231,6 +287,10 @@ class Quota(BASE, DelfinBase):
 class Share(BASE, DelfinBase):
     """Represents a share object."""
     __tablename__ = 'shares'
+    __table_args__ = (
+        Index('ix_shares_storage_native', 'storage_id', 'native_share_id'),
+        Index('ix_shares_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     native_share_id = Column(String(255))
     name = Column(String(255))
@@ -264,6 +324,10 @@ class AlertSource(BASE, DelfinBase):
 class Task(BASE, DelfinBase):
     """Represents a task attributes."""
     __tablename__ = 'tasks'
+    __table_args__ = (
+        Index('ix_tasks_executor_deleted', 'executor', 'deleted'),
+        Index('ix_tasks_storage_id', 'storage_id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(Integer, primary_key=True, autoincrement=True)
     storage_id = Column(String(36))
     interval = Column(Integer)
@@ -279,6 +343,11 @@ class Task(BASE, DelfinBase):
 class FailedTask(BASE, DelfinBase):
     """Represents a failed task attributes."""
     __tablename__ = 'failed_tasks'
+    __table_args__ = (
+        Index('ix_failed_tasks_executor_deleted', 'executor', 'deleted'),
+        Index('ix_failed_tasks_storage_id', 'storage_id'),
+        Index('ix_failed_tasks_task_id', 'task_id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(Integer, primary_key=True, autoincrement=True)
     storage_id = Column(String(36))
     task_id = Column(Integer)
@@ -297,6 +366,11 @@ class FailedTask(BASE, DelfinBase):
 class StorageHostInitiator(BASE, DelfinBase):
     """Represents the storage host initiator attributes."""
     __tablename__ = 'storage_host_initiators'
+    __table_args__ = (
+        Index('ix_storage_host_initiators_storage_native',
+              'storage_id', 'native_storage_host_initiator_id'),
+        Index('ix_storage_host_initiators_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -312,6 +386,11 @@ class StorageHostInitiator(BASE, DelfinBase):
 class StorageHost(BASE, DelfinBase):
     """Represents the storage host attributes."""
     __tablename__ = 'storage_hosts'
+    __table_args__ = (
+        Index('ix_storage_hosts_storage_native',
+              'storage_id', 'native_storage_host_id'),
+        Index('ix_storage_hosts_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -325,6 +404,11 @@ class StorageHost(BASE, DelfinBase):
 class StorageHostGroup(BASE, DelfinBase):
     """Represents the storage host group attributes."""
     __tablename__ = 'storage_host_groups'
+    __table_args__ = (
+        Index('ix_storage_host_groups_storage_native',
+              'storage_id', 'native_storage_host_group_id'),
+        Index('ix_storage_host_groups_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -335,6 +419,11 @@ class StorageHostGroup(BASE, DelfinBase):
 class PortGroup(BASE, DelfinBase):
     """Represents the port group attributes."""
     __tablename__ = 'port_groups'
+    __table_args__ = (
+        Index('ix_port_groups_storage_native',
+              'storage_id', 'native_port_group_id'),
+        Index('ix_port_groups_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -345,6 +434,11 @@ class PortGroup(BASE, DelfinBase):
 class VolumeGroup(BASE, DelfinBase):
     """Represents the volume group attributes."""
     __tablename__ = 'volume_groups'
+    __table_args__ = (
+        Index('ix_volume_groups_storage_native',
+              'storage_id', 'native_volume_group_id'),
+        Index('ix_volume_groups_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -355,6 +449,11 @@ class VolumeGroup(BASE, DelfinBase):
 class MaskingView(BASE, DelfinBase):
     """Represents the masking view attributes."""
     __tablename__ = 'masking_views'
+    __table_args__ = (
+        Index('ix_masking_views_storage_native',
+              'storage_id', 'native_masking_view_id'),
+        Index('ix_masking_views_created_at_id', 'created_at', 'id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -372,6 +471,10 @@ class StorageHostGrpHostRel(BASE, DelfinBase):
     attributes.
     """
     __tablename__ = 'storage_host_grp_host_rels'
+    __table_args__ = (
+        Index('ix_storage_host_grp_host_rels_storage_native',
+              'storage_id', 'native_storage_host_group_id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -383,6 +486,10 @@ class StorageHostGrpHostRel(BASE, DelfinBase):
 class PortGrpPortRel(BASE, DelfinBase):
     """Represents port group and port relation attributes."""
     __tablename__ = 'port_grp_port_rels'
+    __table_args__ = (
+        Index('ix_port_grp_port_rels_storage_native',
+              'storage_id', 'native_port_group_id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -394,6 +501,10 @@ class PortGrpPortRel(BASE, DelfinBase):
 class VolGrpVolRel(BASE, DelfinBase):
     """Represents the volume group and volume relation attributes."""
     __tablename__ = 'vol_grp_vol_rels'
+    __table_args__ = (
+        Index('ix_vol_grp_vol_rels_storage_native',
+              'storage_id', 'native_volume_group_id'),
+        {'mysql_engine': 'InnoDB'})
     id = Column(String(36), primary_key=True)
     storage_id = Column(String(36))
     name = Column(String(255))
@@ -165,6 +165,11 @@ class API(object):
         driver = self.driver_manager.get_driver(context, storage_id=storage_id)
         return driver.get_capabilities(context, filters)
 
+    def get_latest_perf_timestamp(self, context, storage_id):
+        """Get the timestamp of the latest performance data of the device"""
+        driver = self.driver_manager.get_driver(context, storage_id=storage_id)
+        return driver.get_latest_perf_timestamp(context)
+
     def list_storage_host_initiators(self, context, storage_id):
         """List all storage initiators from storage system."""
         driver = self.driver_manager.get_driver(context, storage_id=storage_id)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 from oslo_log import log
 from oslo_utils import units
 
@@ -205,6 +206,24 @@ class VMAXClient(object):
             LOG.error("Failed to get pool metrics from VMAX")
             raise
 
+    def get_volume_details(self, storage_id, params):
+        """Get the details of the volumes filtered by params.
+        The details are listed in pages by the volume iterator, the volumes
+        are got one by one on a bounded pool if Unisphere can't list them.
+        """
+        array = self.array_id[storage_id]
+        vol_dicts = self.rest.get_volume_details_list(
+            array, self.uni_version, params)
+        if all('cap_mb' in vol_dict for vol_dict in vol_dicts):
+            return vol_dicts
+
+        # Unisphere listed the volume ids only
+        device_ids = [vol_dict['volumeId'] for vol_dict in vol_dicts]
+        pool = eventlet.GreenPool(consts.VOLUME_DETAIL_CONCURRENCY)
+        return list(pool.imap(
+            lambda device_id: self.rest.get_volume(
+                array, self.uni_version, device_id), device_ids))
+
     def list_volumes(self, storage_id):
 
         try:
@@ -212,9 +231,8 @@ class VMAXClient(object):
             default_srps = self.rest.get_default_srps(
                 self.array_id[storage_id], version=self.uni_version)
             # List all volumes except data volumes
-            volumes = self.rest.get_volume_list(
-                self.array_id[storage_id], version=self.uni_version,
-                params={'data_volume': 'false'})
+            vol_dicts = self.get_volume_details(
+                storage_id, params={'data_volume': 'false'})
 
             # TODO: Update constants.VolumeStatus to make mapping more precise
             switcher = {
@@ -225,12 +243,11 @@ class VMAXClient(object):
                 'N/A': constants.VolumeStatus.ERROR,
             }
 
+            # Volumes share few storage groups, get each of them only once
+            sg_infos = {}
             volume_list = []
-            for volume in volumes:
-                # Get volume details
-                vol = self.rest.get_volume(self.array_id[storage_id],
-                                           self.uni_version, volume)
-
+            for vol in vol_dicts:
+                volume = vol['volumeId']
                 emulation_type = vol['emulation']
                 total_cap = vol['cap_mb'] * units.Mi
                 used_cap = (total_cap * vol['allocated_percent']) / 100.0
@@ -262,8 +279,10 @@ class VMAXClient(object):
 
                 if vol['num_of_storage_groups'] == 1:
                     sg = vol['storageGroupId'][0]
-                    sg_info = self.rest.get_storage_group(
-                        self.array_id[storage_id], self.uni_version, sg)
+                    if sg not in sg_infos:
+                        sg_infos[sg] = self.rest.get_storage_group(
+                            self.array_id[storage_id], self.uni_version, sg)
+                    sg_info = sg_infos[sg]
                     v['native_storage_pool_id'] = \
                         sg_info.get('srp', default_srps[emulation_type])
                     v['compressed'] = sg_info.get('compression', False)
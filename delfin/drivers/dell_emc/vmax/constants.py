@@ -17,6 +17,10 @@
 # minimum interval supported by VMAX
 VMAX_PERF_MIN_INTERVAL = 5
 
+# Maximum number of volume detail requests in flight, also the number of
+# pooled connections of the rest session
+VOLUME_DETAIL_CONCURRENCY = 16
+
 BEDIRECTOR_METRICS = {
     'iops': 'IOs',
     'throughput': 'MBs',
@@ -100,7 +100,8 @@ class VMaxRest(object):
             LOG.debug("Enable certificate verification, ca_path: {0}".format(
                 self.verify))
             session.verify = self.verify
-        session.mount("https://", ssl_utils.get_host_name_ignore_adapter())
+        session.mount("https://", ssl_utils.get_host_name_ignore_adapter(
+            pool_maxsize=constants.VOLUME_DETAIL_CONCURRENCY))
 
         self.session = session
         return session
@@ -562,6 +563,24 @@ class VMaxRest(object):
             pass
         return device_ids
 
+    def get_volume_details_list(self, array, version, params):
+        """Get a filtered list of VMax volumes with details from array.
+        All the pages of the volume iterator are retrieved, each entry holds
+        the details of one volume if Unisphere supports listing them.
+        :param array: the array serial number
+        :param version: the unisphere version
+        :param params: filter parameters
+        :returns: volume dict list, the entries hold only the volume ids if
+                  listing details is not supported by Unisphere
+        """
+        params = dict(params or {}, details='true')
+        volume_dict_list = self.get_resource(
+            array, SLOPROVISIONING, 'volume', version=version, params=params)
+        if not isinstance(volume_dict_list, list):
+            return []
+        return [vol_dict for vol_dict in volume_dict_list
+                if isinstance(vol_dict, dict) and 'volumeId' in vol_dict]
+
     def get_director(self, array, version, device_id):
         """Get a VMAX director from array.
         :param array: the array serial number
@@ -11,18 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 import random
 import decorator
 
 import math
 import time
+import uuid
 
 import six
 from eventlet import greenthread
 from oslo_config import cfg
 from oslo_log import log
-from oslo_utils import uuidutils
 
 from delfin import exception, db
 from delfin.common import constants
@@ -46,6 +45,10 @@ fake_opts = [
     cfg.StrOpt('fake_page_query_limit',
                default='500',
                help='The limitation of volumes for each query.'),
+    cfg.IntOpt('fake_seed',
+               help='Seed of the resources and the metrics generated for '
+                    'each device, which are the same in every run with '
+                    'the same seed. They are random if not set.'),
 ]
 
 CONF.register_opts(fake_opts, "fake_driver")
@@ -102,12 +105,14 @@ def get_range_val(range_str, t):
         raise exception.InvalidInput
 
 
-def wait_random(low, high):
+def wait_random():
+    """Sleep a random time in fake_api_time_range before calling the API."""
     @decorator.decorator
     def _wait(f, *a, **k):
         rd = random.randint(0, 100)
-        secs = low + (high - low) * rd / 100
-        greenthread.sleep(secs)
+        secs = MIN_WAIT + (MAX_WAIT - MIN_WAIT) * rd / 100
+        if secs > 0:
+            greenthread.sleep(secs)
         return f(*a, **k)
 
     return _wait
@@ -129,25 +134,43 @@ class FakeStorageDriver(driver.StorageDriver):
         MIN_VOLUME, MAX_VOLUME = get_range_val(
             CONF.fake_driver.fake_volume_range, int)
         PAGE_LIMIT = int(CONF.fake_driver.fake_page_query_limit)
-        self.rd_volumes_count = random.randint(MIN_VOLUME, MAX_VOLUME)
-        self.rd_ports_count = random.randint(MIN_PORTS, MAX_PORTS)
-        self.rd_storage_hosts_count = random.randint(MIN_STORAGE_HOSTS,
-                                                     MAX_STORAGE_HOSTS)
-
-    def _get_random_capacity(self):
-        total = random.randint(1000, 2000)
-        used = int(random.randint(0, 100) * total / 100)
+        if CONF.fake_driver.fake_seed is None:
+            self.random = random.Random()
+        else:
+            # Each device has its own resources
+            self.random = random.Random('%s:%s' % (
+                CONF.fake_driver.fake_seed, self.storage_id))
+        self.rd_volumes_count = self.random.randint(MIN_VOLUME, MAX_VOLUME)
+        self.rd_ports_count = self.random.randint(MIN_PORTS, MAX_PORTS)
+        self.rd_storage_hosts_count = self.random.randint(
+            MIN_STORAGE_HOSTS, MAX_STORAGE_HOSTS)
+
+    def _get_random(self, method_name):
+        """Random generator of a list method, seeded for each call so that
+        the faked resources don't depend on the calls before it.
+        """
+        if CONF.fake_driver.fake_seed is None:
+            return self.random
+        return random.Random('%s:%s:%s' % (
+            CONF.fake_driver.fake_seed, self.storage_id, method_name))
+
+    def _get_random_capacity(self, rand=None):
+        rand = rand or self.random
+        total = rand.randint(1000, 2000)
+        used = int(rand.randint(0, 100) * total / 100)
         free = total - used
         return total, used, free
 
     def reset_connection(self, context, **kwargs):
         pass
 
-    @wait_random(MIN_WAIT, MAX_WAIT)
+    @wait_random()
     def get_storage(self, context):
         # Do something here
 
-        sn = six.text_type(uuidutils.generate_uuid())
+        rand = self._get_random('get_storage')
+        sn = six.text_type(uuid.UUID(int=rand.getrandbits(128),
+                                     version=4))
         try:
             # use existing sn if already registered storage
             storage = db.storage_get(context, self.storage_id)
@@ -157,9 +180,9 @@ class FakeStorageDriver(driver.StorageDriver):
             LOG.debug('Registering new storage')
         except Exception:
             LOG.info('Error while retrieving storage from DB')
-        total, used, free = self._get_random_capacity()
-        raw = random.randint(2000, 3000)
-        subscribed = random.randint(3000, 4000)
+        total, used, free = self._get_random_capacity(rand)
+        raw = rand.randint(2000, 3000)
+        subscribed = rand.randint(3000, 4000)
         return {
             'name': 'fake_driver',
             'description': 'fake driver.',
@@ -176,14 +199,15 @@ class FakeStorageDriver(driver.StorageDriver):
             'subscribed_capacity': subscribed
         }
 
-    @wait_random(MIN_WAIT, MAX_WAIT)
+    @wait_random()
     def list_storage_pools(self, ctx):
-        rd_pools_count = random.randint(MIN_POOL, MAX_POOL)
+        rand = self._get_random('list_storage_pools')
+        rd_pools_count = rand.randint(MIN_POOL, MAX_POOL)
         LOG.info("###########fake_pools number for %s: %d" % (self.storage_id,
                                                               rd_pools_count))
         pool_list = []
         for idx in range(rd_pools_count):
-            total, used, free = self._get_random_capacity()
+            total, used, free = self._get_random_capacity(rand)
             p = {
                 "name": "storagePool_" + str(idx),
                 "storage_id": self.storage_id,
@@ -199,6 +223,7 @@ class FakeStorageDriver(driver.StorageDriver):
 
     def list_volumes(self, ctx):
         # Get a random number as the volume count.
+        rand = self._get_random('list_volumes')
         rd_volumes_count = self.rd_volumes_count
         LOG.info("###########fake_volumes number for %s: %d" % (
             self.storage_id, rd_volumes_count))
@@ -209,17 +234,19 @@ class FakeStorageDriver(driver.StorageDriver):
             end = (idx + 1) * PAGE_LIMIT
             if idx == (loops - 1):
                 end = rd_volumes_count
-            vs = self._get_volume_range(start, end)
+            vs = self._get_volume_range(start, end, rand)
             volume_list = volume_list + vs
         return volume_list
 
     def list_controllers(self, ctx):
-        rd_controllers_count = random.randint(MIN_CONTROLLERS, MAX_CONTROLLERS)
+        rand = self._get_random('list_controllers')
+        rd_controllers_count = rand.randint(MIN_CONTROLLERS,
+                                            MAX_CONTROLLERS)
         LOG.info("###########fake_controllers for %s: %d" %
                  (self.storage_id, rd_controllers_count))
         ctrl_list = []
         for idx in range(rd_controllers_count):
-            total, used, free = self._get_random_capacity()
+            total, used, free = self._get_random_capacity(rand)
             cpu = ["Intel Xenon", "Intel Core ix", "ARM"]
             sts = list(constants.ControllerStatus.ALL)
             sts_len = len(constants.ControllerStatus.ALL) - 1
@@ -227,22 +254,23 @@ class FakeStorageDriver(driver.StorageDriver):
                 "name": "controller_" + str(idx),
                 "storage_id": self.storage_id,
                 "native_controller_id": "controller_" + str(idx),
-                "location": "loc_" + str(random.randint(0, 99)),
-                "status": sts[random.randint(0, sts_len)],
+                "location": "loc_" + str(rand.randint(0, 99)),
+                "status": sts[rand.randint(0, sts_len)],
                 "memory_size": total,
-                "cpu_info": cpu[random.randint(0, 2)],
-                "soft_version": "ver_" + str(random.randint(0, 999)),
+                "cpu_info": cpu[rand.randint(0, 2)],
+                "soft_version": "ver_" + str(rand.randint(0, 999)),
             }
             ctrl_list.append(c)
         return ctrl_list
 
     def list_ports(self, ctx):
+        rand = self._get_random('list_ports')
         rd_ports_count = self.rd_ports_count
         LOG.info("###########fake_ports for %s: %d" % (self.storage_id,
                                                        rd_ports_count))
         port_list = []
         for idx in range(rd_ports_count):
-            max_s, normal, remain = self._get_random_capacity()
+            max_s, normal, remain = self._get_random_capacity(rand)
             conn_sts = list(constants.PortConnectionStatus.ALL)
             conn_sts_len = len(constants.PortConnectionStatus.ALL) - 1
             health_sts = list(constants.PortHealthStatus.ALL)
@@ -255,20 +283,21 @@ class FakeStorageDriver(driver.StorageDriver):
                 "name": "port_" + str(idx),
                 "storage_id": self.storage_id,
                 "native_port_id": "port_" + str(idx),
-                "location": "location_" + str(random.randint(0, 99)),
+                "location": "location_" + str(rand.randint(0, 99)),
                 "connection_status": conn_sts[
-                    random.randint(0, conn_sts_len)],
+                    rand.randint(0, conn_sts_len)],
                 "health_status": health_sts[
-                    random.randint(0, health_sts_len)],
+                    rand.randint(0, health_sts_len)],
                 "type": port_type[
-                    random.randint(0, port_type_len)],
+                    rand.randint(0, port_type_len)],
                 "logical_type": logic_type[
-                    random.randint(0, logic_type_len)],
+                    rand.randint(0, logic_type_len)],
                 "speed": normal,
                 "max_speed": max_s,
-                "native_parent_id": "parent_id_" + str(random.randint(0, 99)),
-                "wwn": "wwn_" + str(random.randint(0, 9999)),
-                "mac_address": "mac_" + str(random.randint(0, 9999)),
+                "native_parent_id":
+                    "parent_id_" + str(rand.randint(0, 99)),
+                "wwn": "wwn_" + str(rand.randint(0, 9999)),
+                "mac_address": "mac_" + str(rand.randint(0, 9999)),
                 "ipv4": "0.0.0.0",
                 "ipv4_mask": "255.255.255.0",
                 "ipv6": "0",
@@ -278,12 +307,13 @@ class FakeStorageDriver(driver.StorageDriver):
         return port_list
 
     def list_disks(self, ctx):
-        rd_disks_count = random.randint(MIN_DISK, MAX_DISK)
+        rand = self._get_random('list_disks')
+        rd_disks_count = rand.randint(MIN_DISK, MAX_DISK)
         LOG.info("###########fake_disks for %s: %d" % (self.storage_id,
                                                        rd_disks_count))
         disk_list = []
         for idx in range(rd_disks_count):
-            max_s, normal, remain = self._get_random_capacity()
+            max_s, normal, remain = self._get_random_capacity(rand)
             manufacturer = ["Intel", "Seagate", "WD", "Crucial", "HP"]
             sts = list(constants.DiskStatus.ALL)
             sts_len = len(constants.DiskStatus.ALL) - 1
@@ -295,64 +325,68 @@ class FakeStorageDriver(driver.StorageDriver):
                 "name": "disk_" + str(idx),
                 "storage_id": self.storage_id,
                 "native_disk_id": "disk_" + str(idx),
-                "serial_number": "serial_" + str(random.randint(0, 9999)),
-                "manufacturer": manufacturer[random.randint(0, 4)],
-                "model": "model_" + str(random.randint(0, 9999)),
-                "firmware": "firmware_" + str(random.randint(0, 9999)),
+                "serial_number": "serial_" + str(rand.randint(0, 9999)),
+                "manufacturer": manufacturer[rand.randint(0, 4)],
+                "model": "model_" + str(rand.randint(0, 9999)),
+                "firmware": "firmware_" + str(rand.randint(0, 9999)),
                 "speed": normal,
                 "capacity": max_s,
-                "status": sts[random.randint(0, sts_len)],
+                "status": sts[rand.randint(0, sts_len)],
                 "physical_type": physical_type[
-                    random.randint(0, physical_type_len)],
-                "logical_type": logic_type[random.randint(0, logic_type_len)],
-                "health_score": random.randint(0, 100),
-                "native_diskgroup_id": "dg_id_" + str(random.randint(0, 99)),
-                "location": "location_" + str(random.randint(0, 99)),
+                    rand.randint(0, physical_type_len)],
+                "logical_type":
+                    logic_type[rand.randint(0, logic_type_len)],
+                "health_score": rand.randint(0, 100),
+                "native_diskgroup_id":
+                    "dg_id_" + str(rand.randint(0, 99)),
+                "location": "location_" + str(rand.randint(0, 99)),
             }
             disk_list.append(c)
         return disk_list
 
     def list_quotas(self, ctx):
-        rd_quotas_count = random.randint(MIN_QUOTA, MAX_QUOTA)
+        rand = self._get_random('list_quotas')
+        rd_quotas_count = rand.randint(MIN_QUOTA, MAX_QUOTA)
         LOG.info("###########fake_quotas for %s: %d"
                  % (self.storage_id, rd_quotas_count))
         quota_list = []
         for idx in range(rd_quotas_count):
             qtype = list(constants.QuotaType.ALL)
             qtype_len = len(constants.QuotaType.ALL) - 1
-            max_cap = random.randint(1111, 9999)
-            fslimit = random.randint(max_cap * 7, max_cap * 8)
-            fhlimit = random.randint(max_cap * 8, max_cap * 9)
-            slimit = random.randint(max_cap * 7000, max_cap * 8000)
-            hlimit = random.randint(max_cap * 8000, max_cap * 9000)
+            max_cap = rand.randint(1111, 9999)
+            fslimit = rand.randint(max_cap * 7, max_cap * 8)
+            fhlimit = rand.randint(max_cap * 8, max_cap * 9)
+            slimit = rand.randint(max_cap * 7000, max_cap * 8000)
+            hlimit = rand.randint(max_cap * 8000, max_cap * 9000)
             user_group = ['usr_', 'grp_']
             q = {
                 "native_quota_id": "quota_" + str(idx),
-                "type": qtype[random.randint(0, qtype_len)],
+                "type": qtype[rand.randint(0, qtype_len)],
                 "storage_id": self.storage_id,
                 "native_filesystem_id": "quota_"
-                                        + str(random.randint(0, 99)),
+                                        + str(rand.randint(0, 99)),
                 "native_qtree_id": "qtree_"
-                                   + str(random.randint(0, 99)),
+                                   + str(rand.randint(0, 99)),
                 "capacity_hard_limit": hlimit,
                 "capacity_soft_limit": slimit,
                 "file_hard_limit": fhlimit,
                 "file_soft_limit": fslimit,
-                "file_count": random.randint(0, max_cap * 10),
-                "used_capacity": random.randint(0, max_cap * 10000),
-                "user_group_name": user_group[random.randint(0, 1)]
-                                   + str(random.randint(0, 99)),
+                "file_count": rand.randint(0, max_cap * 10),
+                "used_capacity": rand.randint(0, max_cap * 10000),
+                "user_group_name": user_group[rand.randint(0, 1)]
+                                   + str(rand.randint(0, 99)),
             }
             quota_list.append(q)
         return quota_list
 
     def list_filesystems(self, ctx):
-        rd_filesystems_count = random.randint(MIN_FS, MAX_FS)
+        rand = self._get_random('list_filesystems')
+        rd_filesystems_count = rand.randint(MIN_FS, MAX_FS)
         LOG.info("###########fake_filesystems for %s: %d"
                  % (self.storage_id, rd_filesystems_count))
         filesystem_list = []
         for idx in range(rd_filesystems_count):
-            total, used, free = self._get_random_capacity()
+            total, used, free = self._get_random_capacity(rand)
             boolean = [True, False]
             sts = list(constants.FilesystemStatus.ALL)
             sts_len = len(constants.FilesystemStatus.ALL) - 1
@@ -367,21 +401,23 @@ class FakeStorageDriver(driver.StorageDriver):
                 "storage_id": self.storage_id,
                 "native_filesystem_id": "filesystem_" + str(idx),
                 "native_pool_id": "storagePool_" + str(idx),
-                "status": sts[random.randint(0, sts_len)],
-                "type": alloc_type[random.randint(0, alloc_type_len)],
-                "security_mode": security[random.randint(0, security_len)],
+                "status": sts[rand.randint(0, sts_len)],
+                "type": alloc_type[rand.randint(0, alloc_type_len)],
+                "security_mode":
+                    security[rand.randint(0, security_len)],
                 "total_capacity": total,
                 "used_capacity": used,
                 "free_capacity": free,
-                "worm": worm[random.randint(0, worm_len)],
-                "deduplicated": boolean[random.randint(0, 1)],
-                "compressed": boolean[random.randint(0, 1)],
+                "worm": worm[rand.randint(0, worm_len)],
+                "deduplicated": boolean[rand.randint(0, 1)],
+                "compressed": boolean[rand.randint(0, 1)],
             }
             filesystem_list.append(f)
         return filesystem_list
 
     def list_qtrees(self, ctx):
-        rd_qtrees_count = random.randint(MIN_QTREE, MAX_QTREE)
+        rand = self._get_random('list_qtrees')
+        rd_qtrees_count = rand.randint(MIN_QTREE, MAX_QTREE)
         LOG.info("###########fake_qtrees for %s: %d"
                  % (self.storage_id, rd_qtrees_count))
         qtree_list = []
@@ -394,16 +430,18 @@ class FakeStorageDriver(driver.StorageDriver):
                 "storage_id": self.storage_id,
                 "native_qtree_id": "qtree_" + str(idx),
                 "native_filesystem_id": "filesystem_"
-                                        + str(random.randint(0, 99)),
-                "security_mode": security[random.randint(0, security_len)],
-                "path": "/path/qtree_" + str(random.randint(0, 99)),
+                                        + str(rand.randint(0, 99)),
+                "security_mode":
+                    security[rand.randint(0, security_len)],
+                "path": "/path/qtree_" + str(rand.randint(0, 99)),
             }
             qtree_list.append(t)
 
         return qtree_list
 
     def list_shares(self, ctx):
-        rd_shares_count = random.randint(MIN_SHARE, MAX_SHARE)
+        rand = self._get_random('list_shares')
+        rd_shares_count = rand.randint(MIN_SHARE, MAX_SHARE)
         LOG.info("###########fake_shares for %s: %d"
                  % (self.storage_id, rd_shares_count))
         share_list = []
@@ -415,11 +453,11 @@ class FakeStorageDriver(driver.StorageDriver):
                 "storage_id": self.storage_id,
                 "native_share_id": "share_" + str(idx),
                 "native_filesystem_id": "filesystem_"
-                                        + str(random.randint(0, 99)),
+                                        + str(rand.randint(0, 99)),
                 "native_qtree_id": "qtree_"
-                                   + str(random.randint(0, 99)),
-                "protocol": pro[random.randint(0, pro_len)],
-                "path": "/path/share_" + str(random.randint(0, 99)),
+                                   + str(rand.randint(0, 99)),
+                "protocol": pro[rand.randint(0, pro_len)],
+                "path": "/path/share_" + str(rand.randint(0, 99)),
             }
             share_list.append(c)
         return share_list
@@ -440,7 +478,7 @@ class FakeStorageDriver(driver.StorageDriver):
     def list_alerts(self, context, query_para=None):
         alert_list = [{
             "storage_id": self.storage_id,
-            'alert_id': str(random.randint(1111111, 9999999)),
+            'alert_id': str(self.random.randint(1111111, 9999999)),
             'sequence_number': 100,
             'alert_name': 'SNMP connect failed',
             'category': 'Fault',
@@ -452,7 +490,7 @@ class FakeStorageDriver(driver.StorageDriver):
             'occur_time': int(time.time())
         }, {
             "storage_id": self.storage_id,
-            'alert_id': str(random.randint(1111111, 9999999)),
+            'alert_id': str(self.random.randint(1111111, 9999999)),
             'sequence_number': 101,
             'alert_name': 'Link state down',
             'category': 'Fault',
@@ -464,7 +502,7 @@ class FakeStorageDriver(driver.StorageDriver):
             'occur_time': int(time.time())
         }, {
             "storage_id": self.storage_id,
-            'alert_id': str(random.randint(1111111, 9999999)),
+            'alert_id': str(self.random.randint(1111111, 9999999)),
             'sequence_number': 102,
             'alert_name': 'Power failure',
             'category': 'Fault',
@@ -476,7 +514,7 @@ class FakeStorageDriver(driver.StorageDriver):
             'occur_time': int(time.time())
         }, {
             "storage_id": self.storage_id,
-            'alert_id': str(random.randint(1111111, 9999999)),
+            'alert_id': str(self.random.randint(1111111, 9999999)),
             'sequence_number': 103,
             'alert_name': 'Communication failure',
             'category': 'Fault',
@@ -489,12 +527,12 @@ class FakeStorageDriver(driver.StorageDriver):
         }]
         return alert_list
 
-    @wait_random(MIN_WAIT, MAX_WAIT)
-    def _get_volume_range(self, start, end):
+    @wait_random()
+    def _get_volume_range(self, start, end, rand=None):
         volume_list = []
 
         for i in range(start, end):
-            total, used, free = self._get_random_capacity()
+            total, used, free = self._get_random_capacity(rand)
             v = {
                 "name": "volume_" + str(i),
                 "storage_id": self.storage_id,
@@ -514,7 +552,7 @@ class FakeStorageDriver(driver.StorageDriver):
             rtv = {}
             timestamp = start_time
             while timestamp < end_time:
-                rtv[timestamp] = random.uniform(1, 100)
+                rtv[timestamp] = self.random.uniform(1, 100)
                 timestamp += MINIMUM_SAMPLE_DURATION_IN_MS
 
             return rtv
@@ -526,13 +564,13 @@ class FakeStorageDriver(driver.StorageDriver):
             performance_params[key] = get_random_timestamp_value()
         return performance_params
 
-    @wait_random(MIN_WAIT, MAX_WAIT)
+    @wait_random()
     def get_resource_perf_metrics(self, storage_id, start_time, end_time,
                                   resource_type, metric_list):
         LOG.info("###########collecting metrics for resource %s: from"
                  " storage  %s" % (resource_type, self.storage_id))
         resource_metrics = []
-        resource_count = RESOURCE_COUNT_DICT[resource_type]
+        resource_count = self._get_resource_count(resource_type)
 
         for i in range(resource_count):
             labels = {'storage_id': storage_id,
@@ -542,13 +580,22 @@ class FakeStorageDriver(driver.StorageDriver):
             fake_metrics = self._get_random_performance(metric_list,
                                                         start_time, end_time)
             for key in metric_list.keys():
-                labels['unit'] = metric_list[key]['unit']
-                m = constants.metric_struct(name=key, labels=labels,
-                                            values=fake_metrics[key])
-                resource_metrics.append(copy.deepcopy(m))
+                m = constants.metric_struct(
+                    name=key, labels=dict(labels,
+                                          unit=metric_list[key]['unit']),
+                    values=fake_metrics[key])
+                resource_metrics.append(m)
         return resource_metrics
 
-    @wait_random(MIN_WAIT, MAX_WAIT)
+    def _get_resource_count(self, resource_type):
+        """The metrics of the volumes and ports listed by this device."""
+        if resource_type == ResourceType.VOLUME:
+            return self.rd_volumes_count
+        if resource_type == ResourceType.PORT:
+            return self.rd_ports_count
+        return RESOURCE_COUNT_DICT[resource_type]
+
+    @wait_random()
     def collect_perf_metrics(self, context, storage_id,
                              resource_metrics, start_time,
                              end_time):
@@ -869,7 +916,8 @@ class FakeStorageDriver(driver.StorageDriver):
         }
 
     def list_storage_host_initiators(self, ctx):
-        rd_storage_host_initiators_count = random.randint(
+        rand = self._get_random('list_storage_host_initiators')
+        rd_storage_host_initiators_count = rand.randint(
             MIN_STORAGE_HOST_INITIATORS, MAX_STORAGE_HOST_INITIATORS)
         LOG.info("###########fake_storage_host_initiators for %s: %d"
                  % (self.storage_id, rd_storage_host_initiators_count))
@@ -908,7 +956,8 @@ class FakeStorageDriver(driver.StorageDriver):
         return storage_host_list
 
     def list_storage_host_groups(self, ctx):
-        rd_storage_host_groups_count = random.randint(
+        rand = self._get_random('list_storage_host_groups')
+        rd_storage_host_groups_count = rand.randint(
             MIN_STORAGE_HOST_GROUPS, MAX_STORAGE_HOST_GROUPS)
         LOG.info("###########fake_storage_host_groups for %s: %d"
                  % (self.storage_id, rd_storage_host_groups_count))
@@ -920,7 +969,7 @@ class FakeStorageDriver(driver.StorageDriver):
             if storage_hosts_count > 0:
                 for i in range(MAX_GROUP_RESOURCES_SIZE):
                     host_name = "storage_host_" + str(
-                        random.randint(0, storage_hosts_count))
+                        rand.randint(0, storage_hosts_count))
                     if host_name not in host_name_list:
                         host_name_list.append(host_name)
 
@@ -967,8 +1016,9 @@ class FakeStorageDriver(driver.StorageDriver):
         return result
 
     def list_port_groups(self, ctx):
-        rd_port_groups_count = random.randint(MIN_PORT_GROUPS,
-                                              MAX_PORT_GROUPS)
+        rand = self._get_random('list_port_groups')
+        rd_port_groups_count = rand.randint(MIN_PORT_GROUPS,
+                                            MAX_PORT_GROUPS)
         LOG.info("###########fake_port_groups for %s: %d"
                  % (self.storage_id, rd_port_groups_count))
         port_grp_list = []
@@ -979,7 +1029,7 @@ class FakeStorageDriver(driver.StorageDriver):
             if ports_count > 0:
                 for i in range(MAX_GROUP_RESOURCES_SIZE):
                     port_name = "port_" + str(
-                        random.randint(0, ports_count))
+                        rand.randint(0, ports_count))
                     if port_name not in port_name_list:
                         port_name_list.append(port_name)
 
@@ -1023,8 +1073,9 @@ class FakeStorageDriver(driver.StorageDriver):
         return result
 
     def list_volume_groups(self, ctx):
-        rd_volume_groups_count = random.randint(MIN_VOLUME_GROUPS,
-                                                MAX_VOLUME_GROUPS)
+        rand = self._get_random('list_volume_groups')
+        rd_volume_groups_count = rand.randint(MIN_VOLUME_GROUPS,
+                                              MAX_VOLUME_GROUPS)
         LOG.info("###########fake_volume_groups for %s: %d"
                  % (self.storage_id, rd_volume_groups_count))
         volume_grp_list = []
@@ -1035,7 +1086,7 @@ class FakeStorageDriver(driver.StorageDriver):
             if volumes_count > 0:
                 for i in range(MAX_GROUP_RESOURCES_SIZE):
                     volume_name = "volume_" + str(
-                        random.randint(0, volumes_count))
+                        rand.randint(0, volumes_count))
                     if volume_name not in volume_name_list:
                         volume_name_list.append(volume_name)
 
@@ -1078,15 +1129,16 @@ class FakeStorageDriver(driver.StorageDriver):
         return result
 
     def list_masking_views(self, ctx):
-        rd_masking_views_count = random.randint(MIN_MASKING_VIEWS,
-                                                MAX_MASKING_VIEWS)
+        rand = self._get_random('list_masking_views')
+        rd_masking_views_count = rand.randint(MIN_MASKING_VIEWS,
+                                              MAX_MASKING_VIEWS)
         LOG.info("##########fake_masking_views for %s: %d"
                  % (self.storage_id, rd_masking_views_count))
         masking_view_list = []
 
         for idx in range(rd_masking_views_count):
-            is_group_based = random.randint(NON_GROUP_BASED_MASKING,
-                                            GROUP_BASED_MASKING)
+            is_group_based = rand.randint(NON_GROUP_BASED_MASKING,
+                                          GROUP_BASED_MASKING)
             if is_group_based:
                 native_storage_host_group_id = "storage_host_group_" + str(idx)
                 native_volume_group_id = "volume_group_" + str(idx)
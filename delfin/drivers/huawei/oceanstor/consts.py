@@ -157,6 +157,12 @@ FILE_SYSTEM_POOL_TYPE = '2'
 SECTORS_SIZE = 512
 QUERY_PAGE_SIZE = 100
 
+# Number of objects queried in one cur_statistic_data request
+METRICS_QUERY_BATCH_SIZE = 100
+# Number of cur_statistic_data requests in flight, also the number of
+# pooled connections of the rest session
+METRICS_QUERY_CONCURRENCY = 8
+
 THICK_LUNTYPE = '0'
 THIN_LUNTYPE = '1'
 
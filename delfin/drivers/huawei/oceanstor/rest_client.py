@@ -16,6 +16,8 @@
 
 import json
 
+import eventlet
+from eventlet import semaphore
 import requests
 import six
 import urllib3
@@ -71,6 +73,13 @@ class RestClient(object):
         self.url = None
         self.device_id = None
         self.verify = None
+        # Whether the objects could be queried in bulk for metrics,
+        # None until it's found out by the first batch query
+        self.batch_metrics_supported = None
+        # The concurrent requests relogin one at a time, and only if no
+        # other request has logged in since they were sent
+        self.login_lock = semaphore.Semaphore()
+        self.session_generation = 0
         urllib3.disable_warnings(InsecureRequestWarning)
         self.reset_connection(**kwargs)
 
@@ -91,11 +100,14 @@ class RestClient(object):
             "Content-Type": "application/json"})
         if not self.verify:
             self.session.verify = False
+            self.session.mount("https://", requests.adapters.HTTPAdapter(
+                pool_maxsize=consts.METRICS_QUERY_CONCURRENCY))
         else:
             LOG.debug("Enable certificate verification, verify: {0}".format(
                 self.verify))
             self.session.verify = self.verify
-            self.session.mount("https://", HostNameIgnoreAdapter())
+            self.session.mount("https://", HostNameIgnoreAdapter(
+                pool_maxsize=consts.METRICS_QUERY_CONCURRENCY))
 
         self.session.trust_env = False
 
@@ -179,6 +191,7 @@ class RestClient(object):
             self.device_id = device_id
             self.url = item_url + device_id
             self.session.headers['iBaseToken'] = result['data']['iBaseToken']
+            self.session_generation += 1
             if (result['data']['accountstate']
                     in (consts.PWD_EXPIRED, consts.PWD_RESET)):
                 self.logout()
@@ -202,13 +215,13 @@ class RestClient(object):
         """
         device_id = None
         old_url = self.url
+        generation = self.session_generation
         result = self.do_call(url, data, method,
                               log_filter_flag=log_filter_flag)
         error_code = result['error']['code']
         if (error_code == consts.ERROR_CONNECT_TO_SERVER
                 or error_code == consts.ERROR_UNAUTHORIZED_TO_SERVER):
-            LOG.error("Can't open the recent url, relogin.")
-            device_id = self.login()
+            device_id = self.relogin(generation)
 
         if device_id is not None:
             LOG.debug('Replace URL: \n'
@@ -222,6 +235,20 @@ class RestClient(object):
                 result['error']['code'] = 0
         return result
 
+    def relogin(self, generation):
+        """Login again unless another request did since generation.
+
+        :param generation: session_generation the failed request was sent in
+        :returns: device id of the new session
+        """
+        with self.login_lock:
+            if generation != self.session_generation:
+                LOG.debug("Another request logged in again, retry on its "
+                          "session.")
+                return self.device_id
+            LOG.error("Can't open the recent url, relogin.")
+            return self.login()
+
     def paginated_call(self, url, data=None, method=None,
                        params=None, log_filter_flag=False,
                        page_size=consts.QUERY_PAGE_SIZE):
@@ -495,35 +522,115 @@ class RestClient(object):
         return result['data']
 
     def _get_metrics(self, resource_type, resource_id, metrics_ids):
+        uuid = "{0}:{1}".format(resource_type, resource_id)
+        return self._get_uuids_metrics([uuid], metrics_ids)
+
+    def _get_uuids_metrics(self, uuids, metrics_ids):
         url = "/performace_statistic/cur_statistic_data"
-        params = "CMO_STATISTIC_UUID={0}:{1}&CMO_STATISTIC_DATA_ID_LIST={2}&"\
+        params = "CMO_STATISTIC_UUID={0}&CMO_STATISTIC_DATA_ID_LIST={1}&"\
                  "timeConversion=0&"\
-            .format(resource_type, resource_id, metrics_ids)
+            .format(','.join(uuids), metrics_ids)
         return self.paginated_call(url, None, "GET",
                                    params=params, log_filter_flag=True)
 
-    def enable_metrics_collection(self):
-        return self._set_performance_switch('1')
-
-    def disable_metrics_collection(self):
-        return self._set_performance_switch('0')
-
-    def configure_metrics_collection(self):
-        self.disable_metrics_collection()
-        self._set_performance_strategy(hist_enable=1, hist_duration=300,
-                                       auto_stop=0, duration=60,
-                                       max_duration=0)
-        self.enable_metrics_collection()
-
-    def get_pool_metrics(self, storage_id, selection):
-        pools = self.get_all_pools()
-        pool_metrics = []
+    def _query_uuids_metrics(self, uuids, metrics_ids):
+        """Query the metrics of uuids in one request.
 
+        :returns: dict of uuid to its metric list, or to the exception
+                  raised if only one uuid is queried. The exception raised
+                  by a bulk query, which may be transient. None if the
+                  array answered the bulk query with metrics that can't be
+                  told apart, i.e. it doesn't support bulk queries
+        """
+        try:
+            metrics = self._get_uuids_metrics(uuids, metrics_ids)
+        except Exception as ex:
+            if len(uuids) == 1:
+                return {uuids[0]: ex}
+            LOG.warning("Failed to query metrics of {0} objects in bulk: "
+                        "{1}".format(len(uuids), ex))
+            return ex
+
+        if len(uuids) == 1:
+            return {uuids[0]: metrics}
+        uuid_metrics = {uuid: [] for uuid in uuids}
+        for metric in metrics:
+            uuid = metric.get('CMO_STATISTIC_UUID')
+            if uuid not in uuid_metrics:
+                return None
+            uuid_metrics[uuid].append(metric)
+        return uuid_metrics
+
+    def _get_batch_metrics(self, objects, metrics_ids):
+        """Get the metrics of the objects.
+
+        Up to METRICS_QUERY_BATCH_SIZE objects are queried in one request
+        if the array supports it, otherwise the objects are queried one by
+        one. The requests are sent concurrently, and the objects left out
+        of a bulk answer are queried again one by one.
+        :returns: dict of object uuid to its metric list, or to the
+                  exception raised when querying it
+        """
+        uuids = ["{0}:{1}".format(obj['TYPE'], obj['ID']) for obj in objects]
+        batch_size = consts.METRICS_QUERY_BATCH_SIZE
+        if self.batch_metrics_supported is False:
+            batch_size = 1
+        batches = [uuids[i:i + batch_size]
+                   for i in range(0, len(uuids), batch_size)]
+
+        pool = eventlet.GreenPool(consts.METRICS_QUERY_CONCURRENCY)
+        uuid_metrics = {}
+        failed_uuids = []
+        # Uuids without metrics in a bulk answer, the array may have only
+        # honoured some of the uuids of the query
+        missing_uuids = set()
+        unsupported = False
+        for batch, result in zip(batches, pool.imap(
+                lambda batch: self._query_uuids_metrics(batch, metrics_ids),
+                batches)):
+            if result is None or isinstance(result, Exception):
+                # A failed bulk query is retried one by one in this round
+                # only, the next rounds query in bulk again
+                unsupported = unsupported or result is None
+                failed_uuids.extend(batch)
+                continue
+            if len(batch) > 1:
+                answered = [uuid for uuid in batch if result[uuid]]
+                if len(answered) > 1:
+                    self.batch_metrics_supported = True
+                missing_uuids.update(uuid for uuid in batch
+                                     if not result[uuid])
+            uuid_metrics.update(result)
+
+        failed_uuids.extend(sorted(missing_uuids))
+        if failed_uuids:
+            for uuid, result in zip(failed_uuids, pool.imap(
+                    lambda uuid: self._query_uuids_metrics([uuid],
+                                                           metrics_ids),
+                    failed_uuids)):
+                metrics = result[uuid]
+                if uuid in missing_uuids and metrics \
+                        and not isinstance(metrics, Exception):
+                    # Left out of the bulk answer but has metrics
+                    unsupported = True
+                uuid_metrics.update(result)
+            if unsupported and not self.batch_metrics_supported:
+                LOG.info("Metrics can't be queried in bulk, query them "
+                         "one by one")
+                self.batch_metrics_supported = False
+        return uuid_metrics
+
+    def _get_resource_metrics(self, storage_id, resource_type, objects,
+                              selection, resource_cap, get_name):
+        resource_metrics = []
         select_metrics, select_ids = _get_selection(selection)
-        for pool in pools:
+        uuid_metrics = self._get_batch_metrics(objects, select_ids)
+        for obj in objects:
+            uuid = "{0}:{1}".format(obj['TYPE'], obj['ID'])
             try:
-                metrics = self._get_metrics(pool['TYPE'], pool['ID'],
-                                            select_ids)
+                metrics = uuid_metrics[uuid]
+                if isinstance(metrics, Exception):
+                    raise metrics
                 for metric in metrics:
                     data_list = metric['CMO_STATISTIC_DATA_LIST'].split(",")
                     for index, key in enumerate(select_metrics):
@@ -532,159 +639,63 @@ class RestClient(object):
                             data = data * 1000
                         labels = {
                             'storage_id': storage_id,
-                            'resource_type': 'pool',
-                            'resource_id': pool['ID'],
-                            'resource_name': pool['NAME'],
+                            'resource_type': resource_type,
+                            'resource_id': obj['ID'],
+                            'resource_name': get_name(obj),
                             'type': 'RAW',
-                            'unit': consts.POOL_CAP[key]['unit']
+                            'unit': resource_cap[key]['unit']
                         }
                         values = _get_timestamp_values(metric, data)
                         m = constants.metric_struct(name=key, labels=labels,
                                                     values=values)
-                        pool_metrics.append(m)
+                        resource_metrics.append(m)
             except Exception as ex:
-                msg = "Failed to get metrics for pool:{0} error: {1}" \
-                    .format(pool['NAME'], ex)
+                msg = "Failed to get metrics for {0}:{1} error: {2}" \
+                    .format(resource_type, obj['ID'], ex)
                 LOG.error(msg)
-        return pool_metrics
+        return resource_metrics
 
-    def get_volume_metrics(self, storage_id, selection):
-        volumes = self.get_all_volumes()
-        volume_metrics = []
+    def enable_metrics_collection(self):
+        return self._set_performance_switch('1')
 
-        select_metrics, select_ids = _get_selection(selection)
-        for volume in volumes:
-            try:
-                metrics = self._get_metrics(volume['TYPE'], volume['ID'],
-                                            select_ids)
-                for metric in metrics:
-                    data_list = metric['CMO_STATISTIC_DATA_LIST'].split(",")
-                    for index, key in enumerate(select_metrics):
-                        data = int(data_list[index])
-                        if key in consts.CONVERT_TO_MILLI_SECOND_LIST:
-                            data = data * 1000
-                        labels = {
-                            'storage_id': storage_id,
-                            'resource_type': 'volume',
-                            'resource_id': volume['ID'],
-                            'resource_name': volume['NAME'],
-                            'type': 'RAW',
-                            'unit': consts.VOLUME_CAP[key]['unit']
-                        }
-                        values = _get_timestamp_values(metric, data)
-                        m = constants.metric_struct(name=key, labels=labels,
-                                                    values=values)
-                        volume_metrics.append(m)
-            except Exception as ex:
-                msg = "Failed to get metrics for volume:{0} error: {1}" \
-                    .format(volume['NAME'], ex)
-                LOG.error(msg)
+    def disable_metrics_collection(self):
+        return self._set_performance_switch('0')
 
-        return volume_metrics
+    def configure_metrics_collection(self):
+        self.disable_metrics_collection()
+        self._set_performance_strategy(hist_enable=1, hist_duration=300,
+                                       auto_stop=0, duration=60,
+                                       max_duration=0)
+        self.enable_metrics_collection()
 
-    def get_controller_metrics(self, storage_id, selection):
-        controllers = self.get_all_controllers()
-        controller_metrics = []
+    def get_pool_metrics(self, storage_id, selection):
+        pools = self.get_all_pools()
+        return self._get_resource_metrics(
+            storage_id, 'pool', pools, selection, consts.POOL_CAP,
+            lambda pool: pool['NAME'])
 
-        select_metrics, select_ids = _get_selection(selection)
-        for controller in controllers:
-            try:
-                metrics = self._get_metrics(controller['TYPE'],
-                                            controller['ID'],
-                                            select_ids)
-                for metric in metrics:
-                    data_list = metric['CMO_STATISTIC_DATA_LIST'].split(",")
-                    for index, key in enumerate(select_metrics):
-                        data = int(data_list[index])
-                        if key in consts.CONVERT_TO_MILLI_SECOND_LIST:
-                            data = data * 1000
-                        labels = {
-                            'storage_id': storage_id,
-                            'resource_type': 'controller',
-                            'resource_id': controller['ID'],
-                            'resource_name': controller['NAME'],
-                            'type': 'RAW',
-                            'unit': consts.CONTROLLER_CAP[key]['unit']
-                        }
-                        values = _get_timestamp_values(metric, data)
-                        m = constants.metric_struct(name=key, labels=labels,
-                                                    values=values)
-                        controller_metrics.append(m)
-            except Exception as ex:
-                msg = "Failed to get metrics for controller:{0} error: {1}" \
-                    .format(controller['NAME'], ex)
-                LOG.error(msg)
+    def get_volume_metrics(self, storage_id, selection):
+        volumes = self.get_all_volumes()
+        return self._get_resource_metrics(
+            storage_id, 'volume', volumes, selection, consts.VOLUME_CAP,
+            lambda volume: volume['NAME'])
 
-        return controller_metrics
+    def get_controller_metrics(self, storage_id, selection):
+        controllers = self.get_all_controllers()
+        return self._get_resource_metrics(
+            storage_id, 'controller', controllers, selection,
+            consts.CONTROLLER_CAP, lambda controller: controller['NAME'])
 
     def get_port_metrics(self, storage_id, selection):
-        ports = self.get_all_ports()
-        port_metrics = []
-
-        select_metrics, select_ids = _get_selection(selection)
-        for port in ports:
-            # ETH_PORT collection not supported
-            if port['TYPE'] == 213:
-                continue
-            try:
-                metrics = self._get_metrics(port['TYPE'], port['ID'],
-                                            select_ids)
-                for metric in metrics:
-                    data_list = metric['CMO_STATISTIC_DATA_LIST'].split(",")
-                    for index, key in enumerate(select_metrics):
-                        data = int(data_list[index])
-                        if key in consts.CONVERT_TO_MILLI_SECOND_LIST:
-                            data = data * 1000
-                        labels = {
-                            'storage_id': storage_id,
-                            'resource_type': 'port',
-                            'resource_id': port['ID'],
-                            'resource_name': port['NAME'],
-                            'type': 'RAW',
-                            'unit': consts.PORT_CAP[key]['unit']
-                        }
-                        values = _get_timestamp_values(metric, data)
-                        m = constants.metric_struct(name=key, labels=labels,
-                                                    values=values)
-                        port_metrics.append(m)
-            except Exception as ex:
-                msg = "Failed to get metrics for port:{0} error: {1}" \
-                    .format(port['NAME'], ex)
-                LOG.error(msg)
-
-        return port_metrics
+        # ETH_PORT collection not supported
+        ports = [port for port in self.get_all_ports()
+                 if port['TYPE'] != 213]
+        return self._get_resource_metrics(
+            storage_id, 'port', ports, selection, consts.PORT_CAP,
+            lambda port: port['NAME'])
 
     def get_disk_metrics(self, storage_id, selection):
         disks = self.get_all_disks()
-        disk_metrics = []
-
-        select_metrics, select_ids = _get_selection(selection)
-        for disk in disks:
-            try:
-                metrics = self._get_metrics(disk['TYPE'], disk['ID'],
-                                            select_ids)
-                for metric in metrics:
-                    data_list = metric['CMO_STATISTIC_DATA_LIST'].split(",")
-                    for index, key in enumerate(select_metrics):
-                        data = int(data_list[index])
-                        if key in consts.CONVERT_TO_MILLI_SECOND_LIST:
-                            data = data * 1000
-                        labels = {
-                            'storage_id': storage_id,
-                            'resource_type': 'disk',
-                            'resource_id': disk['ID'],
-                            'type': 'RAW',
-                            'unit': consts.DISK_CAP[key]['unit'],
-                            'resource_name':
-                                disk['MODEL'] + ':' + disk['SERIALNUMBER']
-                        }
-                        values = _get_timestamp_values(metric, data)
-                        m = constants.metric_struct(name=key, labels=labels,
-                                                    values=values)
-                        disk_metrics.append(m)
-            except Exception as ex:
-                msg = "Failed to get metrics for disk:{0} error: {1}"\
-                    .format(disk['ID'], ex)
-                LOG.error(msg)
-
-        return disk_metrics
+        return self._get_resource_metrics(
+            storage_id, 'disk', disks, selection, consts.DISK_CAP,
+            lambda disk: disk['MODEL'] + ':' + disk['SERIALNUMBER'])
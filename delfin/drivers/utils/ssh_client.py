@@ -18,19 +18,32 @@ import time
 import paramiko
 import six
 from eventlet import pools
+from oslo_config import cfg
 from oslo_log import log as logging
 from paramiko.hostkeys import HostKeyEntry
 
 from delfin import cryptor
 from delfin import exception, utils
+from delfin.drivers.utils import ssh_session
 
 LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+# Sessions of the clients connecting in the default way are shared
+DEFAULT_SESSION_TYPE = 'default'
 
 
 class SSHClient(object):
     SOCKET_TIMEOUT = 10
 
-    def __init__(self, **kwargs):
+    def __init__(self, reuse_session=False, **kwargs):
+        """
+        :param reuse_session: run the commands on the shared keep-alive
+                              sessions of the array instead of a connection
+                              per command, for the arrays allowing several
+                              exec channels on one connection
+        """
+        self.reuse_session = reuse_session
         ssh_access = kwargs.get('ssh')
         if ssh_access is None:
             raise exception.InvalidInput('Input ssh_access is missing')
@@ -46,26 +59,30 @@ class SSHClient(object):
 
     def connect(self):
         self.ssh = paramiko.SSHClient()
+        self._connect(self.ssh)
 
+    def _connect(self, ssh):
         if self.ssh_pub_key is None:
-            self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         else:
             host_key = '%s %s %s' % \
                        (self.ssh_host, self.ssh_pub_key_type, self.ssh_pub_key)
-            self.set_host_key(host_key)
+            self.set_host_key(host_key, ssh)
 
-        self.ssh.connect(hostname=self.ssh_host, port=self.ssh_port,
-                         username=self.ssh_username,
-                         password=cryptor.decode(self.ssh_password),
-                         timeout=self.ssh_conn_timeout)
+        ssh.connect(hostname=self.ssh_host, port=self.ssh_port,
+                    username=self.ssh_username,
+                    password=cryptor.decode(self.ssh_password),
+                    timeout=self.ssh_conn_timeout)
 
-    def set_host_key(self, host_key):
+    def set_host_key(self, host_key, ssh=None):
         """
         Set public key,because input kwargs parameter host_key is string,
         not a file path,we can not use load file to get public key,so we set
         it as a string.
         :param str host_key: the public key which as a string
+        :param ssh: the paramiko.SSHClient, self.ssh if not given
         """
+        ssh = ssh or self.ssh
         if (len(host_key) == 0) or (host_key[0] == "#"):
             return
         try:
@@ -75,17 +92,21 @@ class SSHClient(object):
         if e is not None:
             host_names = e.hostnames
             for h in host_names:
-                if self.ssh._host_keys.check(h, e.key):
+                if ssh._host_keys.check(h, e.key):
                     e.hostnames.remove(h)
             if len(e.hostnames):
-                self.ssh._host_keys._entries.append(e)
+                ssh._host_keys._entries.append(e)
 
     def exec_command(self, command_str):
+        return self._exec_command(self.ssh, command_str)
+
+    @staticmethod
+    def _exec_command(ssh, command_str):
         result = None
         try:
             if command_str is not None:
-                if self.ssh is not None:
-                    stdin, stdout, stderr = self.ssh.exec_command(command_str)
+                if ssh is not None:
+                    stdin, stdout, stderr = ssh.exec_command(command_str)
                     res, err = stdout.read(), stderr.read()
                     re = res if res else err
                     result = re.decode()
@@ -94,6 +115,20 @@ class SSHClient(object):
             result = e
         return result
 
+    def _session_key(self):
+        return (DEFAULT_SESSION_TYPE, self.ssh_host, self.ssh_port,
+                self.ssh_username, self.ssh_password, self.ssh_pub_key)
+
+    def _connect_session(self):
+        ssh = paramiko.SSHClient()
+        try:
+            self._connect(ssh)
+        except Exception:
+            ssh.close()
+            raise
+        ssh.get_transport().set_keepalive(self.ssh_conn_timeout)
+        return ssh
+
     def close(self):
         try:
             if self.ssh is not None:
@@ -106,10 +141,17 @@ class SSHClient(object):
     def do_exec(self, command_str):
         """Execute command"""
         re = None
+        ssh = None
+        reuse_session = self.reuse_session and CONF.ssh_session_reuse
         try:
             if command_str is not None:
-                self.connect()
-                re = self.exec_command(command_str)
+                if reuse_session:
+                    ssh = ssh_session.SESSION_MANAGER.acquire(
+                        self._session_key(), self._connect_session)
+                    re = self._exec_command(ssh, command_str)
+                else:
+                    self.connect()
+                    re = self.exec_command(command_str)
         except paramiko.AuthenticationException as ae:
             LOG.error('doexec Authentication error:{}'.format(ae))
             raise exception.InvalidUsernameOrPassword()
@@ -128,12 +170,20 @@ class SSHClient(object):
                 raise exception.SSHException()
 
         finally:
-            self.close()
+            if not reuse_session:
+                self.close()
+            elif ssh is not None:
+                ssh_session.SESSION_MANAGER.release(
+                    ssh, discard=isinstance(re, Exception))
         return re
 
 
 class SSHPool(pools.Pool):
     CONN_TIMEOUT = 60
+    # Lease the connections from the shared keep-alive sessions of the
+    # array instead of this pool, for the arrays allowing several exec
+    # channels on one connection
+    REUSE_SESSION = False
 
     def __init__(self, **kwargs):
         ssh_access = kwargs.get('ssh')
@@ -204,6 +254,17 @@ class SSHPool(pools.Pool):
             else:
                 raise exception.SSHException(err)
 
+    def _session_key(self):
+        # Pools connecting in their own way don't share their sessions
+        session_type = DEFAULT_SESSION_TYPE
+        if type(self).create is not SSHPool.create:
+            session_type = type(self).__name__
+        return (session_type, self.ssh_host, self.ssh_port,
+                self.ssh_username, self.ssh_password, self.ssh_pub_key)
+
+    def reuses_session(self):
+        return self.REUSE_SESSION and CONF.ssh_session_reuse
+
     def get(self):
         """Return an item from the pool, when one is available.
 
@@ -211,6 +272,9 @@ class SSHPool(pools.Pool):
         connection is active before returning it. For dead connections
         create and return a new connection.
         """
+        if self.reuses_session():
+            return ssh_session.SESSION_MANAGER.acquire(self._session_key(),
+                                                       self.create)
         if self.free_items:
             conn = self.free_items.popleft()
             if conn:
@@ -232,6 +296,9 @@ class SSHPool(pools.Pool):
 
     def remove(self, ssh):
         """Close an ssh client and remove it from free_items."""
+        if ssh_session.SESSION_MANAGER.owns(ssh):
+            ssh_session.SESSION_MANAGER.release(ssh, discard=True)
+            return
         ssh.close()
         if ssh in self.free_items:
             self.free_items.remove(ssh)
@@ -239,6 +306,9 @@ class SSHPool(pools.Pool):
                 self.current_size -= 1
 
     def put(self, conn):
+        if ssh_session.SESSION_MANAGER.owns(conn):
+            ssh_session.SESSION_MANAGER.release(conn)
+            return
         if self.current_size > self.max_size:
             conn.close()
             self.current_size -= 1
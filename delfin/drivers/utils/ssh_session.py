@@ -0,0 +1,264 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Keep-alive SSH sessions shared by the SSH clients of a process.
+
+A session is one authenticated paramiko transport to an array. Every command
+leases a channel of a session, so the key exchange and authentication are
+done once per session instead of once per command.
+"""
+
+import collections
+import threading
+import time
+
+import paramiko
+from eventlet import event
+from eventlet import semaphore
+from oslo_config import cfg
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+ssh_session_opts = [
+    cfg.BoolOpt('ssh_session_reuse',
+                default=True,
+                help='Keep the SSH sessions to the arrays alive and reuse '
+                     'them for the following commands of the SSH pools and '
+                     'clients opting in.'),
+    cfg.IntOpt('ssh_session_idle_timeout',
+               default=300,
+               min=0,
+               help='Seconds an unused SSH session is kept alive.'),
+    cfg.IntOpt('ssh_session_liveness_interval',
+               default=30,
+               min=0,
+               help='An SSH session unused for this many seconds is '
+                    'probed before it is reused.'),
+    cfg.IntOpt('ssh_session_max_channels',
+               default=4,
+               min=1,
+               help='Maximum number of channels open at the same time on '
+                    'one SSH session.'),
+    cfg.IntOpt('ssh_session_max_per_array',
+               default=3,
+               min=1,
+               help='Maximum number of SSH sessions to one array.'),
+]
+
+CONF.register_opts(ssh_session_opts)
+
+
+class SSHSession(object):
+    """A paramiko client and the number of its channels in use."""
+
+    def __init__(self, key, ssh):
+        self.key = key
+        self.ssh = ssh
+        self.channels = 0
+        self.last_used = time.time()
+
+    def is_alive(self, probe=False):
+        transport = self.ssh.get_transport()
+        if not isinstance(transport, paramiko.Transport) \
+                or not transport.is_active():
+            return False
+        if probe:
+            try:
+                transport.send_ignore()
+            except Exception:
+                return False
+        return True
+
+    def close(self):
+        try:
+            self.ssh.close()
+        except Exception as e:
+            LOG.warning('Failed to close ssh session: %s', e)
+
+
+class SSHSessionManager(object):
+    """Sessions of the arrays keyed by their access info."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = collections.defaultdict(list)
+        # Sessions being connected, counted against the sessions of the array
+        self._pending = collections.Counter()
+        self._waiters = {}
+        self._leases = {}
+        self._slots = {}
+        self.stats = collections.Counter()
+
+    def _get_slots(self, key):
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = semaphore.Semaphore(
+                    CONF.ssh_session_max_per_array *
+                    CONF.ssh_session_max_channels)
+            return self._slots[key]
+
+    def _evict_idle_sessions(self, now):
+        for key, sessions in list(self._sessions.items()):
+            for session in list(sessions):
+                if session.channels == 0 and now - session.last_used \
+                        > CONF.ssh_session_idle_timeout:
+                    sessions.remove(session)
+                    session.close()
+                    self.stats['evicted'] += 1
+            if not sessions:
+                del self._sessions[key]
+
+    def _get_free_session(self, key, now):
+        for session in list(self._sessions.get(key, [])):
+            if session.channels >= CONF.ssh_session_max_channels:
+                continue
+            probe = now - session.last_used \
+                > CONF.ssh_session_liveness_interval
+            if session.is_alive(probe=probe):
+                return session
+            self._sessions[key].remove(session)
+            session.close()
+            self.stats['dead'] += 1
+        return None
+
+    def _notify(self, key):
+        """Wake up the callers waiting for a channel of the array.
+
+        Called with the lock held.
+        """
+        waiters = self._waiters.pop(key, None)
+        if waiters is not None:
+            waiters.send()
+
+    def _lease_or_reserve(self, key):
+        """Lease a free channel of the array, or else reserve a new session
+        if the array has room for it, or else wait for a free channel.
+
+        :returns: the leased session, None if a new session is reserved
+        """
+        while True:
+            with self._lock:
+                now = time.time()
+                self._evict_idle_sessions(now)
+                session = self._get_free_session(key, now)
+                if session is not None:
+                    session.channels += 1
+                    self._leases[id(session.ssh)] = session
+                    self.stats['reused'] += 1
+                    return session
+                if len(self._sessions.get(key, [])) + self._pending[key] \
+                        < CONF.ssh_session_max_per_array:
+                    self._pending[key] += 1
+                    return None
+                waiters = self._waiters.get(key)
+                if waiters is None:
+                    waiters = self._waiters[key] = event.Event()
+                self.stats['waited'] += 1
+            waiters.wait()
+
+    def _unreserve(self, key):
+        # Called with the lock held
+        self._pending[key] -= 1
+        if not self._pending[key]:
+            del self._pending[key]
+        self._notify(key)
+
+    def acquire(self, key, connect):
+        """Lease a channel of a live session of the array.
+
+        :param key: the key of the array access info
+        :param connect: called to connect a new paramiko.SSHClient when no
+                        session has a free channel
+        :returns: paramiko.SSHClient of the session
+        """
+        slots = self._get_slots(key)
+        slots.acquire()
+        try:
+            session = self._lease_or_reserve(key)
+            if session is not None:
+                return session.ssh
+
+            try:
+                session = SSHSession(key, connect())
+            except Exception:
+                with self._lock:
+                    self._unreserve(key)
+                raise
+            session.channels = 1
+            with self._lock:
+                self._sessions[key].append(session)
+                self._leases[id(session.ssh)] = session
+                self.stats['created'] += 1
+                self._unreserve(key)
+            return session.ssh
+        except Exception:
+            slots.release()
+            raise
+
+    def owns(self, ssh):
+        with self._lock:
+            return id(ssh) in self._leases
+
+    def release(self, ssh, discard=False):
+        """Return the channel leased by acquire.
+
+        :param discard: close the session, e.g. it's broken
+        """
+        with self._lock:
+            session = self._leases.get(id(ssh))
+            if session is None:
+                return
+            session.channels -= 1
+            session.last_used = time.time()
+            if session.channels == 0:
+                del self._leases[id(ssh)]
+            if discard or not session.is_alive():
+                sessions = self._sessions.get(session.key, [])
+                if session in sessions:
+                    sessions.remove(session)
+                    self.stats['dead'] += 1
+                if session.channels == 0:
+                    session.close()
+            slots = self._slots.get(session.key)
+            self._notify(session.key)
+        if slots is not None:
+            slots.release()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['sessions'] = sum(len(sessions) for sessions
+                                    in self._sessions.values())
+            stats['channels'] = sum(session.channels
+                                    for sessions in self._sessions.values()
+                                    for session in sessions)
+        return stats
+
+    def close_all(self):
+        with self._lock:
+            for sessions in self._sessions.values():
+                for session in sessions:
+                    session.close()
+            self._sessions.clear()
+            self._leases.clear()
+            self._slots.clear()
+            self._pending.clear()
+            for key in list(self._waiters):
+                self._notify(key)
+
+
+SESSION_MANAGER = SSHSessionManager()
@@ -170,6 +170,10 @@ class VolumeNotFound(NotFound):
     msg_fmt = _("Volume {0} could not be found.")
 
 
+class ResourceSyncStateNotFound(NotFound):
+    msg_fmt = _("Resource sync state {0} could not be found.")
+
+
 class StorageHostInitiatorNotFound(NotFound):
     msg_fmt = _("Storage host initiator {0} could not be found.")
 
@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
 import json
+import threading
+
+from kafka import KafkaProducer
+from kafka import errors as kafka_errors
 from oslo_config import cfg
 from oslo_log import log
-from kafka import KafkaProducer
 
 """"
 The metrics received from driver is should be in this format
@@ -51,21 +55,133 @@ kafka_opts = [
                help='The kafka server IP'),
     cfg.StrOpt('kafka_port', default='9092',
                help='The kafka server port'),
+    cfg.IntOpt('kafka_linger_ms', default=100, min=0,
+               help='Time in milliseconds the producer waits for more '
+                    'records to batch together before sending'),
+    cfg.IntOpt('kafka_batch_size', default=65536, min=0,
+               help='Maximum size in bytes of a batch of records sent to '
+                    'one partition'),
+    cfg.StrOpt('kafka_compression_type', default='gzip',
+               choices=['none', 'gzip', 'snappy', 'lz4', 'zstd'],
+               help='Compression of the record batches, snappy, lz4 and '
+                    'zstd require their python libraries installed'),
+    cfg.IntOpt('kafka_buffer_memory', default=33554432, min=1,
+               help='Total bytes of memory the producer can use to buffer '
+                    'records waiting to be sent'),
+    cfg.IntOpt('kafka_max_block_ms', default=1000, min=0,
+               help='Time in milliseconds a send blocks when the buffer is '
+                    'full, the rest of the records of the push are dropped '
+                    'after that'),
+    cfg.IntOpt('kafka_flush_timeout', default=10, min=0,
+               help='Time in seconds to wait for the buffered records to be '
+                    'sent when the process exits'),
 ]
 
 CONF.register_opts(kafka_opts, "KAFKA_EXPORTER")
 kafka = CONF.KAFKA_EXPORTER
 
+_producer = None
+_producer_lock = threading.Lock()
+
+
+class ProducerStats(object):
+    """Counters of the records sent by the producer of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def incr(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def to_dict(self):
+        with self._lock:
+            return {'sent': self.sent, 'failed': self.failed,
+                    'dropped': self.dropped}
+
+
+STATS = ProducerStats()
+
+
+def get_producer():
+    """Get the kafka producer shared by this process, create it if needed.
+    """
+    global _producer
+    with _producer_lock:
+        if _producer is None:
+            compression_type = kafka.kafka_compression_type
+            if compression_type == 'none':
+                compression_type = None
+            _producer = KafkaProducer(
+                bootstrap_servers=[kafka.kafka_ip + ':' + kafka.kafka_port],
+                key_serializer=lambda k: k.encode('utf-8'),
+                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                linger_ms=kafka.kafka_linger_ms,
+                batch_size=kafka.kafka_batch_size,
+                compression_type=compression_type,
+                buffer_memory=kafka.kafka_buffer_memory,
+                max_block_ms=kafka.kafka_max_block_ms)
+            atexit.register(close_producer)
+        return _producer
+
+
+def close_producer():
+    """Flush the buffered records and close the producer of this process."""
+    global _producer
+    with _producer_lock:
+        producer, _producer = _producer, None
+    if producer is None:
+        return
+    try:
+        producer.flush(timeout=kafka.kafka_flush_timeout)
+        producer.close(timeout=kafka.kafka_flush_timeout)
+    except Exception as e:
+        LOG.warning('Failed to flush the kafka producer: %s', e)
+    LOG.info('Kafka producer closed, records: %s', STATS.to_dict())
+
+
+def _on_send_success(record_metadata):
+    STATS.incr('sent')
+
+
+def _on_send_error(ex):
+    STATS.incr('failed')
+    LOG.debug('Failed to send record to kafka: %s', ex)
+
 
 class KafkaExporter(object):
 
+    @staticmethod
+    def _get_record_key(labels):
+        # Records of one resource go to the same partition
+        return '{0}/{1}/{2}'.format(labels.get('storage_id'),
+                                    labels.get('resource_type'),
+                                    labels.get('resource_id'))
+
     def push_to_kafka(self, data):
         topic = kafka.kafka_topic_name
-        ip = kafka.kafka_ip
-        port = kafka.kafka_port
-        bootstrap_server = ip + ':' + port
-        producer = KafkaProducer(
-            bootstrap_servers=[bootstrap_server],
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'))
-
-        producer.send(topic, value=data)
+        producer = get_producer()
+
+        for sent, metric in enumerate(data):
+            record = {'name': metric.name,
+                      'labels': metric.labels,
+                      'values': metric.values}
+            try:
+                future = producer.send(
+                    topic, key=self._get_record_key(metric.labels),
+                    value=record)
+            except kafka_errors.KafkaTimeoutError:
+                # Buffer is full, the brokers can't keep up. Each of the
+                # following sends would block for max_block_ms too, so the
+                # rest of the records are dropped
+                dropped = len(data) - sent
+                STATS.incr('dropped', dropped)
+                LOG.warning('Kafka producer buffer full, %s of %s records '
+                            'dropped, records: %s', dropped, len(data),
+                            STATS.to_dict())
+                return
+            future.add_callback(_on_send_success)
+            future.add_errback(_on_send_error)
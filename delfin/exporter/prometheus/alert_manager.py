@@ -11,6 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import atexit
+import collections
+import threading
+
 import requests
 from oslo_config import cfg
 from oslo_log import log
@@ -23,40 +27,114 @@ alert_mngr_opts = [
                help='The prometheus alert manager host'),
     cfg.StrOpt('alert_manager_port', default='9093',
                help='The prometheus alert manager port'),
+    cfg.IntOpt('alert_manager_timeout', default=10, min=1,
+               help='Time in seconds to wait for the alert manager to '
+                    'answer a post'),
+    cfg.IntOpt('alert_batch_size', default=500, min=1,
+               help='Maximum number of alerts posted in one request'),
+    cfg.IntOpt('alert_retry_queue_size', default=1000, min=0,
+               help='Maximum number of alerts kept to be posted again when '
+                    'the alert manager is unreachable, the oldest are '
+                    'dropped first'),
 ]
 
 CONF.register_opts(alert_mngr_opts, "PROMETHEUS_ALERT_MANAGER_EXPORTER")
 alert_cfg = CONF.PROMETHEUS_ALERT_MANAGER_EXPORTER
 
+_session = None
+_lock = threading.Lock()
+# Alerts failed to be posted, sent again ahead of the next alerts
+_retry_queue = collections.deque()
+STATS = collections.Counter()
+
+
+def get_session():
+    """Get the http session shared by this process, create it if needed.
+
+    The connections to the alert manager are kept alive and reused by the
+    following posts.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update({'Connection': 'keep-alive'})
+            atexit.register(close_session)
+        return _session
+
+
+def close_session():
+    global _session
+    with _lock:
+        session, _session = _session, None
+        _retry_queue.clear()
+    if session is not None:
+        session.close()
+
+
+def _requeue(alerts):
+    with _lock:
+        _retry_queue.extend(alerts)
+        dropped = len(_retry_queue) - alert_cfg.alert_retry_queue_size
+        for _ in range(max(dropped, 0)):
+            _retry_queue.popleft()
+    if dropped > 0:
+        STATS['dropped'] += dropped
+        LOG.warning('Alert retry queue full, %d alerts dropped, alerts: '
+                    '%s', dropped, dict(STATS))
+
 
 class PrometheusAlertExporter(object):
-    alerts = []
     model_key = ['alert_id', 'alert_name', 'sequence_number', 'category',
                  'severity', 'type', 'location', 'recovery_advice',
                  'storage_id', 'storage_name', 'vendor',
                  'model', 'serial_number', 'occur_time']
 
+    def _to_prometheus_alert(self, alert):
+        prometheus_alert = {
+            'labels': {key: str(alert.get(key)) for key in self.model_key},
+            'annotations': {'summary': alert.get('description')}}
+        # Set by the coalescing of the repeated alerts, not a label so that
+        # the alert manager still groups the occurrences of the alert
+        if alert.get('occurrence_count'):
+            prometheus_alert['annotations']['occurrence_count'] = \
+                str(alert['occurrence_count'])
+        return prometheus_alert
+
+    def _post(self, session, url, alerts):
+        try:
+            response = session.post(url, json=alerts,
+                                    timeout=alert_cfg.alert_manager_timeout)
+        except Exception as e:
+            LOG.error('Exporting %d alerts to alert manager has been failed: '
+                      '%s', len(alerts), e)
+            return True
+        if response.status_code == 200:
+            STATS['sent'] += len(alerts)
+            return False
+        LOG.error('POST request of %d alerts failed with status %s: %s',
+                  len(alerts), response.status_code, response.text)
+        if response.status_code >= 500:
+            return True
+        # The alert manager would reject the alerts again on client errors
+        STATS['rejected'] += len(alerts)
+        return False
+
     def push_prometheus_alert(self, alerts):
+        """Post the new alerts and the alerts failed to be posted before."""
+        url = 'http://%s:%s/api/v1/alerts' % (
+            alert_cfg.alert_manager_host, alert_cfg.alert_manager_port)
+        with _lock:
+            pending = list(_retry_queue)
+            _retry_queue.clear()
+        pending.extend(self._to_prometheus_alert(alert) for alert in alerts)
 
-        host = alert_cfg.alert_manager_host
-        port = alert_cfg.alert_manager_port
-        for alert in alerts:
-            dict = {}
-            dict["labels"] = {}
-            dict["annotations"] = {}
-            for key in self.model_key:
-                dict["labels"][key] = str(alert.get(key))
-
-            dict["annotations"]["summary"] = alert.get("description")
-
-            self.alerts.append(dict)
-            try:
-                response = requests.post('http://' + host + ":" + port +
-                                         '/api/v1/alerts',
-                                         json=self.alerts)
-                if response.status_code != 200:
-                    LOG.error("POST request failed for alert %s ",
-                              alert.get('alert_id'))
-            except Exception:
-                LOG.error("Exporting alert to alert manager has been failed "
-                          "for alert %s ", alert.get('alert_id'))
+        session = get_session()
+        batch_size = alert_cfg.alert_batch_size
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
+            if self._post(session, url, batch):
+                # Unreachable, keep the rest for the next push
+                STATS['failed'] += len(pending) - i
+                _requeue(pending[i:])
+                break
@@ -11,21 +11,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import glob
-import os
+import gzip
 
 import six
-from flask import Flask
+from flask import Flask, Response, request
 from oslo_config import cfg
 import sys
 from oslo_log import log
 
+from delfin.exporter.prometheus import registry
+
 LOG = log.getLogger(__name__)
 
 app = Flask(__name__)
 
 grp = cfg.OptGroup('PROMETHEUS_EXPORTER')
 METRICS_CACHE_DIR = '/var/lib/delfin/metrics'
+GZIP_COMPRESS_LEVEL = 6
 prometheus_opts = [
     cfg.StrOpt('metric_server_ip', default='0.0.0.0',
                help='The exporter server host  ip'),
@@ -34,6 +36,9 @@ prometheus_opts = [
     cfg.StrOpt('metrics_dir', default=METRICS_CACHE_DIR,
 
                help='The temp directory to keep incoming metrics'),
+    cfg.BoolOpt('metrics_gzip', default=True,
+                help='Compress the metrics with gzip if the scraper '
+                     'accepts it'),
 ]
 cfg.CONF.register_opts(prometheus_opts, group=grp)
 cfg.CONF(sys.argv[1:])
@@ -41,38 +46,23 @@ cfg.CONF(sys.argv[1:])
 
 @app.route("/metrics", methods=['GET'])
 def getfile():
-    """Read the earliest metric file from the
-    available *.prom files
-    """
-    try:
-        if not os.path.exists(cfg.CONF.PROMETHEUS_EXPORTER.metrics_dir):
-            LOG.error('No metrics cache folder exists')
-            return ''
-        os.chdir(cfg.CONF.PROMETHEUS_EXPORTER.metrics_dir)
-    except OSError as e:
-        LOG.error('Error opening metrics folder')
-        raise Exception(e)
+    """Render the latest value of all the metric series in the registry"""
+    metrics_registry = registry.get_registry(
+        cfg.CONF.PROMETHEUS_EXPORTER.metrics_dir)
     try:
-        files = glob.glob("*.prom")
-        data = ''
-        if files:
-            files.sort(key=os.path.getmtime)
-            # Read only earliest file in one scrape to /metrics
-            file_name = os.path.join(cfg.CONF.PROMETHEUS_EXPORTER.metrics_dir,
-                                     files[0])
-
-            with open(file_name, "r") as f:
-                data = f.read()
-            # Remove a metric file after reading it
-            LOG.info('Metric file %s has been read', file_name)
-            os.remove(file_name)
-            LOG.info('Metric file %s has been deleted', file_name)
+        data = metrics_registry.render()
     except Exception as e:
         msg = six.text_type(e)
         LOG.error('Error while reading metrics %s', msg)
         return ''
 
-    return data
+    response = Response(data, mimetype='text/plain; version=0.0.4')
+    if cfg.CONF.PROMETHEUS_EXPORTER.metrics_gzip and \
+            'gzip' in request.headers.get('Accept-Encoding', ''):
+        response.set_data(gzip.compress(response.get_data(),
+                                        GZIP_COMPRESS_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
 
 
 if __name__ == '__main__':
@@ -0,0 +1,141 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Registry of the performance metric series exposed to Prometheus.
+
+The collectors run in the task manager processes while the exporter server
+runs in its own process, so the series live in a small sqlite database in
+the metrics directory, memory mapped by every process using it. Each series
+is keyed by its metric name and labels and holds only its latest sample, so
+a scrape always gets the latest values and the size of the registry only
+grows with the number of series.
+
+A process opens the registry of a metrics directory once and keeps it open,
+see get_registry.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+REGISTRY_FILE = 'metrics.db'
+# Series not updated within the retention time are removed
+RETENTION_TIME_SEC = 3600
+# Seconds to wait for the lock of another process
+BUSY_TIMEOUT_SEC = 10
+MMAP_SIZE = 64 * 1024 * 1024
+# Series older than the retention time are removed at most this often
+PRUNE_INTERVAL_SEC = 60
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+class MetricsRegistry(object):
+
+    def __init__(self, metrics_dir, retention=RETENTION_TIME_SEC):
+        self.path = os.path.join(metrics_dir, REGISTRY_FILE)
+        self.retention = retention
+        self._conn = None
+        self._lock = threading.RLock()
+        self._last_prune = 0
+
+    def _connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SEC,
+                                   check_same_thread=False)
+            # Readers don't block the writers and vice versa
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA mmap_size=%d' % MMAP_SIZE)
+            conn.execute('CREATE TABLE IF NOT EXISTS series ('
+                         'name TEXT NOT NULL, '
+                         'labels TEXT NOT NULL, '
+                         'value REAL, '
+                         'timestamp INTEGER, '
+                         'updated_at REAL, '
+                         'PRIMARY KEY (name, labels))')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_series_updated_at '
+                         'ON series (updated_at)')
+            self._conn = conn
+        return self._conn
+
+    def update(self, samples):
+        """Set the latest sample of the series.
+
+        :param samples: iterable of (name, labels, value, timestamp), where
+                        labels is the rendered label string of the series
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO series '
+                    '(name, labels, value, timestamp, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(name, labels, value, timestamp, now)
+                     for name, labels, value, timestamp in samples])
+                if now - self._last_prune >= PRUNE_INTERVAL_SEC:
+                    conn.execute('DELETE FROM series WHERE updated_at < ?',
+                                 (now - self.retention,))
+                    self._last_prune = now
+
+    def render(self):
+        """Render all the series in Prometheus text exposition format."""
+        if not os.path.exists(self.path):
+            return ''
+        lines = []
+        last_name = None
+        with self._lock:
+            cursor = self._connect().execute(
+                'SELECT name, labels, value, timestamp FROM series '
+                'ORDER BY name, labels')
+            for name, labels, value, timestamp in cursor:
+                if name != last_name:
+                    lines.append('# HELP %s metric for resource %s'
+                                 % (name, name.split('_', 1)[0]))
+                    lines.append('# TYPE %s gauge' % name)
+                    last_name = name
+                lines.append('%s{%s} %f %d'
+                             % (name, labels, value, timestamp))
+        if lines:
+            lines.append('')
+        return '\n'.join(lines)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def get_registry(metrics_dir):
+    """Get the registry of the metrics directory opened by this process."""
+    path = os.path.join(metrics_dir, REGISTRY_FILE)
+    with _registries_lock:
+        if path not in _registries:
+            _registries[path] = MetricsRegistry(metrics_dir)
+        return _registries[path]
+
+
+def close_registries():
+    """Close the registries opened by this process."""
+    with _registries_lock:
+        registries = list(_registries.values())
+        _registries.clear()
+    for metrics_registry in registries:
+        metrics_registry.close()
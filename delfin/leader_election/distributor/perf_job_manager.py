@@ -15,6 +15,7 @@ from oslo_log import log
 
 from delfin import manager
 from delfin.leader_election.distributor import task_distributor
+from delfin.task_manager.scheduler import schedule_manager
 
 LOG = log.getLogger(__name__)
 
@@ -28,5 +29,6 @@ class PerfJobManager(manager.Manager):
         super(PerfJobManager, self).__init__(*args, **kwargs)
 
     def add_new_job(self, context, task_id):
-        distributor = task_distributor.TaskDistributor(context)
+        distributor = task_distributor.TaskDistributor(
+            context, schedule_manager.SchedulerManager().get_partitioner())
         distributor.distribute_new_job(task_id)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 
 import six
 from oslo_config import cfg
@@ -26,14 +27,19 @@ LOG = log.getLogger(__name__)
 
 
 class TaskDistributor(object):
-    def __init__(self, ctx):
+    def __init__(self, ctx, partitioner=None):
         self.ctx = ctx
         self.task_rpcapi = task_rpcapi.TaskAPI()
+        self.partitioner = partitioner
+
+    def _get_partitioner(self):
+        if self.partitioner is None:
+            self.partitioner = ConsistentHashing()
+            self.partitioner.start()
+        return self.partitioner
 
     def distribute_new_job(self, task_id):
-        partitioner = ConsistentHashing()
-        partitioner.start()
-        executor = partitioner.get_task_executor(task_id)
+        executor = self._get_partitioner().get_task_executor(task_id)
         try:
             db.task_update(self.ctx, task_id, {'executor': executor})
             LOG.info('Distribute a new job, id: %s' % task_id)
@@ -55,3 +61,100 @@ class TaskDistributor(object):
             LOG.error('Failed to distribute failed job, reason: %s',
                       six.text_type(e))
             raise e
+
+    def _get_executors(self, jobs, task_id_key):
+        """Get the executors of the jobs in one pass on the hash ring."""
+        executors = self._get_partitioner().get_task_executors(
+            set(job[task_id_key] for job in jobs))
+        return {job['id']: executors[job[task_id_key]] for job in jobs
+                if job[task_id_key] in executors}
+
+    def _cast(self, cast, executors):
+        """Cast the ids of the jobs of each executor in one message."""
+        job_ids = collections.defaultdict(list)
+        for job_id, executor in executors.items():
+            job_ids[executor].append(job_id)
+        for executor, ids in sorted(job_ids.items()):
+            cast(self.ctx, ids, executor)
+
+    def _distribute(self, jobs, executors, executors_update, remove, assign,
+                    moved_only, remove_jobs):
+        moved = {job['id']: executors[job['id']] for job in jobs
+                 if job['id'] in executors
+                 and executors[job['id']] != job['executor']}
+        if moved:
+            executors_update(self.ctx, moved)
+        if remove_jobs:
+            self._cast(remove, {job['id']: job['executor'] for job in jobs
+                                if job['id'] in moved and job['executor']})
+        self._cast(assign, moved if moved_only else executors)
+        return moved
+
+    def distribute_jobs(self, tasks):
+        """Assign all the tasks to their executors on the hash ring.
+
+        Only the moved tasks are updated, in one transaction, and the tasks
+        of each executor are sent in one message.
+
+        :param tasks: the tasks with their current executor
+        :returns: dict of the moved task ids to their new executor
+        """
+        executors = self._get_executors(tasks, 'id')
+        moved = self._distribute(
+            tasks, executors, db.task_executors_update,
+            self.task_rpcapi.remove_jobs, self.task_rpcapi.assign_jobs,
+            moved_only=False, remove_jobs=True)
+        LOG.info('Distribute %s jobs, %s moved' % (len(tasks), len(moved)))
+        return moved
+
+    def redistribute_jobs(self, tasks, remove_jobs=True):
+        """Move the tasks whose executor on the hash ring changed.
+
+        Like distribute_jobs, but only the moved tasks are sent to their
+        executors.
+
+        :param tasks: the tasks with their current executor
+        :param remove_jobs: remove the moved jobs from their old executors,
+                            not needed when the old executors left
+        :returns: dict of the moved task ids to their new executor
+        """
+        executors = self._get_executors(tasks, 'id')
+        moved = self._distribute(
+            tasks, executors, db.task_executors_update,
+            self.task_rpcapi.remove_jobs, self.task_rpcapi.assign_jobs,
+            moved_only=True, remove_jobs=remove_jobs)
+        LOG.info('Re-distribute %s of %s jobs' % (len(moved), len(tasks)))
+        return moved
+
+    def distribute_failed_jobs(self, failed_tasks):
+        """Assign all the failed tasks to the executors of their tasks.
+
+        :param failed_tasks: the failed tasks with their current executor
+        :returns: dict of the moved failed task ids to their new executor
+        """
+        executors = self._get_executors(failed_tasks, 'task_id')
+        moved = self._distribute(
+            failed_tasks, executors, db.failed_task_executors_update,
+            self.task_rpcapi.remove_failed_jobs,
+            self.task_rpcapi.assign_failed_jobs,
+            moved_only=False, remove_jobs=True)
+        LOG.info('Distribute %s failed jobs, %s moved'
+                 % (len(failed_tasks), len(moved)))
+        return moved
+
+    def redistribute_failed_jobs(self, failed_tasks, remove_jobs=True):
+        """Move the failed tasks whose task's executor changed.
+
+        :param failed_tasks: the failed tasks with their current executor
+        :param remove_jobs: remove the moved jobs from their old executors
+        :returns: dict of the moved failed task ids to their new executor
+        """
+        executors = self._get_executors(failed_tasks, 'task_id')
+        moved = self._distribute(
+            failed_tasks, executors, db.failed_task_executors_update,
+            self.task_rpcapi.remove_failed_jobs,
+            self.task_rpcapi.assign_failed_jobs,
+            moved_only=True, remove_jobs=remove_jobs)
+        LOG.info('Re-distribute %s of %s failed jobs'
+                 % (len(moved), len(failed_tasks)))
+        return moved
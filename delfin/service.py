@@ -72,6 +72,12 @@ service_opts = [
     cfg.PortOpt('trap_receiver_port',
                 default=162,
                 help='Port at which trap receiver listens.'),
+    cfg.IntOpt('trap_receiver_workers',
+               default=1,
+               min=1,
+               help='Number of trap receiver processes, they share the trap '
+                    'receiver port so that the traps are decoded on '
+                    'multiple cores.'),
     cfg.StrOpt('leader_election_plugin',
                default="tooz",
                help='Supported plugin for leader election. Options: '
@@ -499,6 +505,11 @@ def process_launcher():
     return service.ServiceLauncher(CONF, restart_method='reload')
 
 
+def multi_process_launcher():
+    """Launcher forking a process for each worker of the service."""
+    return service.ProcessLauncher(CONF, restart_method='mutate')
+
+
 # NOTE(vish): the global launcher is to maintain the existing
 #             functionality of calling service.serve +
 #             service.wait
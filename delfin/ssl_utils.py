@@ -76,8 +76,8 @@ def reload_certificate(ca_path):
                 _load_cert(fpath, file, ca_path)
 
 
-def get_host_name_ignore_adapter():
-    return HostNameIgnoreAdapter()
+def get_host_name_ignore_adapter(**kwargs):
+    return HostNameIgnoreAdapter(**kwargs)
 
 
 class HostNameIgnoreAdapter(requests.adapters.HTTPAdapter):
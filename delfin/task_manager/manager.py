@@ -22,7 +22,8 @@ from oslo_utils import importutils
 from delfin import manager
 from delfin.drivers import manager as driver_manager
 from delfin.drivers import api as driver_api
-from delfin.task_manager.tasks import alerts, telemetry
+from delfin.task_manager import sync_orchestrator
+from delfin.task_manager.tasks import alerts, resources, telemetry
 
 LOG = log.getLogger(__name__)
 
@@ -35,6 +36,7 @@ class TaskManager(manager.Manager):
     def __init__(self, service_name=None, *args, **kwargs):
         self.alert_task = alerts.AlertSyncTask()
         self.telemetry_task = telemetry.TelemetryTask()
+        self.sync_orchestrator = sync_orchestrator.SyncOrchestrator()
         super(TaskManager, self).__init__(*args, **kwargs)
 
     def sync_storage_resource(self, context, storage_id, resource_task):
@@ -44,6 +46,12 @@ class TaskManager(manager.Manager):
         device_obj = cls(context, storage_id)
         device_obj.sync()
 
+    def sync_storage_resources(self, context, storage_id, resource_tasks):
+        LOG.debug("Received the sync_storage_resources request for storage"
+                  " id:{0}, tasks:{1}".format(storage_id, resource_tasks))
+        return self.sync_orchestrator.sync(context, storage_id,
+                                           resource_tasks)
+
     def remove_storage_resource(self, context, storage_id, resource_task):
         cls = importutils.import_class(resource_task)
         device_obj = cls(context, storage_id)
@@ -55,6 +63,7 @@ class TaskManager(manager.Manager):
         driver_api.API().remove_storage(context, storage_id)
         drivers = driver_manager.DriverManager()
         drivers.remove_driver(storage_id)
+        resources.FINGERPRINT_CACHE.invalidate(storage_id)
 
     def sync_storage_alerts(self, context, storage_id, query_para):
         LOG.info('Alert sync called for storage id:{0}'
@@ -15,12 +15,14 @@
 periodical task manager for metric collection tasks**
 """
 from apscheduler.schedulers.background import BackgroundScheduler
+import collections
 import datetime
 import six
 
 from oslo_log import log
 from oslo_config import cfg
 from oslo_utils import uuidutils
+from oslo_service import periodic_task
 from oslo_service import service as oslo_ser
 
 from delfin import context as ctxt
@@ -31,6 +33,8 @@ from delfin import manager
 from delfin import service
 from delfin.task_manager.scheduler import schedule_manager
 from delfin.task_manager import subprocess_rpcapi as rpcapi
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_executor
 from delfin.task_manager.scheduler.schedulers.telemetry.job_handler \
     import FailedJobHandler
 from delfin.task_manager.scheduler.schedulers.telemetry.job_handler \
@@ -43,7 +47,7 @@ CONF = cfg.CONF
 class MetricsTaskManager(manager.Manager):
     """manage periodical tasks"""
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self, service_name=None, *args, **kwargs):
         super(MetricsTaskManager, self).__init__(*args, **kwargs)
@@ -121,6 +125,73 @@ class MetricsTaskManager(manager.Manager):
                     if len(failed_tasks) == 0 and len(tasks) == 0:
                         self.stop_executor(name, local_executor, storage_id)
 
+    def assign_jobs(self, context, task_ids, executor):
+        if not self.enable_sub_process:
+            JobHandler.schedule_jobs(context, task_ids)
+            return
+        if not self.watch_job_id:
+            self.init_watchers(executor)
+        tasks = db.tasks_get_by_ids(context, task_ids)
+        for local_executor, ids in self._group_by_local_executor(
+                tasks, executor).items():
+            self.rpcapi.assign_jobs_local(context, ids, local_executor)
+
+    def remove_jobs(self, context, task_ids, executor):
+        if not self.enable_sub_process:
+            JobHandler.remove_jobs(context, task_ids)
+            return
+        tasks = db.tasks_get_by_ids(context, task_ids)
+        self._remove_local_jobs(context, tasks, executor,
+                                self.rpcapi.remove_jobs_local)
+
+    def assign_failed_jobs(self, context, failed_task_ids, executor):
+        if not self.enable_sub_process:
+            FailedJobHandler.schedule_failed_jobs(context, failed_task_ids)
+            return
+        if not self.watch_job_id:
+            self.init_watchers(executor)
+        failed_tasks = db.failed_tasks_get_by_ids(context, failed_task_ids)
+        for local_executor, ids in self._group_by_local_executor(
+                failed_tasks, executor).items():
+            self.rpcapi.assign_failed_jobs_local(context, ids,
+                                                 local_executor)
+
+    def remove_failed_jobs(self, context, failed_task_ids, executor):
+        if not self.enable_sub_process:
+            FailedJobHandler.remove_failed_jobs(context, failed_task_ids)
+            return
+        failed_tasks = db.failed_tasks_get_by_ids(context, failed_task_ids)
+        self._remove_local_jobs(context, failed_tasks, executor,
+                                self.rpcapi.remove_failed_jobs_local)
+
+    def _group_by_local_executor(self, jobs, executor):
+        """Get the ids of the jobs handled by each local executor."""
+        job_ids = collections.defaultdict(list)
+        for job in jobs:
+            local_executor = self._get_storage_local_executor(
+                job['storage_id'], executor)
+            job_ids[local_executor].append(job['id'])
+        return job_ids
+
+    def _remove_local_jobs(self, context, jobs, executor, remove_local):
+        job_ids = collections.defaultdict(list)
+        for job in jobs:
+            job_ids[job['storage_id']].append(job['id'])
+        for name in list(self.executor_map.keys()):
+            storage_ids = [storage_id for storage_id in job_ids
+                           if storage_id in self.executor_map[name]
+                           ["storages"]]
+            if not storage_ids:
+                continue
+            local_executor = "{0}:{1}".format(executor, name)
+            remove_local(context, [job_id for storage_id in storage_ids
+                                   for job_id in job_ids[storage_id]],
+                         local_executor)
+            for storage_id in storage_ids:
+                tasks, failed_tasks = self.get_all_tasks(storage_id)
+                if len(failed_tasks) == 0 and len(tasks) == 0:
+                    self.stop_executor(name, local_executor, storage_id)
+
     def schedule_boot_jobs(self, executor):
         """Schedule periodic collection if any task is currently assigned to
         this executor """
@@ -132,14 +203,13 @@ class MetricsTaskManager(manager.Manager):
             failed_tasks = db.failed_task_get_all(context, filters=filters)
             LOG.info("Scheduling boot time jobs for this executor: total "
                      "jobs to be handled :%s" % len(tasks))
-            for task in tasks:
-                self.assign_job(context, task['id'], executor)
-                LOG.debug('Periodic collection job assigned for id: '
-                          '%s ' % task['id'])
-            for failed_task in failed_tasks:
-                self.assign_failed_job(context, failed_task['id'], executor)
-                LOG.debug('Failed job assigned for id: '
-                          '%s ' % failed_task['id'])
+            if tasks:
+                self.assign_jobs(context, [task['id'] for task in tasks],
+                                 executor)
+            if failed_tasks:
+                self.assign_failed_jobs(
+                    context, [failed_task['id'] for failed_task
+                              in failed_tasks], executor)
 
         except Exception as e:
             LOG.error("Failed to schedule boot jobs for this executor "
@@ -148,6 +218,12 @@ class MetricsTaskManager(manager.Manager):
         else:
             LOG.debug("Boot job scheduling completed.")
 
+    @periodic_task.periodic_task(
+        spacing=collection_executor.STATS_LOG_INTERVAL_SEC)
+    def log_collection_stats(self, context):
+        """Periodical task to log a summary of the performance collections."""
+        collection_executor.COLLECTION_EXECUTOR.log_stats()
+
     def init_watchers(self, group):
         watcher = GroupMembership(agent_id=group)
         watcher.start()
@@ -197,20 +273,21 @@ class MetricsTaskManager(manager.Manager):
             launcher = self.create_process(executor_topic, host)
             self.executor_map[name]["launcher"] = launcher
             context = ctxt.get_admin_context()
+            task_ids = []
+            failed_task_ids = []
             for storage_id in self.executor_map[name]["storages"]:
                 tasks, failed_tasks = self.get_all_tasks(storage_id)
-                for task in tasks:
-                    LOG.info("Re-scheduling task {0} of storage {1}"
-                             .format(task['id'], storage_id))
-                    self.rpcapi.assign_job_local(
-                        context, task['id'], executor_topic)
-
-                for f_task in failed_tasks:
-                    LOG.info("Re-scheduling failed failed task {0},"
-                             " of storage {1}"
-                             .format(f_task['id'], storage_id))
-                    self.rpcapi.assign_failed_job_local(
-                        context, f_task['id'], executor_topic)
+                task_ids.extend(task['id'] for task in tasks)
+                failed_task_ids.extend(f_task['id'] for f_task
+                                       in failed_tasks)
+            LOG.info("Re-scheduling tasks {0} and failed tasks {1} in {2}"
+                     .format(task_ids, failed_task_ids, executor_topic))
+            if task_ids:
+                self.rpcapi.assign_jobs_local(context, task_ids,
+                                              executor_topic)
+            if failed_task_ids:
+                self.rpcapi.assign_failed_jobs_local(
+                    context, failed_task_ids, executor_topic)
 
     def process_cleanup(self):
         LOG.info('Periodic process cleanup called')
@@ -250,7 +327,6 @@ class MetricsTaskManager(manager.Manager):
         return launcher
 
     def get_local_executor(self, context, task_id, failed_task_id, executor):
-        executor_names = self.executor_map.keys()
         storage_id = None
         if task_id:
             job = db.task_get(context, task_id)
@@ -260,6 +336,10 @@ class MetricsTaskManager(manager.Manager):
             storage_id = job['storage_id']
         else:
             raise exception.InvalidInput("Missing task id")
+        return self._get_storage_local_executor(storage_id, executor)
+
+    def _get_storage_local_executor(self, storage_id, executor):
+        executor_names = self.executor_map.keys()
 
         # Storage already exists
         for name in executor_names:
@@ -30,9 +30,11 @@ class TaskAPI(object):
     API version history:
 
         1.0 - Initial version.
+        1.1 - Add assign_jobs, remove_jobs, assign_failed_jobs and
+              remove_failed_jobs.
     """
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self):
         super(TaskAPI, self).__init__()
@@ -76,6 +78,36 @@ class TaskAPI(object):
                                  failed_task_id=failed_task_id,
                                  executor=executor)
 
+    def assign_jobs(self, context, task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=True)
+        return call_context.cast(context, 'assign_jobs',
+                                 task_ids=task_ids, executor=executor)
+
+    def remove_jobs(self, context, task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=True)
+        return call_context.cast(context, 'remove_jobs',
+                                 task_ids=task_ids, executor=executor)
+
+    def assign_failed_jobs(self, context, failed_task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=True)
+        return call_context.cast(context, 'assign_failed_jobs',
+                                 failed_task_ids=failed_task_ids,
+                                 executor=executor)
+
+    def remove_failed_jobs(self, context, failed_task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=True)
+        return call_context.cast(context, 'remove_failed_jobs',
+                                 failed_task_ids=failed_task_ids,
+                                 executor=executor)
+
     def create_perf_job(self, context, task_id):
         rpc_client = self.get_client('JobGenerator')
         call_context = rpc_client.prepare(topic='JobGenerator', version='1.0')
@@ -44,6 +44,7 @@ class SchedulerManager(object):
         self.ctx = context.get_admin_context()
         self.task_rpcapi = task_rpcapi.TaskAPI()
         self.watch_job_id = None
+        self.partitioner = None
 
     def start(self):
         """ Initialise the schedulers for periodic job creation
@@ -52,46 +53,30 @@ class SchedulerManager(object):
             self.scheduler.start()
             self.scheduler_started = True
 
+    def get_partitioner(self):
+        """Get the partitioner shared by the job distributions of this node.
+
+        Its hash ring follows the group changes watched by
+        schedule_boot_jobs.
+        """
+        if self.partitioner is None:
+            partitioner = ConsistentHashing()
+            partitioner.start()
+            self.partitioner = partitioner
+        return self.partitioner
+
     def on_node_join(self, event):
-        # A new node joined the group, all the job would be re-distributed.
-        # If the job is already on the node, it would be ignore and would
-        # not be scheduled again
+        # A new node joined the group, the jobs are re-distributed on the
+        # updated hash ring. Only the jobs whose executor changed are
+        # removed from the old executor and added to the new one
         LOG.info('Member %s joined the group %s' % (event.member_id,
                                                     event.group_id))
-        # Get all the jobs
         filters = {'deleted': False}
         tasks = db.task_get_all(self.ctx, filters=filters)
-        distributor = TaskDistributor(self.ctx)
-        partitioner = ConsistentHashing()
-        partitioner.start()
-        for task in tasks:
-            # Get the specific executor
-            origin_executor = task['executor']
-            # If the target executor is different from current executor,
-            # remove the job from old executor and add it to new executor
-            new_executor = partitioner.get_task_executor(task['id'])
-            if new_executor != origin_executor:
-                LOG.info('Re-distribute job %s from %s to %s' %
-                         (task['id'], origin_executor, new_executor))
-                self.task_rpcapi.remove_job(self.ctx, task['id'],
-                                            task['executor'])
-            distributor.distribute_new_job(task['id'])
+        distributor = TaskDistributor(self.ctx, self.get_partitioner())
+        distributor.redistribute_jobs(tasks)
         failed_tasks = db.failed_task_get_all(self.ctx, filters=filters)
-        for failed_task in failed_tasks:
-            # Get the parent task executor
-            task = db.task_get(self.ctx, failed_task['task_id'])
-            origin_executor = failed_task['executor']
-            new_executor = task['executor']
-            # If the target executor is different from current executor,
-            # remove the job from old executor and add it to new executor
-            if new_executor != origin_executor:
-                LOG.info('Re-distribute failed_job %s from %s to %s' %
-                         (failed_task['id'], origin_executor, new_executor))
-                self.task_rpcapi.remove_failed_job(
-                    self.ctx, failed_task['id'], failed_task['executor'])
-            distributor.distribute_failed_job(failed_task['id'],
-                                              task['executor'])
-        partitioner.stop()
+        distributor.redistribute_failed_jobs(failed_tasks)
 
     def on_node_leave(self, event):
         LOG.info('Member %s left the group %s' % (event.member_id,
@@ -99,16 +84,14 @@ class SchedulerManager(object):
         filters = {'executor': event.member_id.decode('utf-8'),
                    'deleted': False}
         re_distribute_tasks = db.task_get_all(self.ctx, filters=filters)
-        distributor = TaskDistributor(self.ctx)
-        for task in re_distribute_tasks:
-            distributor.distribute_new_job(task['id'])
+        distributor = TaskDistributor(self.ctx, self.get_partitioner())
+        # The jobs went away with the left node
+        distributor.redistribute_jobs(re_distribute_tasks, remove_jobs=False)
 
         re_distribute_failed_tasks = db.failed_task_get_all(self.ctx,
                                                             filters=filters)
-        for failed_task in re_distribute_failed_tasks:
-            task = db.task_get(self.ctx, failed_task['task_id'])
-            executor = task['executor']
-            distributor.distribute_failed_job(failed_task['id'], executor)
+        distributor.redistribute_failed_jobs(re_distribute_failed_tasks,
+                                             remove_jobs=False)
 
     def schedule_boot_jobs(self):
         # Recover the job in db
@@ -125,8 +108,7 @@ class SchedulerManager(object):
                                        'PerfJobManager',
                                coordination=True)
         service.serve(job_generator)
-        partitioner = ConsistentHashing()
-        partitioner.start()
+        partitioner = self.get_partitioner()
         partitioner.register_watcher_func(self.on_node_join,
                                           self.on_node_leave)
         self.watch_job_id = uuidutils.generate_uuid()
@@ -139,6 +121,10 @@ class SchedulerManager(object):
         """Cleanup periodic jobs"""
         if self.watch_job_id:
             self.scheduler.remove_job(self.watch_job_id)
+            self.watch_job_id = None
+        if self.partitioner:
+            self.partitioner.stop()
+            self.partitioner = None
 
     def get_scheduler(self):
         return self.scheduler
@@ -146,15 +132,11 @@ class SchedulerManager(object):
     def recover_job(self):
         filters = {'deleted': False}
         all_tasks = db.task_get_all(self.ctx, filters=filters)
-        distributor = TaskDistributor(self.ctx)
-        for task in all_tasks:
-            distributor.distribute_new_job(task['id'])
+        distributor = TaskDistributor(self.ctx, self.get_partitioner())
+        distributor.distribute_jobs(all_tasks)
 
     def recover_failed_job(self):
         filters = {'deleted': False}
         all_failed_tasks = db.failed_task_get_all(self.ctx, filters=filters)
-        distributor = TaskDistributor(self.ctx)
-        for failed_task in all_failed_tasks:
-            task = db.task_get(self.ctx, failed_task['task_id'])
-            executor = task['executor']
-            distributor.distribute_failed_job(failed_task['id'], executor)
+        distributor = TaskDistributor(self.ctx, self.get_partitioner())
+        distributor.distribute_failed_jobs(all_failed_tasks)
@@ -0,0 +1,231 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Executor of the periodic performance collections of a task manager.
+
+The scheduler jobs only submit the collections here and return, so a slow
+array doesn't hold the threads of the scheduler. Each driver type has its
+own worker slots, so the collections of slow arrays can't starve the others
+on the same node, and a collection due while the previous one of the task
+is still running is handled by the overrun policy.
+"""
+
+import bisect
+import collections
+import threading
+import time
+
+import eventlet
+from eventlet import semaphore
+from oslo_config import cfg
+from oslo_log import log
+
+CONF = cfg.CONF
+LOG = log.getLogger(__name__)
+
+OVERRUN_SKIP = 'skip'
+OVERRUN_COALESCE = 'coalesce'
+OVERRUN_QUEUE = 'queue'
+DEFAULT_DRIVER_TYPE = 'default'
+# Upper bounds of the run duration buckets, in seconds
+DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 900, 1800)
+STATS_LOG_INTERVAL_SEC = 600
+# Number of the slowest tasks in the logged summary
+SLOWEST_TASKS_LOGGED = 5
+
+
+class DurationHistogram(object):
+    """Histogram of the run durations of a task."""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, duration):
+        self.counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.sum += duration
+        self.count += 1
+
+    def to_dict(self):
+        """Cumulative counts of the buckets as Prometheus histograms do."""
+        cumulative = 0
+        buckets = collections.OrderedDict()
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'buckets': buckets, 'sum': self.sum, 'count': self.count}
+
+
+class CollectionState(object):
+    """Whether a task is collecting and the windows waiting behind it."""
+
+    def __init__(self):
+        self.running = False
+        self.pending = collections.deque()
+
+
+class CollectionExecutor(object):
+    """Run the collections of the tasks on green threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._waiting = collections.Counter()
+        self._states = {}
+        self._threads = set()
+        self.durations = {}
+        self.stats = collections.Counter()
+
+    @staticmethod
+    def get_workers(driver_type):
+        workers = CONF.telemetry.driver_collection_workers
+        for key in (driver_type, driver_type.split(' ')[0]):
+            if key in workers:
+                return max(int(workers[key]), 1)
+        return CONF.telemetry.collection_workers
+
+    def _get_slots(self, driver_type):
+        with self._lock:
+            if driver_type not in self._slots:
+                self._slots[driver_type] = semaphore.Semaphore(
+                    self.get_workers(driver_type))
+            return self._slots[driver_type]
+
+    def submit(self, task_id, driver_type, collect, start_time, end_time):
+        """Run collect(start_time, end_time) for the task.
+
+        :param driver_type: "vendor model" of the driver of the storage
+        :param collect: called with the window to collect, in epoch seconds
+        :returns: False if the collection is dropped by the overrun policy
+        """
+        driver_type = driver_type or DEFAULT_DRIVER_TYPE
+        with self._lock:
+            state = self._states.setdefault(task_id, CollectionState())
+            if state.running:
+                return self._overrun(task_id, state, start_time, end_time)
+            state.running = True
+        thread = eventlet.spawn(self._run, task_id, driver_type, collect,
+                                start_time, end_time)
+        with self._lock:
+            self._threads.add(thread)
+        thread.link(self._discard_thread)
+        return True
+
+    def _overrun(self, task_id, state, start_time, end_time):
+        policy = CONF.telemetry.collection_overrun_policy
+        self.stats['overran'] += 1
+        if policy == OVERRUN_COALESCE:
+            if state.pending:
+                start_time = state.pending.pop()[0]
+            state.pending.append((start_time, end_time))
+            self.stats['coalesced'] += 1
+            return True
+        if policy == OVERRUN_QUEUE \
+                and len(state.pending) < CONF.telemetry.collection_queue_size:
+            state.pending.append((start_time, end_time))
+            self.stats['queued'] += 1
+            return True
+        self.stats['skipped'] += 1
+        LOG.warning('Performance collection of task id %s still running, '
+                    'skipping its collection till %s' % (task_id, end_time))
+        return False
+
+    def _discard_thread(self, thread):
+        with self._lock:
+            self._threads.discard(thread)
+
+    def _run(self, task_id, driver_type, collect, start_time, end_time):
+        slots = self._get_slots(driver_type)
+        while True:
+            self._waiting[driver_type] += 1
+            try:
+                slots.acquire()
+            finally:
+                self._waiting[driver_type] -= 1
+            begin = time.time()
+            try:
+                collect(start_time, end_time)
+            except Exception as e:
+                LOG.error('Performance collection of task id %s failed: %s'
+                          % (task_id, e))
+            finally:
+                slots.release()
+                self._observe(task_id, time.time() - begin)
+
+            with self._lock:
+                state = self._states[task_id]
+                if not state.pending:
+                    state.running = False
+                    return
+                start_time, end_time = state.pending.popleft()
+
+    def _observe(self, task_id, duration):
+        with self._lock:
+            histogram = self.durations.get(task_id)
+            if histogram is None:
+                histogram = self.durations[task_id] = DurationHistogram()
+            histogram.observe(duration)
+
+    def forget(self, task_id):
+        """Drop the state and durations of a task no longer scheduled."""
+        with self._lock:
+            state = self._states.get(task_id)
+            if state is not None and not state.running:
+                del self._states[task_id]
+            self.durations.pop(task_id, None)
+
+    def wait(self):
+        """Wait for the submitted collections to be done."""
+        while True:
+            with self._lock:
+                threads = list(self._threads)
+            if not threads:
+                return
+            for thread in threads:
+                thread.wait()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['running'] = sum(1 for state in self._states.values()
+                                   if state.running)
+            stats['pending'] = sum(len(state.pending)
+                                   for state in self._states.values())
+            stats['waiting'] = dict(+self._waiting)
+            stats['durations'] = {task_id: histogram.to_dict()
+                                  for task_id, histogram
+                                  in self.durations.items()}
+        return stats
+
+    def log_stats(self):
+        """Log a summary of the collections run by this process."""
+        stats = self.get_stats()
+        durations = stats.pop('durations')
+        if not durations and not any(stats.values()):
+            return
+        slowest = sorted(
+            ((histogram['sum'] / histogram['count'], task_id)
+             for task_id, histogram in durations.items()
+             if histogram['count']), reverse=True)[:SLOWEST_TASKS_LOGGED]
+        LOG.info('Performance collections: %s, runs: %d, slowest tasks: %s',
+                 stats, sum(histogram['count']
+                            for histogram in durations.values()),
+                 ', '.join('%s %.1fs' % (task_id, duration)
+                           for duration, task_id in slowest))
+
+
+COLLECTION_EXECUTOR = CollectionExecutor()
@@ -0,0 +1,54 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Timing of the periodic performance collections of an executor.
+
+Each task gets a phase within its interval derived from its id, and its
+collections run when the epoch time modulo the interval is the phase. So the
+collections of the tasks are spread over the interval, and stay so after a
+restart or a rebalance, instead of all running in the same second.
+
+The collections are run by the collection executor, which limits the
+collections running at the same time and handles those overrunning their
+interval.
+"""
+
+import time
+import zlib
+from datetime import datetime
+
+from oslo_config import cfg
+
+CONF = cfg.CONF
+
+
+def get_phase(task_id, interval):
+    """Get the fixed offset of the collections of a task in its interval."""
+    return zlib.crc32(str(task_id).encode('utf-8')) % int(interval)
+
+
+def get_next_run_time(task_id, interval, now=None):
+    """Get the next collection time of a task after now.
+
+    :returns: datetime of the next slot of the task, or one interval after
+              now if the collections are not spread
+    """
+    now = time.time() if now is None else now
+    interval = int(interval)
+    if not CONF.telemetry.collection_spread or interval <= 0:
+        return datetime.fromtimestamp(int(now) + interval)
+    phase = get_phase(task_id, interval)
+    next_run_time = int(now) - (int(now) - phase) % interval + interval
+    return datetime.fromtimestamp(next_run_time)
@@ -21,6 +21,7 @@ from delfin import exception
 from delfin.common.constants import TelemetryJobStatus, TelemetryCollection
 from delfin.db.sqlalchemy.models import FailedTask
 from delfin.db.sqlalchemy.models import Task
+from delfin.drivers import api as driverapi
 from delfin.i18n import _
 from delfin.task_manager.scheduler import schedule_manager
 from delfin.task_manager.tasks.telemetry import PerformanceCollectionTask
@@ -42,15 +43,18 @@ class FailedPerformanceCollectionHandler(object):
         self.start_time = start_time
         self.end_time = end_time
         self.metrics_task_rpcapi = metrics_task_rpcapi.TaskAPI()
+        self.driver_api = driverapi.API()
         self.scheduler_instance = \
             schedule_manager.SchedulerManager().get_scheduler()
         self.result = TelemetryJobStatus.FAILED_JOB_STATUS_INIT
         self.executor = executor
 
     @staticmethod
-    def get_instance(ctx, failed_task_id):
-        failed_task = db.failed_task_get(ctx, failed_task_id)
-        task = db.task_get(ctx, failed_task[FailedTask.task_id.name])
+    def get_instance(ctx, failed_task_id, task=None, failed_task=None):
+        if failed_task is None:
+            failed_task = db.failed_task_get(ctx, failed_task_id)
+        if task is None:
+            task = db.task_get(ctx, failed_task[FailedTask.task_id.name])
         return FailedPerformanceCollectionHandler(
             ctx,
             failed_task[FailedTask.id.name],
@@ -79,11 +83,26 @@ class FailedPerformanceCollectionHandler(object):
                       % (self.storage_id, self.failed_task_id))
             return
 
+        # The gap ledger may have extended the range since it's scheduled
+        self.start_time = failed_task[FailedTask.start_time.name]
+        self.end_time = failed_task[FailedTask.end_time.name]
+        self.retry_count = failed_task[FailedTask.retry_count.name]
+        start_time, end_time = self._get_backfill_window()
+        if start_time is None:
+            LOG.warning("Performance metrics of storage id:{0} from {1} to "
+                        "{2} aged out of the storage, giving up on the "
+                        "collection".format(self.storage_id, self.start_time,
+                                            self.end_time))
+            # Nothing left to retry, the gap ledger doesn't extend it anymore
+            self.retry_count = TelemetryCollection.MAX_FAILED_JOB_RETRY_COUNT
+            self._stop_task()
+            return
+
         self.retry_count = self.retry_count + 1
         try:
             telemetry = PerformanceCollectionTask()
             status = telemetry.collect(self.ctx, self.storage_id, self.args,
-                                       self.start_time, self.end_time)
+                                       start_time, end_time)
 
             if not status:
                 raise exception.TelemetryTaskExecError()
@@ -94,6 +113,25 @@ class FailedPerformanceCollectionHandler(object):
                                                 six.text_type(e)))
             LOG.error(msg)
         else:
+            # The gap ledger may have extended the range while collecting
+            try:
+                self.end_time = db.failed_task_get(
+                    self.ctx, self.failed_task_id)[FailedTask.end_time.name]
+            except exception.FailedTaskNotFound:
+                return
+            if end_time < self.end_time:
+                # Backfill the rest of the range with the next run
+                LOG.info("Collected performance metrics for storage id :{0} "
+                         "till {1}, {2} remaining".format(
+                             self.storage_id, end_time,
+                             self.end_time - end_time))
+                db.failed_task_update(
+                    self.ctx, self.failed_task_id,
+                    {FailedTask.start_time.name: end_time,
+                     FailedTask.retry_count.name: 0,
+                     FailedTask.result.name:
+                         TelemetryJobStatus.FAILED_JOB_STATUS_RETRYING})
+                return
             LOG.info("Successfully completed Performance metrics collection "
                      "for storage id :{0} ".format(self.storage_id))
             self.result = TelemetryJobStatus.FAILED_JOB_STATUS_SUCCESS
@@ -105,8 +143,7 @@ class FailedPerformanceCollectionHandler(object):
                 "Failed to collect performance metrics of task instance "
                 "id:{0} for start time:{1} and end time:{2} with "
                 "maximum retry. Giving up on "
-                "retry".format(self.failed_task_id, self.start_time,
-                               self.end_time))
+                "retry".format(self.failed_task_id, start_time, end_time))
             LOG.error(msg)
             self._stop_task()
             return
@@ -116,6 +153,39 @@ class FailedPerformanceCollectionHandler(object):
                               {FailedTask.retry_count.name: self.retry_count,
                                FailedTask.result.name: self.result})
 
+    def _get_backfill_window(self):
+        """Get the next chunk of the range to collect.
+
+        A chunk is at most as long as the performance metric retention window
+        of the driver, and the part of the range older than the retention
+        window from the latest performance data of the storage is skipped.
+
+        :returns: (start_time, end_time) in epoch milliseconds, or
+                  (None, None) if the whole range aged out
+        """
+        start_time = self.start_time
+        chunk_window = CONF.telemetry.max_failed_task_retry_window
+        try:
+            capabilities = self.driver_api.get_capabilities(self.ctx,
+                                                            self.storage_id)
+            retention_window = \
+                capabilities.get('performance_metric_retention_window')
+            if retention_window:
+                chunk_window = min(chunk_window, retention_window)
+                latest_timestamp = self.driver_api.get_latest_perf_timestamp(
+                    self.ctx, self.storage_id)
+                if latest_timestamp:
+                    start_time = max(start_time, latest_timestamp
+                                     - retention_window * 1000)
+        except Exception as e:
+            LOG.warning("Failed to get the performance retention of storage "
+                        "id :{0}, reason:{1}".format(self.storage_id,
+                                                     six.text_type(e)))
+        if start_time >= self.end_time:
+            return None, None
+        return start_time, min(self.end_time,
+                               start_time + chunk_window * 1000)
+
     def _stop_task(self):
         db.failed_task_update(self.ctx, self.failed_task_id,
                               {FailedTask.retry_count.name: self.retry_count,
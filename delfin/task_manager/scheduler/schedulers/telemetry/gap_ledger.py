@@ -0,0 +1,103 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Ledger of the performance data gaps of the storages.
+
+A gap is a failed task row covering a contiguous range of the collection
+task not collected yet. The window of a failed collection is merged into
+the gaps it overlaps, so an outage of a storage leaves one gap to backfill
+instead of a failed task for each collection cycle.
+"""
+
+from oslo_log import log
+
+from delfin import db
+from delfin.common.constants import TelemetryJobStatus, TelemetryCollection
+from delfin.db.sqlalchemy.models import FailedTask
+from delfin.task_manager import metrics_rpcapi as metrics_task_rpcapi
+
+LOG = log.getLogger(__name__)
+
+
+def merge_window(gaps, start_time, end_time):
+    """Merge a window into the gaps it overlaps.
+
+    :returns: the overlapped gaps and the merged (start_time, end_time)
+    """
+    overlapped = [gap for gap in gaps
+                  if gap[FailedTask.start_time.name] <= end_time
+                  and gap[FailedTask.end_time.name] >= start_time]
+    for gap in overlapped:
+        start_time = min(start_time, gap[FailedTask.start_time.name])
+        end_time = max(end_time, gap[FailedTask.end_time.name])
+    overlapped.sort(key=lambda gap: gap[FailedTask.start_time.name])
+    return overlapped, (start_time, end_time)
+
+
+def is_stopped(gap):
+    """Whether the backfill of a gap is over and its row to be removed."""
+    return (gap[FailedTask.result.name]
+            == TelemetryJobStatus.FAILED_JOB_STATUS_SUCCESS
+            or gap[FailedTask.retry_count.name]
+            >= TelemetryCollection.MAX_FAILED_JOB_RETRY_COUNT)
+
+
+class GapLedger(object):
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.metrics_task_rpcapi = metrics_task_rpcapi.TaskAPI()
+
+    def add(self, failed_task):
+        """Record the window of a failed collection.
+
+        :param failed_task: values of the failed task of the window
+        :returns: the failed task of the gap covering the window
+        """
+        filters = {FailedTask.storage_id.name:
+                   failed_task[FailedTask.storage_id.name],
+                   FailedTask.task_id.name:
+                   failed_task[FailedTask.task_id.name],
+                   'deleted': False}
+        # The stopped gaps are not retried anymore, a window merged into
+        # them would be lost with their rows
+        gaps = [gap for gap in db.failed_task_get_all(self.ctx,
+                                                      filters=filters)
+                if not is_stopped(gap)]
+        overlapped, (start_time, end_time) = merge_window(
+            gaps, failed_task[FailedTask.start_time.name],
+            failed_task[FailedTask.end_time.name])
+
+        if not overlapped:
+            gap = db.failed_task_create(self.ctx, failed_task)
+            self.metrics_task_rpcapi.assign_failed_job(
+                self.ctx, gap[FailedTask.id.name],
+                gap[FailedTask.executor.name])
+            return gap
+
+        # The first gap takes over the range of the others, and the retries
+        # start over as the range has new data to collect
+        gap = overlapped[0]
+        db.failed_task_update(self.ctx, gap[FailedTask.id.name],
+                              {FailedTask.start_time.name: start_time,
+                               FailedTask.end_time.name: end_time,
+                               FailedTask.retry_count.name: 0})
+        for merged in overlapped[1:]:
+            self.metrics_task_rpcapi.remove_failed_job(
+                self.ctx, merged[FailedTask.id.name],
+                merged[FailedTask.executor.name])
+        LOG.info('Performance data gap of storage %s extended to %s - %s'
+                 % (gap[FailedTask.storage_id.name], start_time, end_time))
+        return gap
@@ -25,6 +25,10 @@ from delfin.exception import TaskNotFound
 from delfin.i18n import _
 from delfin.task_manager import rpcapi as task_rpcapi
 from delfin.task_manager.scheduler import schedule_manager
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_executor
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_scheduler
 from delfin.task_manager.tasks.telemetry import PerformanceCollectionTask
 
 CONF = cfg.CONF
@@ -45,11 +49,26 @@ class JobHandler(object):
         self.job_ids = set()
 
     @staticmethod
-    def get_instance(ctx, task_id):
-        task = db.task_get(ctx, task_id)
+    def get_instance(ctx, task_id, task=None):
+        if task is None:
+            task = db.task_get(ctx, task_id)
         return JobHandler(ctx, task_id, task['storage_id'],
                           task['args'], task['interval'])
 
+    @staticmethod
+    def schedule_jobs(ctx, task_ids):
+        """Schedule the tasks, which are got in one query."""
+        for task in db.tasks_get_by_ids(ctx, task_ids):
+            instance = JobHandler.get_instance(ctx, task['id'], task)
+            instance.schedule_job(task['id'], task)
+
+    @staticmethod
+    def remove_jobs(ctx, task_ids):
+        """Remove the scheduled tasks, which are got in one query."""
+        for task in db.tasks_get_by_ids(ctx, task_ids):
+            instance = JobHandler.get_instance(ctx, task['id'], task)
+            instance.remove_job(task['id'], task)
+
     def perform_history_collection(self, start_time, end_time, last_run_time):
         # Trigger one historic collection to make sure we do not
         # miss any Data points due to reschedule
@@ -69,27 +88,28 @@ class JobHandler(object):
                     .format(self.storage_id, six.text_type(e)))
             LOG.error(msg)
 
-    def schedule_job(self, task_id):
+    def schedule_job(self, task_id, task=None):
 
         if self.stopped:
             # If Job is stopped return immediately
             return
 
         LOG.info("JobHandler received A job %s to schedule" % task_id)
-        job = db.task_get(self.ctx, task_id)
+        job = task if task is not None else db.task_get(self.ctx, task_id)
         # Check delete status of the task
         deleted = job['deleted']
         if deleted:
             return
         collection_class = importutils.import_class(
             job['method'])
-        instance = collection_class.get_instance(self.ctx, self.task_id)
+        instance = collection_class.get_instance(self.ctx, self.task_id,
+                                                 task=job)
         current_time = int(datetime.now().timestamp())
         last_run_time = current_time
-        next_collection_time = last_run_time + job['interval']
+        next_collection_time = collection_scheduler.get_next_run_time(
+            self.task_id, job['interval'], now=current_time)
         job_id = uuidutils.generate_uuid()
-        next_collection_time = datetime \
-            .fromtimestamp(next_collection_time) \
+        next_collection_time = next_collection_time \
             .strftime('%Y-%m-%d %H:%M:%S')
 
         existing_job_id = job['job_id']
@@ -149,12 +169,14 @@ class JobHandler(object):
         if job_id and self.scheduler.get_job(job_id):
             self.scheduler.remove_job(job_id)
 
-    def remove_job(self, task_id):
+    def remove_job(self, task_id, task=None):
         try:
             LOG.info("Received job %s to remove", task_id)
-            job = db.task_get(self.ctx, task_id)
+            job = task if task is not None else db.task_get(self.ctx,
+                                                            task_id)
             job_id = job['job_id']
             self.remove_scheduled_job(job_id)
+            collection_executor.COLLECTION_EXECUTOR.forget(task_id)
         except Exception as e:
             LOG.error("Failed to remove periodic scheduling job , reason: %s.",
                       six.text_type(e))
@@ -172,13 +194,35 @@ class FailedJobHandler(object):
     def get_instance(ctx, failed_task_id):
         return FailedJobHandler(ctx)
 
-    def schedule_failed_job(self, failed_task_id):
+    @staticmethod
+    def schedule_failed_jobs(ctx, failed_task_ids):
+        """Schedule the failed tasks, which are got with their parent
+        tasks in one query each.
+        """
+        failed_tasks = db.failed_tasks_get_by_ids(ctx, failed_task_ids)
+        tasks = {task['id']: task for task in db.tasks_get_by_ids(
+            ctx, [failed_task['task_id'] for failed_task in failed_tasks])}
+        for failed_task in failed_tasks:
+            instance = FailedJobHandler.get_instance(ctx, failed_task['id'])
+            instance.schedule_failed_job(failed_task['id'], failed_task,
+                                         tasks.get(failed_task['task_id']))
+
+    @staticmethod
+    def remove_failed_jobs(ctx, failed_task_ids):
+        """Remove the failed tasks, which are got in one query."""
+        for failed_task in db.failed_tasks_get_by_ids(ctx, failed_task_ids):
+            instance = FailedJobHandler.get_instance(ctx, failed_task['id'])
+            instance.remove_failed_job(failed_task['id'], failed_task)
+
+    def schedule_failed_job(self, failed_task_id, failed_task=None,
+                            task=None):
 
         if self.stopped:
             return
 
         try:
-            job = db.failed_task_get(self.ctx, failed_task_id)
+            job = failed_task if failed_task is not None else \
+                db.failed_task_get(self.ctx, failed_task_id)
             retry_count = job['retry_count']
             result = job['result']
             job_id = job['job_id']
@@ -195,7 +239,8 @@ class FailedJobHandler(object):
                 return
 
             try:
-                db.task_get(self.ctx, job['task_id'])
+                if task is None:
+                    db.task_get(self.ctx, job['task_id'])
             except TaskNotFound as e:
                 LOG.info("Removing failed telemetry job as parent job "
                          "do not exist: %s", six.text_type(e))
@@ -211,8 +256,9 @@ class FailedJobHandler(object):
 
                 collection_class = importutils.import_class(
                     job['method'])
-                instance = \
-                    collection_class.get_instance(self.ctx, job['id'])
+                instance = collection_class.get_instance(
+                    self.ctx, job['id'], task=task,
+                    failed_task=dict(job, job_id=job_id))
                 self.scheduler.add_job(
                     instance, 'interval',
                     seconds=job['interval'],
@@ -241,10 +287,11 @@ class FailedJobHandler(object):
         for job_id in self.job_ids.copy():
             self.remove_scheduled_job(job_id)
 
-    def remove_failed_job(self, failed_task_id):
+    def remove_failed_job(self, failed_task_id, failed_task=None):
         try:
             LOG.info("Received failed job %s to remove", failed_task_id)
-            job = db.failed_task_get(self.ctx, failed_task_id)
+            job = failed_task if failed_task is not None else \
+                db.failed_task_get(self.ctx, failed_task_id)
             job_id = job['job_id']
             self.remove_scheduled_job(job_id)
             db.failed_task_delete(self.ctx, job['id'])
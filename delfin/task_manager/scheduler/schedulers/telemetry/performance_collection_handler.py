@@ -25,8 +25,10 @@ from delfin import exception
 from delfin.common.constants import TelemetryCollection
 from delfin.db.sqlalchemy.models import FailedTask
 from delfin.drivers import api as driverapi
-from delfin.task_manager import metrics_rpcapi as metrics_task_rpcapi
 from delfin.task_manager.scheduler import schedule_manager
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_executor
+from delfin.task_manager.scheduler.schedulers.telemetry import gap_ledger
 from delfin.task_manager.scheduler.schedulers.telemetry. \
     failed_performance_collection_handler import \
     FailedPerformanceCollectionHandler
@@ -44,14 +46,15 @@ class PerformanceCollectionHandler(object):
         self.storage_id = storage_id
         self.args = args
         self.interval = interval
-        self.metric_task_rpcapi = metrics_task_rpcapi.TaskAPI()
         self.driver_api = driverapi.API()
         self.executor = executor
+        self.driver_type = None
         self.scheduler = schedule_manager.SchedulerManager().get_scheduler()
 
     @staticmethod
-    def get_instance(ctx, task_id):
-        task = db.task_get(ctx, task_id)
+    def get_instance(ctx, task_id, task=None):
+        if task is None:
+            task = db.task_get(ctx, task_id)
         return PerformanceCollectionHandler(ctx, task_id, task['storage_id'],
                                             task['args'], task['interval'],
                                             task['executor'])
@@ -72,19 +75,39 @@ class PerformanceCollectionHandler(object):
                       % (self.storage_id, self.task_id))
             return
 
+        current_time = int(datetime.now().timestamp())
+        collection_executor.COLLECTION_EXECUTOR.submit(
+            self.task_id, self._get_driver_type(), self.collect,
+            current_time - self.interval, current_time)
+
+    def _get_driver_type(self):
+        if self.driver_type is None:
+            try:
+                access_info = db.access_info_get(self.ctx, self.storage_id)
+                self.driver_type = '%s %s' % (access_info['vendor'],
+                                              access_info['model'])
+            except Exception as e:
+                LOG.warning('Failed to get the driver type of storage %s: %s'
+                            % (self.storage_id, six.text_type(e)))
+                return None
+        return self.driver_type
+
+    def collect(self, window_start, window_end):
+        """Collect the performance metrics of the window.
+
+        :param window_start: epoch time in seconds
+        :param window_end: epoch time in seconds
+        """
         # Handles performance collection from driver and dispatch
-        start_time = None
-        end_time = None
+        current_time = window_end
+        # Times are epoch time in milliseconds
+        overlap = CONF.telemetry. \
+            performance_timestamp_overlap
+        end_time = current_time * 1000
+        start_time = (window_start - overlap) * 1000
         try:
             LOG.debug('Collecting performance metrics for task id: %s'
                       % self.task_id)
-            current_time = int(datetime.now().timestamp())
-
-            # Times are epoch time in milliseconds
-            overlap = CONF.telemetry. \
-                performance_timestamp_overlap
-            end_time = current_time * 1000
-            start_time = end_time - (self.interval * 1000) - (overlap * 1000)
             telemetry = PerformanceCollectionTask()
             status = telemetry.collect(self.ctx, self.storage_id, self.args,
                                        start_time, end_time)
@@ -142,7 +165,4 @@ class PerformanceCollectionHandler(object):
                            '.' + FailedPerformanceCollectionHandler.__name__,
                        FailedTask.retry_count.name: 0,
                        FailedTask.executor.name: self.executor}
-        failed_task = db.failed_task_create(self.ctx, failed_task)
-        self.metric_task_rpcapi.assign_failed_job(self.ctx,
-                                                  failed_task['id'],
-                                                  failed_task['executor'])
+        gap_ledger.GapLedger(self.ctx).add(failed_task)
@@ -17,10 +17,13 @@ Subprocess metrics manager for metric collection tasks**
 
 from oslo_log import log
 from oslo_config import cfg
+from oslo_service import periodic_task
 
 from delfin.coordination import GroupMembership
 from delfin import manager
 from delfin.task_manager.scheduler import schedule_manager
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_executor
 from delfin.task_manager.scheduler.schedulers.telemetry.job_handler \
     import FailedJobHandler
 from delfin.task_manager.scheduler.schedulers.telemetry.job_handler \
@@ -34,7 +37,7 @@ LOG = log.getLogger(__name__)
 class SubprocessManager(manager.Manager):
     """manage periodical collection tasks in subprocesses"""
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self, service_name=None, *args, **kwargs):
         super(SubprocessManager, self).__init__(*args, **kwargs)
@@ -61,3 +64,21 @@ class SubprocessManager(manager.Manager):
     def remove_failed_job_local(self, context, failed_task_id):
         instance = FailedJobHandler.get_instance(context, failed_task_id)
         instance.remove_failed_job(failed_task_id)
+
+    def assign_jobs_local(self, context, task_ids):
+        JobHandler.schedule_jobs(context, task_ids)
+
+    def remove_jobs_local(self, context, task_ids):
+        JobHandler.remove_jobs(context, task_ids)
+
+    def assign_failed_jobs_local(self, context, failed_task_ids):
+        FailedJobHandler.schedule_failed_jobs(context, failed_task_ids)
+
+    def remove_failed_jobs_local(self, context, failed_task_ids):
+        FailedJobHandler.remove_failed_jobs(context, failed_task_ids)
+
+    @periodic_task.periodic_task(
+        spacing=collection_executor.STATS_LOG_INTERVAL_SEC)
+    def log_collection_stats(self, context):
+        """Periodical task to log a summary of the performance collections."""
+        collection_executor.COLLECTION_EXECUTOR.log_stats()
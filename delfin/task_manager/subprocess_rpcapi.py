@@ -30,9 +30,11 @@ class SubprocessAPI(object):
     API version history:
 
         1.0 - Initial version.
+        1.1 - Add assign_jobs_local, remove_jobs_local,
+              assign_failed_jobs_local and remove_failed_jobs_local.
     """
 
-    RPC_API_VERSION = '1.0'
+    RPC_API_VERSION = '1.1'
 
     def __init__(self):
         super(SubprocessAPI, self).__init__()
@@ -73,3 +75,31 @@ class SubprocessAPI(object):
                                           fanout=False)
         return call_context.cast(context, 'remove_failed_job_local',
                                  failed_task_id=failed_task_id)
+
+    def assign_jobs_local(self, context, task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=False)
+        return call_context.cast(context, 'assign_jobs_local',
+                                 task_ids=task_ids)
+
+    def remove_jobs_local(self, context, task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=False)
+        return call_context.cast(context, 'remove_jobs_local',
+                                 task_ids=task_ids)
+
+    def assign_failed_jobs_local(self, context, failed_task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=False)
+        return call_context.cast(context, 'assign_failed_jobs_local',
+                                 failed_task_ids=failed_task_ids)
+
+    def remove_failed_jobs_local(self, context, failed_task_ids, executor):
+        rpc_client = self.get_client(str(executor))
+        call_context = rpc_client.prepare(topic=str(executor), version='1.1',
+                                          fanout=False)
+        return call_context.cast(context, 'remove_failed_jobs_local',
+                                 failed_task_ids=failed_task_ids)
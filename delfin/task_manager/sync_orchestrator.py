@@ -0,0 +1,92 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run the resource sync tasks of a storage concurrently.
+"""
+
+import functools
+import time
+
+import eventlet
+from eventlet import semaphore
+from oslo_config import cfg
+from oslo_log import log
+from oslo_utils import importutils
+
+from delfin.common import constants
+
+LOG = log.getLogger(__name__)
+CONF = cfg.CONF
+
+sync_opts = [
+    cfg.IntOpt('sync_pool_size',
+               default=64,
+               min=1,
+               help='Maximum number of resource sync tasks running '
+                    'concurrently in one task manager node.'),
+    cfg.IntOpt('storage_sync_concurrency',
+               default=4,
+               min=1,
+               help='Maximum number of resource sync tasks running '
+                    'concurrently for one storage, so that the storage is '
+                    'not overloaded with requests.'),
+]
+
+CONF.register_opts(sync_opts)
+
+
+class SyncOrchestrator(object):
+    """Fan out the resource sync tasks of a storage on green threads.
+
+    The tasks of one storage run at most storage_sync_concurrency at a time,
+    and all the tasks of this node share sync_pool_size slots.
+    """
+
+    def __init__(self):
+        self._node_semaphore = semaphore.Semaphore(CONF.sync_pool_size)
+
+    def sync(self, context, storage_id, resource_tasks):
+        """Sync the resources of a storage and wait for all tasks done.
+
+        :param resource_tasks: full class names of the resource tasks
+        :return: dict of resource task to its constants.ResourceSync result
+        """
+        start_time = time.time()
+        pool = eventlet.GreenPool(CONF.storage_sync_concurrency)
+        sync_resource = functools.partial(self._sync_resource, context,
+                                          storage_id)
+        results = dict(zip(resource_tasks,
+                           pool.imap(sync_resource, resource_tasks)))
+
+        failed_tasks = [resource_task for resource_task, result
+                        in results.items()
+                        if result == constants.ResourceSync.FAILED]
+        LOG.info('Resource sync for storage(id={0}) completed in {1:.2f}s, '
+                 '{2} tasks, {3} failed: {4}'
+                 .format(storage_id, time.time() - start_time,
+                         len(results), len(failed_tasks), failed_tasks))
+        return results
+
+    def _sync_resource(self, context, storage_id, resource_task):
+        with self._node_semaphore:
+            try:
+                cls = importutils.import_class(resource_task)
+                device_obj = cls(context, storage_id)
+                device_obj.sync()
+            except Exception as e:
+                LOG.error('Resource task {0} for storage(id={1}) failed: {2}'
+                          .format(resource_task, storage_id, e))
+                return constants.ResourceSync.FAILED
+            return device_obj.sync_result
@@ -12,18 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import inspect
+import json
+import time
 
 import decorator
+from oslo_config import cfg
 from oslo_log import log
+from oslo_utils import timeutils
 
-from delfin import coordination
 from delfin import db
 from delfin import exception
+from delfin.alert_manager import rpcapi as alert_rpcapi
 from delfin.common import constants
 from delfin.drivers import api as driverapi
 from delfin.i18n import _
 
+CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
 
@@ -32,33 +38,58 @@ def set_synced_after():
     def _set_synced_after(func, *args, **kwargs):
         call_args = inspect.getcallargs(func, *args, **kwargs)
         self = call_args['self']
+        resource_type = self.__class__.__name__
+        _update_sync_state(self.context, self.storage_id, resource_type,
+                           {'status': constants.ResourceSyncStatus.SYNCING,
+                            'start_time': timeutils.utcnow(),
+                            'end_time': None})
         sync_result = constants.ResourceSync.SUCCEED
+        sync_status = constants.ResourceSyncStatus.SYNCED
         ret = None
         try:
             ret = func(*args, **kwargs)
         except Exception:
             sync_result = constants.ResourceSync.FAILED
-        lock = coordination.Lock(self.storage_id)
-        with lock:
-            try:
-                storage = db.storage_get(self.context, self.storage_id)
-            except exception.StorageNotFound:
-                LOG.warning('Storage %s not found when set synced'
-                            % self.storage_id)
-            else:
-                # One sync task done, sync status minus 1
-                # When sync status get to 0
-                # means all the sync tasks are completed
-                if storage['sync_status'] != constants.SyncStatus.SYNCED:
-                    storage['sync_status'] -= sync_result
-                    db.storage_update(self.context, self.storage_id,
-                                      {'sync_status': storage['sync_status']})
+            sync_status = constants.ResourceSyncStatus.FAILED
+        self.sync_result = sync_result
+        _update_sync_state(self.context, self.storage_id, resource_type,
+                           {'status': sync_status,
+                            'end_time': timeutils.utcnow()})
+        # One sync task done, sync status minus its result in one atomic
+        # update, when sync status get to 0 all the sync tasks are completed
+        try:
+            if not db.storage_sync_status_decrease(self.context,
+                                                   self.storage_id,
+                                                   sync_result):
+                LOG.debug('Storage %s not found or already synced when '
+                          'set synced' % self.storage_id)
+        except Exception as e:
+            LOG.warning('Failed to set synced for storage %s: %s'
+                        % (self.storage_id, e))
 
         return ret
 
     return _set_synced_after
 
 
+def _update_sync_state(context, storage_id, resource_type, values):
+    try:
+        db.resource_sync_state_update(context, storage_id, resource_type,
+                                      values)
+    except Exception as e:
+        LOG.warning('Failed to update the sync state of %s for storage %s: '
+                    '%s' % (resource_type, storage_id, e))
+
+
+def _increase_generation(context, storage_id):
+    """Let the API know the resources of the storage are changed."""
+    try:
+        db.storage_generation_increase(context, storage_id)
+    except Exception as e:
+        LOG.warning('Failed to increase the generation of storage %s: %s'
+                    % (storage_id, e))
+
+
 def check_deleted():
     @decorator.decorator
     def _check_deleted(func, *args, **kwargs):
@@ -81,40 +112,205 @@ def check_deleted():
     return _check_deleted
 
 
+class ResourceFingerprintCache(object):
+    """Fingerprints of the resources synced to db by this process.
+
+    Entries are keyed by storage id and resource task name, and map the
+    native resource id to the db id and fingerprint of the resource. An
+    entry is trusted only while the digest of the resource table is the one
+    seen after the last sync, i.e. no other node has changed the rows, and
+    for at most resource_fingerprint_expiration seconds.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, storage_id, task_name, digest):
+        entry = self._entries.get((storage_id, task_name))
+        if not entry:
+            return None
+        if entry['digest'] != digest or time.time() - entry['created_at'] \
+                > CONF.resource_fingerprint_expiration:
+            self.invalidate(storage_id, task_name)
+            return None
+        return entry['fingerprints']
+
+    def set(self, storage_id, task_name, digest, fingerprints):
+        entry = self._entries.get((storage_id, task_name))
+        # Expiration counts from the last full comparison with db
+        created_at = entry['created_at'] if entry else time.time()
+        self._entries[(storage_id, task_name)] = {
+            'created_at': created_at,
+            'digest': digest,
+            'fingerprints': fingerprints,
+        }
+
+    def invalidate(self, storage_id, task_name=None):
+        for key in list(self._entries):
+            if key[0] == storage_id and task_name in (None, key[1]):
+                self._entries.pop(key, None)
+
+
+FINGERPRINT_CACHE = ResourceFingerprintCache()
+
+
 class StorageResourceTask(object):
     NATIVE_RESOURCE_ID = None
+    # Table of the resources, required to cache the resource fingerprints
+    RESOURCE_TABLE = None
 
     def __init__(self, context, storage_id):
         self.storage_id = storage_id
         self.context = context
         self.driver_api = driverapi.API()
+        # Result of the last sync, set by set_synced_after
+        self.sync_result = None
 
-    def _classify_resources(self, storage_resources, db_resources, key):
+    @staticmethod
+    def _is_resource_changed(resource, db_resource):
+        """Check whether any field reported by driver differs from db.
+
+        Only the fields present in the driver resource are compared, the
+        fields maintained by delfin itself (id, created_at, ...) are ignored.
         """
-        :param storage_resources:
-        :param db_resources:
-        :return: it will return three list add_list: the items present in
-        storage but not in current_db. update_list:the items present in
-        storage and in current_db. delete_id_list:the items present not in
-        storage but present in current_db.
+        for field, value in resource.items():
+            if field == 'id':
+                continue
+            if db_resource.get(field) != value:
+                return True
+        return False
+
+    @staticmethod
+    def _is_rows_changed(storage_rows, db_rows):
+        """Check whether the rows rewritten as a whole by each sync, such as
+        the relations, differ from db regardless of their order.
+        """
+        if len(storage_rows) != len(db_rows):
+            return True
+        fields = set()
+        for row in storage_rows:
+            fields.update(row)
+        fields.discard('id')
+
+        def _row_key(row):
+            return json.dumps({field: row.get(field) for field in fields},
+                              sort_keys=True, default=str)
+
+        return (collections.Counter(map(_row_key, storage_rows))
+                != collections.Counter(map(_row_key, db_rows)))
+
+    @staticmethod
+    def _fingerprint(resource):
+        """Hash of the fields reported by driver for a resource."""
+        fields = {field: value for field, value in resource.items()
+                  if field != 'id'}
+        return hash(json.dumps(fields, sort_keys=True, default=str))
+
+    @classmethod
+    def _is_fingerprint_changed(cls, resource, fingerprint):
+        return cls._fingerprint(resource) != fingerprint
+
+    def _diff_resources(self, storage_resources, known_resources, key,
+                        is_changed):
         """
-        original_ids_in_db = [resource[key]
-                              for resource in db_resources]
-        delete_id_list = [resource['id'] for resource in db_resources]
+        :param storage_resources: resources reported by driver
+        :param known_resources: dict of native id to (db id, reference)
+        :param is_changed: callable to check a resource against reference
+        :return: add_list, update_list and delete_id_list
+        """
+        known_resources = dict(known_resources)
         add_list = []
         update_list = []
-
+        unchanged_count = 0
+        native_ids = set()
         for resource in storage_resources:
-            if resource[key] in original_ids_in_db:
-                resource['id'] = db_resources[original_ids_in_db.index(
-                    resource[key])]['id']
-                delete_id_list.remove(resource['id'])
+            native_id = resource[key]
+            if native_id in native_ids:
+                LOG.warning('Duplicated {0} {1} reported by storage(id={2}), '
+                            'ignore it'.format(key, native_id,
+                                               self.storage_id))
+                continue
+            native_ids.add(native_id)
+
+            known = known_resources.pop(native_id, None)
+            if known is None:
+                add_list.append(resource)
+                continue
+            resource['id'] = known[0]
+            if is_changed(resource, known[1]):
                 update_list.append(resource)
             else:
-                add_list.append(resource)
+                unchanged_count += 1
+
+        # Whatever left in db is not present in storage anymore
+        delete_id_list = [known[0] for known in known_resources.values()]
+        LOG.debug('{0} classify for storage(id={1}): add={2}, update={3}, '
+                  'delete={4}, unchanged={5}'.format(
+                      self.__class__.__name__, self.storage_id, len(add_list),
+                      len(update_list), len(delete_id_list), unchanged_count))
 
         return add_list, update_list, delete_id_list
 
+    def _classify_resources(self, storage_resources, db_resources, key):
+        """
+        :param storage_resources:
+        :param db_resources:
+        :return: it will return three list add_list: the items present in
+        storage but not in current_db. update_list:the items present in
+        storage and in current_db whose fields are changed. delete_id_list:
+        the items present not in storage but present in current_db.
+        The items present in both storage and current_db without any change
+        are left out of all three lists.
+        """
+        known_resources = {}
+        duplicated_id_list = []
+        for db_resource in db_resources:
+            if db_resource[key] in known_resources:
+                # Duplicated native id in db, keep the first one only
+                duplicated_id_list.append(db_resource['id'])
+                continue
+            known_resources[db_resource[key]] = (db_resource['id'],
+                                                 db_resource)
+
+        add_list, update_list, delete_id_list = self._diff_resources(
+            storage_resources, known_resources, key,
+            self._is_resource_changed)
+        return add_list, update_list, duplicated_id_list + delete_id_list
+
+    def _classify_fingerprints(self, storage_resources, fingerprints, key):
+        """Same as _classify_resources, but compares the resources with
+        the cached fingerprints instead of the db resources.
+        """
+        return self._diff_resources(storage_resources, fingerprints, key,
+                                    self._is_fingerprint_changed)
+
+    def _fingerprint_enabled(self):
+        return bool(self.RESOURCE_TABLE
+                    and CONF.resource_fingerprint_expiration > 0)
+
+    def _get_cached_fingerprints(self):
+        if not self._fingerprint_enabled():
+            return None
+        digest = db.resource_digest_get(self.context, self.RESOURCE_TABLE,
+                                        self.storage_id)
+        return FINGERPRINT_CACHE.get(self.storage_id,
+                                     self.__class__.__name__, digest)
+
+    def _cache_fingerprints(self, storage_resources):
+        if not self._fingerprint_enabled():
+            return
+        fingerprints = {}
+        for resource in storage_resources:
+            native_id = resource[self.NATIVE_RESOURCE_ID]
+            if resource.get('id') and native_id not in fingerprints:
+                fingerprints[native_id] = (resource['id'],
+                                           self._fingerprint(resource))
+        # Digest after our own changes, any later change is from others
+        digest = db.resource_digest_get(self.context, self.RESOURCE_TABLE,
+                                        self.storage_id)
+        FINGERPRINT_CACHE.set(self.storage_id, self.__class__.__name__,
+                              digest, fingerprints)
+
     @check_deleted()
     @set_synced_after()
     def sync(self):
@@ -123,15 +319,25 @@ class StorageResourceTask(object):
         """
         LOG.info('{} sync for storage(id={}) start'.format(
             self.__class__.__name__, self.storage_id))
+        written = False
         try:
-            # list the storage resources from driver and database
+            # list the storage resources from driver, and compare them with
+            # the cached fingerprints or else the resources in database
             storage_resources = self.driver_list_resources()
-            db_resources = self.db_resource_get_all(
-                {'storage_id': self.storage_id})
-
-            add_list, update_list, delete_id_list = self._classify_resources(
-                storage_resources, db_resources, self.NATIVE_RESOURCE_ID)
+            fingerprints = self._get_cached_fingerprints()
+            if fingerprints is None:
+                db_resources = self.db_resource_get_all(
+                    {'storage_id': self.storage_id})
+                add_list, update_list, delete_id_list = \
+                    self._classify_resources(storage_resources, db_resources,
+                                             self.NATIVE_RESOURCE_ID)
+            else:
+                add_list, update_list, delete_id_list = \
+                    self._classify_fingerprints(storage_resources,
+                                                fingerprints,
+                                                self.NATIVE_RESOURCE_ID)
 
+            written = bool(delete_id_list or update_list or add_list)
             if delete_id_list:
                 self.db_resources_delete(delete_id_list)
 
@@ -140,10 +346,14 @@ class StorageResourceTask(object):
 
             if add_list:
                 self.db_resources_create(add_list)
+
+            self._cache_fingerprints(storage_resources)
         except NotImplementedError:
             # Ignore this exception because driver may not support it.
             pass
         except Exception as e:
+            FINGERPRINT_CACHE.invalidate(self.storage_id,
+                                         self.__class__.__name__)
             msg = _('{} sync for storage(id={}) failed: {}'.format(
                 self.__class__.__name__, self.storage_id, e))
             LOG.error(msg)
@@ -151,11 +361,21 @@ class StorageResourceTask(object):
         else:
             LOG.info('{} sync for storage(id={}) successful'.format(
                 self.__class__.__name__, self.storage_id))
+        finally:
+            # Even a partially written change must invalidate the caches
+            if written:
+                self.resources_changed()
 
     def remove(self):
         LOG.info('{} remove for storage(id={})'.format(
             self.__class__.__name__, self.storage_id))
+        FINGERPRINT_CACHE.invalidate(self.storage_id, self.__class__.__name__)
         self.db_resource_delete_by_storage()
+        self.resources_changed()
+
+    def resources_changed(self):
+        """Called after the resources of the storage are changed in db."""
+        _increase_generation(self.context, self.storage_id)
 
     def driver_list_resources(self):
         raise NotImplementedError(
@@ -215,12 +435,15 @@ class StorageDeviceTask(StorageResourceTask):
             db.storage_delete(self.context, self.storage_id)
             db.access_info_delete(self.context, self.storage_id)
             db.alert_source_delete(self.context, self.storage_id)
+            db.resource_sync_state_delete_by_storage(self.context,
+                                                     self.storage_id)
         except Exception as e:
             LOG.error('Failed to update storage entry in DB: {0}'.format(e))
 
 
 class StoragePoolTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_storage_pool_id'
+    RESOURCE_TABLE = 'storage_pools'
 
     def driver_list_resources(self):
         return self.driver_api.list_storage_pools(
@@ -244,6 +467,7 @@ class StoragePoolTask(StorageResourceTask):
 
 class StorageVolumeTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_volume_id'
+    RESOURCE_TABLE = 'volumes'
 
     def driver_list_resources(self):
         return self.driver_api.list_volumes(self.context, self.storage_id)
@@ -266,6 +490,7 @@ class StorageVolumeTask(StorageResourceTask):
 
 class StorageControllerTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_controller_id'
+    RESOURCE_TABLE = 'controllers'
 
     def driver_list_resources(self):
         return self.driver_api.list_controllers(self.context, self.storage_id)
@@ -285,9 +510,20 @@ class StorageControllerTask(StorageResourceTask):
     def db_resource_delete_by_storage(self):
         return db.controller_delete_by_storage(self.context, self.storage_id)
 
+    def resources_changed(self):
+        super(StorageControllerTask, self).resources_changed()
+        # Trap receivers cache the controllers to fill the alerts
+        try:
+            alert_rpcapi.AlertAPI().invalidate_controller_cache(
+                self.context, self.storage_id)
+        except Exception as e:
+            LOG.warning('Failed to invalidate the cached controllers of '
+                        'storage %s: %s' % (self.storage_id, e))
+
 
 class StoragePortTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_port_id'
+    RESOURCE_TABLE = 'ports'
 
     def driver_list_resources(self):
         return self.driver_api.list_ports(self.context, self.storage_id)
@@ -310,6 +546,7 @@ class StoragePortTask(StorageResourceTask):
 
 class StorageDiskTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_disk_id'
+    RESOURCE_TABLE = 'disks'
 
     def driver_list_resources(self):
         return self.driver_api.list_disks(self.context, self.storage_id)
@@ -332,6 +569,7 @@ class StorageDiskTask(StorageResourceTask):
 
 class StorageQuotaTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_quota_id'
+    RESOURCE_TABLE = 'quota'
 
     def driver_list_resources(self):
         return self.driver_api.list_quotas(self.context, self.storage_id)
@@ -354,6 +592,7 @@ class StorageQuotaTask(StorageResourceTask):
 
 class StorageFilesystemTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_filesystem_id'
+    RESOURCE_TABLE = 'filesystems'
 
     def driver_list_resources(self):
         return self.driver_api.list_filesystems(self.context, self.storage_id)
@@ -376,6 +615,7 @@ class StorageFilesystemTask(StorageResourceTask):
 
 class StorageQtreeTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_qtree_id'
+    RESOURCE_TABLE = 'qtrees'
 
     def driver_list_resources(self):
         return self.driver_api.list_qtrees(self.context, self.storage_id)
@@ -398,6 +638,7 @@ class StorageQtreeTask(StorageResourceTask):
 
 class StorageShareTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_share_id'
+    RESOURCE_TABLE = 'shares'
 
     def driver_list_resources(self):
         return self.driver_api.list_shares(self.context, self.storage_id)
@@ -430,11 +671,16 @@ class StorageHostInitiatorTask(StorageResourceTask):
         """
         LOG.info('Syncing storage host initiator for storage id:{0}'
                  .format(self.storage_id))
+        written = False
         try:
             # Collect the storage host initiator list from driver and database
             storage_host_initiators = self.driver_api \
                 .list_storage_host_initiators(self.context, self.storage_id)
-            if storage_host_initiators:
+            db_host_initiators = db.storage_host_initiators_get_all(
+                self.context, filters={"storage_id": self.storage_id})
+            if storage_host_initiators and self._is_rows_changed(
+                    storage_host_initiators, db_host_initiators):
+                written = True
                 db.storage_host_initiators_delete_by_storage(
                     self.context, self.storage_id)
                 db.storage_host_initiators_create(
@@ -452,16 +698,21 @@ class StorageHostInitiatorTask(StorageResourceTask):
             LOG.error(msg)
         else:
             LOG.info("Syncing storage host initiators successful!!!")
+        finally:
+            if written:
+                self.resources_changed()
 
     def remove(self):
         LOG.info('Remove storage host initiators for storage id:{0}'
                  .format(self.storage_id))
         db.storage_host_initiators_delete_by_storage(self.context,
                                                      self.storage_id)
+        self.resources_changed()
 
 
 class StorageHostTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_storage_host_id'
+    RESOURCE_TABLE = 'storage_hosts'
 
     def driver_list_resources(self):
         return self.driver_api.list_storage_hosts(self.context,
@@ -497,6 +748,7 @@ class StorageHostGroupTask(StorageResourceTask):
         """
         LOG.info('Syncing storage host group for storage id:{0}'
                  .format(self.storage_id))
+        written = False
         try:
             # Collect the storage host group list from driver and database.
             # Build relation between host grp and host to be handled here.
@@ -504,7 +756,11 @@ class StorageHostGroupTask(StorageResourceTask):
                 .list_storage_host_groups(self.context, self.storage_id)
             storage_host_groups = storage_hg_obj['storage_host_groups']
             storage_host_rels = storage_hg_obj['storage_host_grp_host_rels']
-            if storage_host_groups:
+            db_rels = db.storage_host_grp_host_rels_get_all(
+                self.context, filters={"storage_id": self.storage_id})
+            if storage_host_groups and self._is_rows_changed(
+                    storage_host_rels, db_rels):
+                written = True
                 db.storage_host_grp_host_rels_delete_by_storage(
                     self.context, self.storage_id)
                 db.storage_host_grp_host_rels_create(
@@ -524,6 +780,8 @@ class StorageHostGroupTask(StorageResourceTask):
                                           len(add_list),
                                           len(delete_id_list),
                                           len(update_list)))
+            written = bool(written or delete_id_list or update_list
+                           or add_list)
             if delete_id_list:
                 db.storage_host_groups_delete(self.context, delete_id_list)
 
@@ -544,6 +802,9 @@ class StorageHostGroupTask(StorageResourceTask):
             LOG.error(msg)
         else:
             LOG.info("Syncing storage host groups successful!!!")
+        finally:
+            if written:
+                self.resources_changed()
 
     def remove(self):
         LOG.info('Remove storage host groups for storage id:{0}'
@@ -551,6 +812,7 @@ class StorageHostGroupTask(StorageResourceTask):
         db.storage_host_grp_host_rels_delete_by_storage(self.context,
                                                         self.storage_id)
         db.storage_host_groups_delete_by_storage(self.context, self.storage_id)
+        self.resources_changed()
 
 
 class PortGroupTask(StorageResourceTask):
@@ -565,6 +827,7 @@ class PortGroupTask(StorageResourceTask):
         """
         LOG.info('Syncing port group for storage id:{0}'
                  .format(self.storage_id))
+        written = False
         try:
             # Collect the port groups from driver and database
             # Build relation between port grp and port to be handled here.
@@ -572,7 +835,11 @@ class PortGroupTask(StorageResourceTask):
                 .list_port_groups(self.context, self.storage_id)
             port_groups = port_groups_obj['port_groups']
             port_group_relation_list = port_groups_obj['port_grp_port_rels']
-            if port_groups:
+            db_rels = db.port_grp_port_rels_get_all(
+                self.context, filters={"storage_id": self.storage_id})
+            if port_groups and self._is_rows_changed(
+                    port_group_relation_list, db_rels):
+                written = True
                 db.port_grp_port_rels_delete_by_storage(
                     self.context, self.storage_id)
                 db.port_grp_port_rels_create(
@@ -591,6 +858,8 @@ class PortGroupTask(StorageResourceTask):
                                           len(add_list),
                                           len(delete_id_list),
                                           len(update_list)))
+            written = bool(written or delete_id_list or update_list
+                           or add_list)
             if delete_id_list:
                 db.port_groups_delete(self.context, delete_id_list)
 
@@ -610,6 +879,9 @@ class PortGroupTask(StorageResourceTask):
             LOG.error(msg)
         else:
             LOG.info("Syncing port groups successful!!!")
+        finally:
+            if written:
+                self.resources_changed()
 
     def remove(self):
         LOG.info('Remove port groups for storage id:{0}'
@@ -617,6 +889,7 @@ class PortGroupTask(StorageResourceTask):
         db.port_grp_port_rels_delete_by_storage(self.context,
                                                 self.storage_id)
         db.port_groups_delete_by_storage(self.context, self.storage_id)
+        self.resources_changed()
 
 
 class VolumeGroupTask(StorageResourceTask):
@@ -631,6 +904,7 @@ class VolumeGroupTask(StorageResourceTask):
         """
         LOG.info('Syncing volume group for storage id:{0}'
                  .format(self.storage_id))
+        written = False
         try:
             # Collect the volume groups from driver and database
             # Build relation between volume grp and volume to be handled here.
@@ -638,7 +912,11 @@ class VolumeGroupTask(StorageResourceTask):
                 .list_volume_groups(self.context, self.storage_id)
             volume_groups = volume_groups_obj['volume_groups']
             volume_groups_rels = volume_groups_obj['vol_grp_vol_rels']
-            if volume_groups:
+            db_rels = db.vol_grp_vol_rels_get_all(
+                self.context, filters={"storage_id": self.storage_id})
+            if volume_groups and self._is_rows_changed(
+                    volume_groups_rels, db_rels):
+                written = True
                 db.vol_grp_vol_rels_delete_by_storage(
                     self.context, self.storage_id)
                 db.vol_grp_vol_rels_create(self.context, volume_groups_rels)
@@ -656,6 +934,8 @@ class VolumeGroupTask(StorageResourceTask):
                                           len(add_list),
                                           len(delete_id_list),
                                           len(update_list)))
+            written = bool(written or delete_id_list or update_list
+                           or add_list)
             if delete_id_list:
                 db.volume_groups_delete(self.context, delete_id_list)
 
@@ -675,16 +955,21 @@ class VolumeGroupTask(StorageResourceTask):
             LOG.error(msg)
         else:
             LOG.info("Syncing volume groups successful!!!")
+        finally:
+            if written:
+                self.resources_changed()
 
     def remove(self):
         LOG.info('Remove volume groups for storage id:{0}'
                  .format(self.storage_id))
         db.vol_grp_vol_rels_delete_by_storage(self.context, self.storage_id)
         db.volume_groups_delete_by_storage(self.context, self.storage_id)
+        self.resources_changed()
 
 
 class MaskingViewTask(StorageResourceTask):
     NATIVE_RESOURCE_ID = 'native_masking_view_id'
+    RESOURCE_TABLE = 'masking_views'
 
     def driver_list_resources(self):
         return self.driver_api.list_masking_views(self.context,
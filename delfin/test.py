@@ -32,6 +32,8 @@ from oslo_messaging import conffixture as messaging_conffixture
 from oslo_utils import uuidutils
 import oslotest.base as base_test
 
+from delfin.alert_manager import alert_source_cache
+from delfin.api import response_cache
 from delfin.common import config  # noqa
 from delfin import coordination
 from delfin.db.sqlalchemy import api as db_api
@@ -86,6 +88,8 @@ class TestCase(base_test.BaseTestCase):
                 db_api,
                 sql_connection=CONF.database.connection)
         self.useFixture(_DB_CACHE)
+        self.addCleanup(response_cache.RESPONSE_CACHE.clear)
+        self.addCleanup(alert_source_cache.ALERT_SOURCE_CACHE.clear)
 
         self.injected = []
         self._services = []
@@ -0,0 +1,55 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measurements shared by the benchmarks.
+"""
+
+import resource
+import sys
+import time
+
+
+def percentile(latencies, ratio):
+    """Percentile of the sorted latencies, e.g. ratio 0.99 for p99."""
+    return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))]
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    return {
+        'count': len(latencies),
+        'total': sum(latencies),
+        'mean': sum(latencies) / len(latencies),
+        'p50': percentile(latencies, 0.5),
+        'p99': percentile(latencies, 0.99),
+    }
+
+
+def measure(func, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.time()
+        func()
+        latencies.append(time.time() - start)
+    return summarize(latencies)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / 1024.0 / 1024.0
+    return peak / 1024.0
@@ -61,6 +61,7 @@ def fake_v3_alert_source():
 def fake_v3_alert_source_list_with_one():
     return [
         {'storage_id': 'abcd-1234-5678',
+         'host': '127.0.0.1',
          'version': 'snmpv3',
          'engine_id': '800000d30300000e112245',
          'username': 'test1',
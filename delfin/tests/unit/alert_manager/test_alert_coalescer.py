@@ -0,0 +1,88 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from delfin import test
+from delfin.alert_manager import alert_coalescer
+
+
+def fake_alert_model(alert_id='1', severity='Major', **kwargs):
+    alert_model = {'storage_id': 'storage_1', 'alert_id': alert_id,
+                   'resource_type': 'Storage', 'location': 'disk_1',
+                   'severity': severity}
+    alert_model.update(kwargs)
+    return alert_model
+
+
+class TestAlertCoalescer(test.TestCase):
+    def setUp(self):
+        super(TestAlertCoalescer, self).setUp()
+        self.now = 1000.0
+        self.mock_object(alert_coalescer.time, 'time',
+                         mock.Mock(side_effect=lambda: self.now))
+        self.coalescer = alert_coalescer.AlertCoalescer()
+
+    def test_coalesce_in_window(self):
+        self.assertEqual(fake_alert_model(),
+                         self.coalescer.add(fake_alert_model()))
+        self.now += 10
+        self.assertIsNone(self.coalescer.add(
+            fake_alert_model(sequence_number=2)))
+        self.assertIsNone(self.coalescer.add(
+            fake_alert_model(sequence_number=3)))
+        # Other severity is another alert
+        self.assertIsNotNone(self.coalescer.add(
+            fake_alert_model(severity='Critical')))
+        self.assertEqual([], self.coalescer.flush())
+
+        self.now += 60
+        self.assertEqual([fake_alert_model(sequence_number=3,
+                                           occurrence_count=3)],
+                         self.coalescer.flush())
+        self.assertEqual([], self.coalescer.flush())
+        # A new window is opened
+        self.assertIsNotNone(self.coalescer.add(fake_alert_model()))
+
+    def test_count_trap(self):
+        trap = {'1.3.6.1.2.1.1.3.0': '100', '1.3.6.1.6.3.1.1.4.1.0': 'x',
+                'storage_id': 'storage_1'}
+        trap_key = self.coalescer.get_trap_key(trap)
+        self.assertFalse(self.coalescer.count_trap(trap_key))
+        self.coalescer.add(fake_alert_model(), trap_key)
+
+        # Resent with another sysUpTime
+        trap['1.3.6.1.2.1.1.3.0'] = '200'
+        self.assertTrue(self.coalescer.count_trap(
+            self.coalescer.get_trap_key(trap)))
+        self.now += 60
+        self.assertFalse(self.coalescer.count_trap(trap_key))
+        self.assertEqual(2, self.coalescer.flush()[0]['occurrence_count'])
+
+    def test_evict(self):
+        self.override_config('alert_coalesce_max_entries', 2)
+        self.coalescer.add(fake_alert_model('1'))
+        self.coalescer.add(fake_alert_model('1'))
+        self.coalescer.add(fake_alert_model('2'))
+        self.coalescer.add(fake_alert_model('3'))
+        self.assertEqual(1, self.coalescer.stats['evicted'])
+        # The evicted alert with duplicates is exported by the next flush
+        self.assertEqual([fake_alert_model('1', occurrence_count=2)],
+                         self.coalescer.flush())
+
+    def test_disabled(self):
+        self.override_config('alert_coalesce_window', 0)
+        self.assertIsNotNone(self.coalescer.add(fake_alert_model()))
+        self.assertIsNotNone(self.coalescer.add(fake_alert_model()))
+        self.assertEqual([], self.coalescer.flush())
@@ -0,0 +1,101 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from delfin import context
+from delfin import db
+from delfin import test
+from delfin.alert_manager import alert_source_cache
+
+ctxt = context.get_admin_context()
+
+ALERT_SOURCES = [
+    {'storage_id': 'storage_1', 'host': '10.0.0.1,10.0.0.2'},
+    {'storage_id': 'storage_2', 'host': '10.0.0.10'},
+    {'storage_id': 'storage_3', 'host': 'array3 10.0.0.30'},
+]
+CONTROLLERS = [
+    {'name': 'controller_a', 'mgmt_ip': '10.0.0.1'},
+    {'name': 'controller_b', 'mgmt_ip': '10.0.0.2'},
+    {'name': 'controller_c', 'mgmt_ip': '10.0.0.1'},
+]
+
+
+class TestAlertSourceCache(test.TestCase):
+    def setUp(self):
+        super(TestAlertSourceCache, self).setUp()
+        self.cache = alert_source_cache.AlertSourceCache()
+        self.mock_object(db, 'alert_source_get_all',
+                         mock.Mock(return_value=ALERT_SOURCES))
+        self.mock_object(db, 'controller_get_all',
+                         mock.Mock(return_value=CONTROLLERS))
+        self.mock_object(db, 'storage_get',
+                         mock.Mock(side_effect=lambda ctxt, storage_id:
+                                   {'id': storage_id}))
+
+    def test_get_alert_sources(self):
+        self.assertEqual([ALERT_SOURCES[0]],
+                         self.cache.get_alert_sources(ctxt, '10.0.0.2'))
+        self.assertEqual([ALERT_SOURCES[1]],
+                         self.cache.get_alert_sources(ctxt, '10.0.0.10'))
+        # Hosts not split by comma are matched as the host~ filter
+        self.assertEqual([ALERT_SOURCES[2]],
+                         self.cache.get_alert_sources(ctxt, '10.0.0.30'))
+        self.assertEqual([], self.cache.get_alert_sources(ctxt, '10.0.0.9'))
+        self.assertEqual([], self.cache.get_alert_sources(ctxt, '10.0.0.9'))
+        self.assertEqual(1, db.alert_source_get_all.call_count)
+
+        self.cache.invalidate_alert_sources()
+        self.cache.get_alert_sources(ctxt, '10.0.0.1')
+        self.assertEqual(2, db.alert_source_get_all.call_count)
+
+    def test_expiration(self):
+        self.cache.get_alert_sources(ctxt, '10.0.0.1')
+        self.cache.get_storage(ctxt, 'storage_1')
+        with mock.patch('time.time', return_value=10 ** 10):
+            self.cache.get_alert_sources(ctxt, '10.0.0.1')
+            self.cache.get_storage(ctxt, 'storage_1')
+        self.assertEqual(2, db.alert_source_get_all.call_count)
+        self.assertEqual(2, db.storage_get.call_count)
+
+        # Disabled, looked up in db every time
+        self.override_config('alert_source_cache_expiration', 0)
+        self.cache.get_alert_sources(ctxt, '10.0.0.1')
+        db.alert_source_get_all.assert_called_with(
+            ctxt, filters={'host~': '10.0.0.1'})
+
+    def test_get_storage(self):
+        self.assertEqual({'id': 'storage_1'},
+                         self.cache.get_storage(ctxt, 'storage_1'))
+        self.cache.get_storage(ctxt, 'storage_1')
+        self.assertEqual(1, db.storage_get.call_count)
+
+        self.cache.invalidate_alert_sources()
+        self.cache.get_storage(ctxt, 'storage_1')
+        self.assertEqual(2, db.storage_get.call_count)
+
+    def test_get_controller_name(self):
+        self.assertEqual('controller_a', self.cache.get_controller_name(
+            ctxt, 'storage_1', '10.0.0.1'))
+        self.assertEqual('controller_b', self.cache.get_controller_name(
+            ctxt, 'storage_1', '10.0.0.2'))
+        self.assertIsNone(self.cache.get_controller_name(
+            ctxt, 'storage_1', '10.0.0.3'))
+        db.controller_get_all.assert_called_once_with(
+            ctxt, filters={'storage_id': 'storage_1'})
+
+        self.cache.invalidate_controllers('storage_1')
+        self.cache.get_controller_name(ctxt, 'storage_1', '10.0.0.1')
+        self.assertEqual(2, db.controller_get_all.call_count)
@@ -0,0 +1,97 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from unittest import mock
+
+from delfin import test
+from delfin.alert_manager import trap_queue
+
+
+class TestTrapQueue(test.TestCase):
+    def setUp(self):
+        super(TestTrapQueue, self).setUp()
+        self.batches = []
+        self.queue = trap_queue.TrapQueue(
+            lambda trap: trap.get('alert'), self.batches.append)
+
+    def test_process_in_order(self):
+        self.override_config('trap_workers', 3)
+        self.queue.start()
+        for i in range(100):
+            source = '10.0.0.%d' % (i % 5)
+            self.assertTrue(self.queue.put(
+                source, {'alert': {'source': source, 'seq': i}}))
+        self.queue.put('10.0.0.9', {})
+        self.queue.stop()
+
+        alerts = [alert for batch in self.batches for alert in batch]
+        self.assertEqual(100, len(alerts))
+        for i in range(5):
+            source = '10.0.0.%d' % i
+            self.assertEqual(list(range(i, 100, 5)),
+                             [alert['seq'] for alert in alerts
+                              if alert['source'] == source])
+        self.assertEqual({'received': 101, 'exported': 100, 'failed': 0,
+                          'queued': 0}, self.queue.get_stats())
+
+    def test_export_in_batches(self):
+        self.override_config('trap_workers', 1)
+        self.override_config('trap_export_batch_size', 4)
+        self.queue.start()
+        # Hold the worker until all the traps are queued
+        started = threading.Event()
+        release = threading.Event()
+
+        def translate(trap):
+            started.set()
+            release.wait()
+            return trap['alert']
+
+        self.queue._translate = translate
+        self.queue.put('10.0.0.1', {'alert': 1})
+        started.wait()
+        for i in range(2, 11):
+            self.queue.put('10.0.0.1', {'alert': i})
+        release.set()
+        self.queue.stop()
+
+        self.assertEqual([[1], [2, 3, 4, 5], [6, 7, 8, 9], [10]],
+                         self.batches)
+
+    def test_drop_when_full(self):
+        self.override_config('trap_workers', 2)
+        self.override_config('trap_queue_size', 4)
+        # Not started, nothing is taken from the queues
+        self.queue._queues = [trap_queue.queue.Queue(maxsize=2)
+                              for _ in range(2)]
+        results = [self.queue.put('10.0.0.1', {}) for _ in range(3)]
+
+        self.assertEqual([True, True, False], results)
+        self.assertEqual({'received': 2, 'dropped': 1, 'queued': 2},
+                         self.queue.get_stats())
+
+    def test_failures(self):
+        self.override_config('trap_workers', 1)
+        export = mock.Mock(side_effect=Exception('export failed'))
+        self.queue = trap_queue.TrapQueue(
+            mock.Mock(side_effect=[Exception('translate failed'), 'alert']),
+            export)
+        self.queue.start()
+        self.queue.put('10.0.0.1', {})
+        self.queue.put('10.0.0.1', {})
+        self.queue.stop()
+
+        self.assertEqual(2, self.queue.get_stats()['failed'])
+        self.assertEqual(0, self.queue.get_stats()['exported'])
@@ -18,6 +18,7 @@ from oslo_utils import importutils
 from pysnmp.carrier.asyncore.dgram import udp
 from pysnmp.entity import engine, config
 
+from delfin import context
 from delfin import exception
 from delfin import test
 from delfin.tests.unit.alert_manager import fakes
@@ -87,6 +88,59 @@ class TrapReceiverTestCase(test.TestCase):
         # Verify that snmp engine transport config is set after _add_transport
         self.assertTrue(get_transport is not None)
 
+    def test_add_transport_shared_port(self):
+        self.override_config('trap_receiver_workers', 2)
+        ports = []
+        for i in range(2):
+            trap_receiver_inst = self._get_trap_receiver()
+            trap_receiver_inst.snmp_engine = engine.SnmpEngine()
+            trap_receiver_inst.trap_receiver_address = '127.0.0.1'
+            # The second worker binds the port of the first one
+            trap_receiver_inst.trap_receiver_port = ports[0] if ports else 0
+            trap_receiver_inst._add_transport()
+            transport = config.getTransport(trap_receiver_inst.snmp_engine,
+                                            udp.domainName)
+            self.addCleanup(transport.closeTransport)
+            ports.append(transport.socket.getsockname()[1])
+        self.assertEqual(ports[0], ports[1])
+
+    @mock.patch('delfin.db.alert_source_get_all')
+    def test_heart_beat_task_spawn_in_one_worker(self, mock_alert_source):
+        self.override_config('trap_receiver_workers', 2)
+        mock_alert_source.return_value = [{'storage_id': 'storage_1'}]
+        trap_receiver_class = importutils.import_class(
+            self.TRAP_RECEIVER_CLASS)
+        workers = [self.trap_receiver,
+                   trap_receiver_class(self.DEF_TRAP_RECV_ADDR,
+                                       self.DEF_TRAP_RECV_PORT)]
+        workers[1].alert_rpc_api = mock.Mock()
+        for worker in workers:
+            self.addCleanup(worker.stop)
+            worker.heart_beat_task_spawn(context.get_admin_context())
+            worker.heart_beat_task_spawn(context.get_admin_context())
+
+        self.assertEqual(2, workers[0].alert_rpc_api.check_snmp_config
+                         .call_count)
+        self.assertFalse(workers[1].alert_rpc_api.check_snmp_config.called)
+
+        # Another worker takes over once the first one is stopped
+        workers[0].stop()
+        workers[1].heart_beat_task_spawn(context.get_admin_context())
+        self.assertTrue(workers[1].alert_rpc_api.check_snmp_config.called)
+
+    @mock.patch('delfin.alert_manager.trap_receiver.LOG')
+    def test_log_trap_stats(self, mock_log):
+        trap_receiver_inst = self._get_trap_receiver()
+        trap_receiver_inst.log_trap_stats(context.get_admin_context())
+        self.assertFalse(mock_log.info.called)
+
+        trap_receiver_inst.trap_queue = mock.Mock()
+        trap_receiver_inst.trap_queue.get_stats.return_value = {'dropped': 1}
+        trap_receiver_inst.log_trap_stats(context.get_admin_context())
+        mock_log.info.assert_called_once_with('Trap queue: %s',
+                                              {'dropped': 1})
+        trap_receiver_inst.trap_queue = None
+
     def test_add_transport_exception(self):
         trap_receiver_inst = self._get_trap_receiver()
         exception_msg = r"int\(\) argument must be a string, " \
@@ -254,6 +308,7 @@ class TrapReceiverTestCase(test.TestCase):
     def test_get_alert_source_by_host_success(self, mock_alert_source_list):
         # alert_source_config = fakes.fake_v3_alert_source()
         expected_alert_source = {'storage_id': 'abcd-1234-5678',
+                                 'host': '127.0.0.1',
                                  'version': 'snmpv3',
                                  'engine_id': '800000d30300000e112245',
                                  'username': 'test1',
@@ -280,3 +335,65 @@ class TrapReceiverTestCase(test.TestCase):
         self.assertRaisesRegex(exception.AlertSourceNotFoundWithHost, "",
                                trap_receiver_inst._get_alert_source_by_host,
                                '127.0.0.1')
+
+    @mock.patch('delfin.db.controller_get_all', mock.Mock(return_value=[]))
+    @mock.patch('delfin.alert_manager.alert_processor.AlertProcessor'
+                '.translate_alert')
+    @mock.patch('delfin.db.alert_source_get_all')
+    def test_cb_fun(self, mock_alert_source_list, mock_translate):
+        mock_alert_source_list.return_value = fakes. \
+            fake_v3_alert_source_list_with_one()
+        trap_receiver_inst = self._get_trap_receiver()
+        trap_receiver_inst.snmp_engine = mock.Mock()
+        trap_receiver_inst.snmp_engine.observer.getExecutionContext \
+            .return_value = {'transportAddress': ('127.0.0.1', 162),
+                             'securityModel': 3}
+        trap_receiver_inst.trap_queue = mock.Mock()
+        trap_receiver_inst._cb_fun(None, None, 'public',
+                                   [('1.3.6.1.2.1.1.3.0', 1234)], None)
+
+        # Only queued in the dispatcher
+        self.assertFalse(mock_translate.called)
+        source_ip, trap = trap_receiver_inst.trap_queue.put.call_args[0]
+        self.assertEqual('127.0.0.1', source_ip)
+
+        mock_translate.return_value = {'alert_id': '1'}
+        self.assertEqual({'alert_id': '1'},
+                         trap_receiver_inst._translate_trap(trap))
+        mock_translate.assert_called_once_with(
+            {'1.3.6.1.2.1.1.3.0': '1234',
+             'transport_address': '127.0.0.1',
+             'storage_id': 'abcd-1234-5678'})
+
+        # The resent trap is coalesced without being translated again
+        self.assertIsNone(trap_receiver_inst._translate_trap(trap))
+        self.assertEqual(1, mock_translate.call_count)
+
+    def test_flush_coalesced_alerts(self):
+        trap_receiver_inst = self._get_trap_receiver()
+        trap_receiver_inst.alert_coalescer = mock.Mock()
+        trap_receiver_inst.alert_coalescer.flush.return_value = [
+            {'alert_id': '1', 'occurrence_count': 5}]
+        trap_receiver_inst.alert_processor = mock.Mock()
+        trap_receiver_inst.flush_coalesced_alerts({})
+        trap_receiver_inst.alert_processor.export_alerts \
+            .assert_called_once_with([{'alert_id': '1',
+                                       'occurrence_count': 5}])
+
+    @mock.patch('delfin.db.alert_source_get_all')
+    def test_get_alert_source_by_host_cached(self, mock_alert_source_list):
+        mock_alert_source_list.return_value = fakes. \
+            fake_v3_alert_source_list_with_one()
+        trap_receiver_inst = self._get_trap_receiver()
+        trap_receiver_inst.snmp_engine = engine.SnmpEngine()
+        trap_receiver_inst._get_alert_source_by_host('127.0.0.1')
+        trap_receiver_inst._get_alert_source_by_host('127.0.0.1')
+        self.assertEqual(1, mock_alert_source_list.call_count)
+
+        # Alert sources changed by the api
+        trap_receiver_inst.sync_snmp_config(
+            {}, snmp_config_to_del={'storage_id': 'abcd-1234-5678',
+                                    'version': 'snmpv3',
+                                    'username': 'test1'})
+        trap_receiver_inst._get_alert_source_by_host('127.0.0.1')
+        self.assertEqual(2, mock_alert_source_list.call_count)
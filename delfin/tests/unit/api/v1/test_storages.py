@@ -320,6 +320,41 @@ class TestStorageController(test.TestCase):
                                self.controller.get_capabilities, req,
                                storage_id)
 
+    def test_get_sync_states(self):
+        self.mock_object(
+            db, 'storage_get',
+            fakes.fake_storages_show)
+        sync_states = [{'id': 'fake_id',
+                        'storage_id': '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6',
+                        'resource_type': 'StorageVolumeTask',
+                        'status': constants.ResourceSyncStatus.SYNCED,
+                        'start_time': None,
+                        'end_time': None}]
+        mock_get_all = self.mock_object(
+            db, 'resource_sync_state_get_all',
+            mock.Mock(return_value=sync_states))
+        req = fakes.HTTPRequest.blank(
+            '/storages/12c2d52f-01bc-41f5-b73f-7abf6f38a2a6/sync-states')
+
+        resp = self.controller.get_sync_states(
+            req, '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6')
+
+        self.assertEqual({'sync_states': sync_states}, resp)
+        self.assertEqual(
+            {'storage_id': '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6'},
+            mock_get_all.call_args[1]['filters'])
+
+    def test_get_sync_states_with_invalid_storage_id(self):
+        self.mock_object(
+            db, 'storage_get',
+            fakes.fake_storage_get_exception)
+        req = fakes.HTTPRequest.blank(
+            '/storages/12c2d52f-01bc-41f5-b73f-7abf6f38a2a6/sync-states')
+
+        self.assertRaises(exception.StorageNotFound,
+                          self.controller.get_sync_states, req,
+                          '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6')
+
     def test_get_capabilities_with_none(self):
         self.mock_object(
             db, 'storage_get',
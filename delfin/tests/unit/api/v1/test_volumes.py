@@ -14,10 +14,13 @@
 
 from unittest import mock
 
+from oslo_serialization import jsonutils
+
 from delfin import db
 from delfin import exception
 from delfin import test
 from delfin.api.v1.volumes import VolumeController
+from delfin.common import sqlalchemyutils
 from delfin.tests.unit.api import fakes
 
 
@@ -77,6 +80,110 @@ class TestVolumeController(test.TestCase):
         }
         self.assertDictEqual(expctd_dict, res_dict)
 
+    def test_list_next_cursor(self):
+        self.mock_object(
+            db, 'volume_get_all',
+            mock.Mock(side_effect=fakes.fake_volume_get_all))
+        req = fakes.HTTPRequest.blank('/volumes?limit=2&sort=name:asc')
+
+        res_dict = self.controller.index(req)
+
+        cursor = sqlalchemyutils.Cursor.decode(res_dict['next_cursor'])
+        self.assertEqual(['name', 'id'], cursor.sort_keys)
+        self.assertEqual(['asc', 'asc'], cursor.sort_dirs)
+        self.assertEqual(['004E0', 'dad84a1f-db8d-49ab-af40-048fc3544c12'],
+                         cursor.values)
+
+        req = fakes.HTTPRequest.blank(
+            '/volumes?limit=2&sort=name:asc&cursor=%s'
+            % res_dict['next_cursor'])
+        res_dict = self.controller.index(req)
+        marker = db.volume_get_all.call_args[0][1]
+        self.assertEqual(cursor.values, marker.values)
+
+        req = fakes.HTTPRequest.blank('/volumes?limit=3')
+        self.assertNotIn('next_cursor', self.controller.index(req))
+
+    def test_list_invalid_cursor(self):
+        req = fakes.HTTPRequest.blank('/volumes?cursor=invalid')
+        self.assertRaises(exception.InvalidInput, self.controller.index, req)
+
+        req = fakes.HTTPRequest.blank('/volumes?cursor=abc&marker=abc')
+        self.assertRaises(exception.InvalidInput, self.controller.index, req)
+
+    def test_list_stream(self):
+        self.mock_object(
+            db, 'resource_get_all_iter',
+            mock.Mock(side_effect=lambda *args: iter(
+                fakes.fake_volume_get_all(None))))
+        self.override_config('api_stream_chunk_size', 1)
+        expected = {'volumes': fakes.fake_volume_get_all(None)}
+
+        req = fakes.HTTPRequest.blank('/volumes?stream=true')
+        res = self.controller.index(req)
+        self.assertEqual('application/json', res.content_type)
+        chunks = list(res.app_iter)
+        # Begin and end of the list, then one chunk per volume
+        self.assertEqual(4, len(chunks))
+        self.assertEqual(expected, jsonutils.loads(b''.join(chunks)))
+        self.assertEqual('volumes', db.resource_get_all_iter.call_args[0][1])
+
+        req = fakes.HTTPRequest.blank('/volumes?limit=10')
+        req.headers['Accept'] = 'application/x-ndjson'
+        res = self.controller.index(req)
+        self.assertEqual('application/x-ndjson', res.content_type)
+        self.assertEqual(expected['volumes'],
+                         [jsonutils.loads(line)
+                          for line in res.body.splitlines()])
+        self.assertEqual(10, db.resource_get_all_iter.call_args[0][3])
+
+        req = fakes.HTTPRequest.blank('/volumes?stream=invalid')
+        self.assertRaises(exception.InvalidInput, self.controller.index, req)
+
+    def test_list_conditional(self):
+        self.mock_object(
+            db, 'volume_get_all',
+            mock.Mock(side_effect=fakes.fake_volume_get_all))
+        self.mock_object(
+            db, 'storage_generations_get',
+            mock.Mock(return_value=[('fake_storage_id', 1, None, False)]))
+
+        req = fakes.HTTPRequest.blank('/volumes?storage_id=fake_storage_id')
+        res_dict = self.controller.index(req)
+        etag = req.environ['delfin.etag']
+        db.storage_generations_get.assert_called_once_with(
+            req.environ['delfin.context'], 'fake_storage_id')
+
+        # Unchanged list is answered from the cache
+        req = fakes.HTTPRequest.blank('/volumes?storage_id=fake_storage_id')
+        self.assertEqual(res_dict, self.controller.index(req))
+        self.assertEqual(etag, req.environ['delfin.etag'])
+        self.assertEqual(1, db.volume_get_all.call_count)
+
+        # Unchanged list known by the client is not sent again
+        req = fakes.HTTPRequest.blank('/volumes?storage_id=fake_storage_id')
+        req.headers['If-None-Match'] = '"%s"' % etag
+        res = self.controller.index(req)
+        self.assertEqual(304, res.status_int)
+        self.assertEqual(etag, res.etag)
+        self.assertEqual(1, db.volume_get_all.call_count)
+
+        # The generation of the storage is increased by a sync
+        db.storage_generations_get.return_value = [
+            ('fake_storage_id', 2, None, False)]
+        req = fakes.HTTPRequest.blank('/volumes?storage_id=fake_storage_id')
+        req.headers['If-None-Match'] = '"%s"' % etag
+        self.assertEqual(res_dict, self.controller.index(req))
+        self.assertNotEqual(etag, req.environ['delfin.etag'])
+        self.assertEqual(2, db.volume_get_all.call_count)
+
+        # Disabled
+        self.override_config('api_response_cache_size', 0)
+        req = fakes.HTTPRequest.blank('/volumes?storage_id=fake_storage_id')
+        self.controller.index(req)
+        self.assertNotIn('delfin.etag', req.environ)
+        self.assertEqual(3, db.volume_get_all.call_count)
+
     def test_list_with_filter(self):
         self.mock_object(
             db, 'volume_get_all',
@@ -32,6 +32,7 @@ def set_defaults(conf):
                      '..')))
     _safe_set_of_opts(conf, 'connection', "sqlite://", group='database')
     _safe_set_of_opts(conf, 'sqlite_synchronous', False)
+    _safe_set_of_opts(conf, 'resource_fingerprint_expiration', 0)
     _API_PASTE_PATH = os.path.abspath(
         os.path.join(CONF.state_path,
                      'etc/delfin/api-paste.ini'))
@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 from unittest import mock
 
+from oslo_db import exception as db_exc
+
 from delfin import context, exception
 from delfin import test
+from delfin.common import sqlalchemyutils
 from delfin.db import api as db_api
 from delfin.db.sqlalchemy import api, models
 from delfin.tests.unit import fake_data, utils
@@ -244,6 +248,213 @@ class TestSIMDBAPI(test.TestCase):
         result = db_api.volumes_create(ctxt, fake_volume)
         assert len(result) == 1
 
+    @mock.patch('delfin.db.sqlalchemy.api.get_session')
+    def test_volumes_bulk_in_chunks(self, mock_session):
+        self.override_config('resource_batch_size', 2, 'database')
+        session = mock_session.return_value
+        volumes = [{'id': 'fake_id_%d' % i} for i in range(5)]
+
+        db_api.volumes_update(ctxt, volumes)
+        self.assertEqual(3, session.bulk_update_mappings.call_count)
+        session.bulk_update_mappings.assert_called_with(models.Volume,
+                                                        volumes[4:])
+
+        result = db_api.volumes_create(ctxt, volumes)
+        self.assertEqual(5, len(result))
+        self.assertEqual(3, session.add_all.call_count)
+
+        session.begin.reset_mock()
+        db_api.volumes_delete(ctxt, [vol['id'] for vol in volumes])
+        self.assertEqual(3, session.begin.call_count)
+
+    def test_resource_digest_get(self):
+        result = db_api.resource_digest_get(
+            ctxt, 'volumes', 'c5c91c98-91aa-40e6-85ac-37a1d3b32bd')
+        self.assertEqual((0, None, None), result)
+
+    def test_storage_sync_status_decrease(self):
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bd'
+        db_api.storage_create(ctxt, {'id': storage_id, 'sync_status': 200})
+        self.assertEqual(1, db_api.storage_sync_status_decrease(
+            ctxt, storage_id, 100))
+        self.assertEqual(1, db_api.storage_sync_status_decrease(
+            ctxt, storage_id, 100))
+        # Storage already synced, sync status is not decreased any more
+        self.assertEqual(0, db_api.storage_sync_status_decrease(
+            ctxt, storage_id, 100))
+        self.assertEqual(
+            0, db_api.storage_get(ctxt, storage_id)['sync_status'])
+
+    def test_task_executors_update(self):
+        for task_id in (1, 2, 3):
+            db_api.task_create(ctxt, {'id': task_id, 'executor': 'node1'})
+        self.assertEqual(2, db_api.task_executors_update(
+            ctxt, {1: 'node2', 3: 'node3'}))
+        self.assertEqual(['node2', 'node1', 'node3'],
+                         [db_api.task_get(ctxt, task_id)['executor']
+                          for task_id in (1, 2, 3)])
+
+        self.override_config('resource_batch_size', 2, group='database')
+        self.assertEqual([1, 3], sorted(
+            task['id'] for task in db_api.tasks_get_by_ids(ctxt, [1, 3, 4])))
+
+    def test_storage_generation(self):
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bd'
+        db_api.storage_create(ctxt, {'id': storage_id})
+        generations = db_api.storage_generations_get(ctxt, storage_id)
+        self.assertEqual([(storage_id, 0)],
+                         [generation[:2] for generation in generations])
+
+        self.assertEqual(1, db_api.storage_generation_increase(ctxt,
+                                                               storage_id))
+        # Deleted storage is still counted, its resources are removed later
+        db_api.storage_delete(ctxt, storage_id)
+        self.assertEqual(1, db_api.storage_generation_increase(ctxt,
+                                                               storage_id))
+        generations = db_api.storage_generations_get(ctxt)
+        self.assertEqual([(storage_id, 2, True)],
+                         [(generation[0], generation[1], generation[3])
+                          for generation in generations])
+        self.assertEqual([], db_api.storage_generations_get(ctxt, 'fake'))
+
+    def test_resource_sync_state(self):
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bd'
+        db_api.resource_sync_state_update(
+            ctxt, storage_id, 'StorageVolumeTask', {'status': 'syncing'})
+        db_api.resource_sync_state_update(
+            ctxt, storage_id, 'StorageVolumeTask', {'status': 'synced'})
+        db_api.resource_sync_state_update(
+            ctxt, storage_id, 'StoragePoolTask', {'status': 'failed'})
+
+        result = db_api.resource_sync_state_get_all(
+            ctxt, sort_keys=['resource_type'], sort_dirs=['asc'],
+            filters={'storage_id': storage_id})
+        self.assertEqual([('StoragePoolTask', 'failed'),
+                          ('StorageVolumeTask', 'synced')],
+                         [(state['resource_type'], state['status'])
+                          for state in result])
+
+        db_api.resource_sync_state_delete_by_storage(ctxt, storage_id)
+        self.assertEqual([], db_api.resource_sync_state_get_all(
+            ctxt, filters={'storage_id': storage_id}))
+
+    def test_resource_sync_state_concurrent_create(self):
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bd'
+        db_api.resource_sync_state_update(
+            ctxt, storage_id, 'StorageVolumeTask', {'status': 'syncing'})
+        # The state of a resource type of a storage is unique
+        session = api.get_session()
+        with session.begin():
+            sync_state_ref = models.ResourceSyncState()
+            sync_state_ref.update({'id': 'fake_sync_state_id',
+                                   'storage_id': storage_id,
+                                   'resource_type': 'StorageVolumeTask'})
+            session.add(sync_state_ref)
+            self.assertRaises(db_exc.DBDuplicateEntry, session.flush)
+            session.rollback()
+
+        update = api._resource_sync_state_update
+
+        def create_in_between(context, storage_id, resource_type, values,
+                              create=True):
+            if create:
+                # Another writer created the state first
+                raise db_exc.DBDuplicateEntry()
+            update(context, storage_id, resource_type, values, create=create)
+
+        with mock.patch.object(api, '_resource_sync_state_update',
+                               side_effect=create_in_between):
+            db_api.resource_sync_state_update(
+                ctxt, storage_id, 'StorageVolumeTask', {'status': 'synced'})
+
+        result = db_api.resource_sync_state_get_all(
+            ctxt, filters={'storage_id': storage_id})
+        self.assertEqual(['synced'], [state['status'] for state in result])
+        db_api.resource_sync_state_delete_by_storage(ctxt, storage_id)
+
+    def test_volume_get_all_cursor(self):
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bd'
+        created_at = datetime.datetime(2022, 1, 1)
+        volumes = [{'id': 'volume_%02d' % i,
+                    'storage_id': storage_id,
+                    'name': 'name_%d' % (i % 4) if i % 5 else None,
+                    'created_at': created_at + datetime.timedelta(
+                        seconds=i // 3)}
+                   for i in range(20)]
+        db_api.volumes_create(ctxt, volumes)
+
+        for sort_keys, sort_dirs in ((['created_at'], ['desc']),
+                                     (['name'], ['asc']),
+                                     (['name'], ['desc'])):
+            expected = [volume['id'] for volume in db_api.volume_get_all(
+                ctxt, sort_keys=sort_keys, sort_dirs=sort_dirs)]
+            self.assertEqual(20, len(expected))
+
+            got = []
+            marker = None
+            while True:
+                page = db_api.volume_get_all(
+                    ctxt, marker=marker, limit=6, sort_keys=sort_keys,
+                    sort_dirs=sort_dirs)
+                got.extend(volume['id'] for volume in page)
+                if len(page) < 6:
+                    break
+                marker = sqlalchemyutils.Cursor.decode(
+                    sqlalchemyutils.Cursor.from_item(
+                        page[-1], sort_keys + ['id'],
+                        sort_dirs * 2).encode())
+            self.assertEqual(expected, got)
+
+            # The id of the last item is still accepted as marker
+            page = db_api.volume_get_all(
+                ctxt, marker=expected[5], limit=6, sort_keys=sort_keys,
+                sort_dirs=sort_dirs)
+            self.assertEqual(expected[6:12], [volume['id']
+                                              for volume in page])
+
+    def test_resource_get_all_iter(self):
+        self.override_config('stream_batch_size', 3, group='database')
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bd'
+        db_api.volumes_create(ctxt, [{'id': 'volume_%02d' % i,
+                                      'storage_id': storage_id,
+                                      'name': 'name_%d' % (i % 4)}
+                                     for i in range(10)])
+
+        expected = [volume['id'] for volume in db_api.volume_get_all(
+            ctxt, sort_keys=['name'], sort_dirs=['asc'],
+            filters={'storage_id': storage_id})]
+        volumes = db_api.resource_get_all_iter(
+            ctxt, 'volumes', sort_keys=['name'], sort_dirs=['asc'],
+            filters={'storage_id': storage_id})
+        self.assertEqual(expected, [volume['id'] for volume in volumes])
+
+        self.assertEqual([], list(db_api.resource_get_all_iter(
+            ctxt, 'volumes', filters={'invalid_filter': 'abc'})))
+        self.assertRaises(exception.InvalidInput,
+                          db_api.resource_get_all_iter, ctxt, 'invalid')
+        self.assertRaises(exception.InvalidInput,
+                          db_api.resource_get_all_iter, ctxt, 'volumes',
+                          sort_keys=['invalid'], sort_dirs=['asc'])
+
+    def test_resource_get_all_iter_invalid_query(self):
+        session = api.get_session()
+        self.mock_object(session, 'close', mock.Mock())
+        self.mock_object(api, 'get_session', mock.Mock(return_value=session))
+        self.assertRaises(exception.InvalidInput,
+                          db_api.resource_get_all_iter, ctxt, 'volumes',
+                          sort_keys=['invalid'], sort_dirs=['asc'])
+        # The session is closed when the query can not be built
+        session.close.assert_called_once_with()
+
+    def test_volume_get_all_invalid_cursor(self):
+        cursor = sqlalchemyutils.Cursor(['name', 'id'], ['asc', 'asc'],
+                                        ['name_1', 'volume_01'])
+        self.assertRaises(exception.InvalidInput, db_api.volume_get_all,
+                          ctxt, marker=cursor, sort_keys=['created_at'],
+                          sort_dirs=['asc'])
+        self.assertRaises(exception.InvalidInput,
+                          sqlalchemyutils.Cursor.decode, 'invalid')
+
     @mock.patch('delfin.db.sqlalchemy.api.get_session')
     def test_volume_create(self, mock_session):
         fake_volume = models.Volume()
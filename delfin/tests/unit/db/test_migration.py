@@ -0,0 +1,74 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlalchemy as sa
+from alembic import autogenerate
+from alembic import migration as alembic_migration
+
+from delfin import test
+from delfin.db import migration
+from delfin.db.sqlalchemy import models
+
+
+class TestMigration(test.TestCase):
+
+    def setUp(self):
+        super(TestMigration, self).setUp()
+        self.engine = sa.create_engine('sqlite://')
+        self.connection = self.engine.connect()
+        self.addCleanup(self.engine.dispose)
+        self.addCleanup(self.connection.close)
+
+    def _get_indexes(self, table):
+        return [index['name'] for index
+                in sa.inspect(self.connection).get_indexes(table)]
+
+    def test_db_sync(self):
+        migration.db_sync(connection=self.connection)
+
+        self.assertEqual('004', migration.db_version(self.connection))
+        context = alembic_migration.MigrationContext.configure(
+            self.connection, opts={'compare_type': False})
+        diff = autogenerate.compare_metadata(context, models.BASE.metadata)
+        self.assertEqual([], diff)
+
+    def test_db_sync_indexes(self):
+        migration.db_sync(version='001', connection=self.connection)
+        self.assertEqual('001', migration.db_version(self.connection))
+        self.assertEqual([], self._get_indexes('volumes'))
+
+        migration.db_sync(connection=self.connection)
+        self.assertEqual(['ix_volumes_created_at_id',
+                          'ix_volumes_storage_native'],
+                         sorted(self._get_indexes('volumes')))
+        self.assertEqual(['ix_tasks_executor_deleted', 'ix_tasks_storage_id'],
+                         sorted(self._get_indexes('tasks')))
+
+    def test_db_sync_existing_tables(self):
+        # Tables created by register_db before the migrations
+        metadata = sa.MetaData()
+        sa.Table('volumes', metadata,
+                 sa.Column('created_at', sa.DateTime),
+                 sa.Column('updated_at', sa.DateTime),
+                 sa.Column('id', sa.String(36), primary_key=True),
+                 sa.Column('storage_id', sa.String(36)),
+                 sa.Column('native_volume_id', sa.String(255)))
+        metadata.create_all(self.connection)
+
+        migration.db_sync(connection=self.connection)
+        self.assertEqual('004', migration.db_version(self.connection))
+        self.assertEqual(['ix_volumes_created_at_id',
+                          'ix_volumes_storage_native'],
+                         sorted(self._get_indexes('volumes')))
+        self.assertTrue(sa.inspect(self.connection).has_table('storages'))
@@ -218,6 +218,7 @@ class TestVMAXStorageDriver(TestCase):
         self.assertIn('Exception from Storage Backend',
                       str(exc.exception))
 
+    @mock.patch.object(VMaxRest, 'get_volume_details_list')
     @mock.patch.object(VMaxRest, 'get_system_capacity')
     @mock.patch.object(VMaxRest, 'get_storage_group')
     @mock.patch.object(VMaxRest, 'get_volume')
@@ -227,11 +228,12 @@ class TestVMAXStorageDriver(TestCase):
     @mock.patch.object(VMaxRest, 'get_unisphere_version')
     def test_list_volumes(self, mock_unisphere_version,
                           mock_version, mock_array,
-                          mock_vols, mock_vol, mock_sg, mock_capacity):
+                          mock_vols, mock_vol, mock_sg, mock_capacity,
+                          mock_details):
         expected = \
             [
                 {
-                    'name': 'volume_1',
+                    'name': '00001',
                     'storage_id': '12345',
                     'description': "Dell EMC VMAX 'thin device' volume",
                     'type': 'thin',
@@ -245,7 +247,7 @@ class TestVMAXStorageDriver(TestCase):
                     'compressed': True
                 },
                 {
-                    'name': 'volume_2:id',
+                    'name': '00002:id',
                     'storage_id': '12345',
                     'description': "Dell EMC VMAX 'thin device' volume",
                     'type': 'thin',
@@ -304,10 +306,12 @@ class TestVMAXStorageDriver(TestCase):
         mock_version.return_value = ['V9.0.2.7', '90']
         mock_unisphere_version.return_value = ['V9.0.2.7', '90']
         mock_array.return_value = {'symmetrixId': ['00112233']}
-        mock_vols.side_effect = [['volume_1', 'volume_2', 'volume_3']]
         mock_vol.side_effect = [volumes, volumes1, volumes2]
         mock_sg.side_effect = [storage_group_info]
         mock_capacity.return_value = default_srps
+        mock_details.return_value = [{'volumeId': '00001'},
+                                     {'volumeId': '00002'},
+                                     {'volumeId': '00003'}]
 
         driver = VMAXStorageDriver(**kwargs)
         self.assertEqual(driver.storage_id, "12345")
@@ -317,8 +321,21 @@ class TestVMAXStorageDriver(TestCase):
         ret = driver.list_volumes(context)
         self.assertDictEqual(ret[0], expected[0])
         self.assertDictEqual(ret[1], expected[1])
+        # The volume ids of the listing are reused
+        self.assertEqual(0, mock_vols.call_count)
+
+        # Volume details listed in bulk, the volumes are not got one by one
+        mock_details.return_value = [volumes, volumes1, volumes2]
+        mock_vols.reset_mock()
+        mock_vol.reset_mock()
+        mock_sg.side_effect = [storage_group_info]
+        ret = driver.list_volumes(context)
+        self.assertDictEqual(ret[0], expected[0])
+        self.assertDictEqual(ret[1], expected[1])
+        self.assertFalse(mock_vols.called)
+        self.assertFalse(mock_vol.called)
+        mock_details.return_value = [{'volumeId': '00001'}]
 
-        mock_vols.side_effect = [['volume_1']]
         mock_vol.side_effect = [volumes]
         mock_sg.side_effect = [exception.StorageBackendException]
         with self.assertRaises(Exception) as exc:
@@ -327,7 +344,6 @@ class TestVMAXStorageDriver(TestCase):
         self.assertIn('Exception from Storage Backend',
                       str(exc.exception))
 
-        mock_vols.side_effect = [['volume_1']]
         mock_vol.side_effect = [exception.StorageBackendException]
         mock_sg.side_effect = [storage_group_info]
         with self.assertRaises(Exception) as exc:
@@ -336,7 +352,7 @@ class TestVMAXStorageDriver(TestCase):
         self.assertIn('Exception from Storage Backend',
                       str(exc.exception))
 
-        mock_vols.side_effect = [exception.StorageBackendException]
+        mock_details.side_effect = [exception.StorageBackendException]
         mock_vol.side_effect = [volumes]
         mock_sg.side_effect = [storage_group_info]
         with self.assertRaises(Exception) as exc:
@@ -1266,6 +1282,26 @@ class TestVMAXStorageDriver(TestCase):
         driver.client.rest.request('/session', 'GET')
         self.assertEqual(driver.client.uni_version, '90')
 
+    @mock.patch.object(VMaxRest, 'get_resource')
+    def test_get_volume_details_list(self, mock_resource):
+        rest = VMaxRest()
+        mock_resource.return_value = [{'volumeId': '00001', 'cap_mb': 100}]
+        self.assertEqual([{'volumeId': '00001', 'cap_mb': 100}],
+                         rest.get_volume_details_list(
+                             '00112233', '90', {'data_volume': 'false'}))
+        self.assertEqual({'data_volume': 'false', 'details': 'true'},
+                         mock_resource.call_args[1]['params'])
+
+        # Unisphere lists the volume ids only
+        mock_resource.return_value = [{'volumeId': '00001'}]
+        self.assertEqual([{'volumeId': '00001'}],
+                         rest.get_volume_details_list(
+                             '00112233', '90', {'data_volume': 'false'}))
+
+        mock_resource.return_value = None
+        self.assertEqual([], rest.get_volume_details_list(
+            '00112233', '90', {'data_volume': 'false'}))
+
     @mock.patch.object(VMaxRest, 'get_array_detail')
     @mock.patch.object(VMaxRest, 'get_uni_version')
     @mock.patch.object(VMaxRest, 'get_unisphere_version')
@@ -19,6 +19,7 @@ from requests.sessions import Session
 
 from delfin import exception
 from delfin.common import config # noqa
+from delfin.drivers.huawei.oceanstor import consts
 from delfin.drivers.huawei.oceanstor.rest_client import RestClient
 
 
@@ -360,6 +361,106 @@ class TestOceanStorRestClient(TestCase):
         self.assertDictEqual(metrics[0].labels, expected_label)
         self.assertListEqual(list(metrics[0].values.values()), [12])
 
+    @mock.patch.object(RestClient, 'get_all_volumes')
+    @mock.patch.object(RestClient, 'paginated_call')
+    @mock.patch.object(RestClient, 'login')
+    def test_get_volume_metrics_in_bulk(self, mock_login, mock_call,
+                                        mock_volumes):
+        mock_login.return_value = None
+        mock_call.return_value = [{'CMO_STATISTIC_UUID': '11:1',
+                                   'CMO_STATISTIC_DATA_LIST': '12,25',
+                                   'CMO_STATISTIC_TIMESTAMP': 0},
+                                  {'CMO_STATISTIC_UUID': '11:2',
+                                   'CMO_STATISTIC_DATA_LIST': '13,25',
+                                   'CMO_STATISTIC_TIMESTAMP': 0}]
+        mock_volumes.return_value = [
+            {'ID': '1', 'TYPE': '11', 'NAME': 'volume1'},
+            {'ID': '2', 'TYPE': '11', 'NAME': 'volume2'}
+        ]
+        kwargs = ACCESS_INFO
+        rest_client = RestClient(**kwargs)
+        metrics = rest_client.get_volume_metrics(
+            '', {'iops': {'unit': 'IOPS'}})
+        mock_call.assert_called_once_with(
+            "/performace_statistic/cur_statistic_data",
+            None, 'GET', log_filter_flag=True,
+            params='CMO_STATISTIC_UUID=11:1,11:2&'
+                   'CMO_STATISTIC_DATA_ID_LIST=22&timeConversion=0&'
+        )
+        self.assertTrue(rest_client.batch_metrics_supported)
+        self.assertEqual(['volume1', 'volume2'],
+                         [m.labels['resource_name'] for m in metrics])
+        self.assertEqual([[12], [13]],
+                         [list(m.values.values()) for m in metrics])
+
+        # Metrics without uuid can't be told apart, query one by one
+        rest_client.batch_metrics_supported = None
+        mock_call.reset_mock()
+        mock_call.return_value = [{'CMO_STATISTIC_DATA_LIST': '12,25',
+                                   'CMO_STATISTIC_TIMESTAMP': 0}]
+        metrics = rest_client.get_volume_metrics(
+            '', {'iops': {'unit': 'IOPS'}})
+        self.assertEqual(3, mock_call.call_count)
+        self.assertFalse(rest_client.batch_metrics_supported)
+        self.assertEqual(['volume1', 'volume2'],
+                         [m.labels['resource_name'] for m in metrics])
+
+        # A failed bulk query is retried one by one, but doesn't turn off
+        # the bulk queries
+        rest_client.batch_metrics_supported = None
+        mock_call.reset_mock()
+        mock_call.side_effect = [exception.StorageBackendException('error'),
+                                 [{'CMO_STATISTIC_DATA_LIST': '12,25',
+                                   'CMO_STATISTIC_TIMESTAMP': 0}],
+                                 [{'CMO_STATISTIC_DATA_LIST': '13,25',
+                                   'CMO_STATISTIC_TIMESTAMP': 0}]]
+        metrics = rest_client.get_volume_metrics(
+            '', {'iops': {'unit': 'IOPS'}})
+        self.assertEqual(3, mock_call.call_count)
+        self.assertIsNone(rest_client.batch_metrics_supported)
+        self.assertEqual([[12], [13]],
+                         [list(m.values.values()) for m in metrics])
+
+        # An array answering the first uuid only doesn't support bulk
+        # queries, the others are queried one by one
+        rest_client.batch_metrics_supported = None
+        mock_call.reset_mock()
+        mock_call.side_effect = [[{'CMO_STATISTIC_UUID': '11:1',
+                                   'CMO_STATISTIC_DATA_LIST': '12,25',
+                                   'CMO_STATISTIC_TIMESTAMP': 0}],
+                                 [{'CMO_STATISTIC_DATA_LIST': '13,25',
+                                   'CMO_STATISTIC_TIMESTAMP': 0}]]
+        metrics = rest_client.get_volume_metrics(
+            '', {'iops': {'unit': 'IOPS'}})
+        self.assertEqual(2, mock_call.call_count)
+        self.assertIn('CMO_STATISTIC_UUID=11:2&',
+                      mock_call.call_args[1]['params'])
+        self.assertFalse(rest_client.batch_metrics_supported)
+        self.assertEqual([[12], [13]],
+                         [list(m.values.values()) for m in metrics])
+
+    @mock.patch.object(RestClient, 'do_call')
+    @mock.patch.object(RestClient, 'login')
+    def test_call_relogin_once(self, mock_login, mock_do_call):
+        mock_login.return_value = 'fake_device_id'
+        rest_client = RestClient(**ACCESS_INFO)
+        unauthorized = {'error': {
+            'code': consts.ERROR_UNAUTHORIZED_TO_SERVER}}
+        succeeded = {'error': {'code': 0}, 'data': {}}
+
+        mock_login.reset_mock()
+        mock_do_call.side_effect = [unauthorized, succeeded]
+        generation = rest_client.session_generation
+        self.assertEqual(succeeded, rest_client.call('/system/', None, 'GET'))
+        self.assertEqual(1, mock_login.call_count)
+
+        # Another request logged in since this one was sent, it's retried
+        # on the new session without logging in again
+        rest_client.session_generation += 1
+        rest_client.device_id = 'fake_device_id'
+        self.assertEqual('fake_device_id', rest_client.relogin(generation))
+        self.assertEqual(1, mock_login.call_count)
+
     @mock.patch.object(RestClient, 'get_all_controllers')
     @mock.patch.object(RestClient, 'paginated_call')
     @mock.patch.object(RestClient, 'login')
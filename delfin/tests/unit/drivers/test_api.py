@@ -357,6 +357,17 @@ class TestDriverAPI(TestCase):
         self.assertTrue('resource_metrics' in capabilities)
         driver_manager.assert_called_once()
 
+    @mock.patch.object(FakeStorageDriver, 'get_latest_perf_timestamp')
+    @mock.patch('delfin.drivers.manager.DriverManager.get_driver')
+    def test_get_latest_perf_timestamp(self, driver_manager, mock_fake):
+        driver_manager.return_value = FakeStorageDriver()
+        mock_fake.return_value = 1644221400000
+        timestamp = API().get_latest_perf_timestamp(context, '12345')
+
+        self.assertEqual(1644221400000, timestamp)
+        driver_manager.assert_called_once()
+        mock_fake.assert_called_once()
+
     @mock.patch.object(FakeStorageDriver, 'list_storage_host_initiators')
     @mock.patch('delfin.drivers.manager.DriverManager.get_driver')
     def test_list_storage_host_initiators(self, driver_manager, mock_fake):
@@ -0,0 +1,71 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from delfin import context
+from delfin import test
+from delfin.common import constants
+from delfin.drivers import fake_storage
+
+ctxt = context.get_admin_context()
+
+
+class TestFakeStorageDriver(test.TestCase):
+    def setUp(self):
+        super(TestFakeStorageDriver, self).setUp()
+        self.override_config('fake_api_time_range', '0-0',
+                             group='fake_driver')
+        self.override_config('fake_volume_range', '600-600',
+                             group='fake_driver')
+        self.override_config('fake_seed', 1, group='fake_driver')
+
+    def test_seeded_resources(self):
+        driver = fake_storage.FakeStorageDriver(storage_id='storage_1')
+        same_driver = fake_storage.FakeStorageDriver(storage_id='storage_1')
+        other_driver = fake_storage.FakeStorageDriver(storage_id='storage_2')
+
+        volumes = driver.list_volumes(ctxt)
+        self.assertEqual(600, len(volumes))
+        self.assertEqual(volumes, same_driver.list_volumes(ctxt))
+        self.assertNotEqual(volumes, other_driver.list_volumes(ctxt))
+        self.assertEqual(driver.list_ports(ctxt),
+                         same_driver.list_ports(ctxt))
+
+    def test_seeded_resources_of_consecutive_syncs(self):
+        driver = fake_storage.FakeStorageDriver(storage_id='storage_1')
+        same_driver = fake_storage.FakeStorageDriver(storage_id='storage_1')
+
+        # Each list call draws the same data, whatever was called before
+        ports = driver.list_ports(ctxt)
+        driver.list_storage_pools(ctxt)
+        self.assertEqual(ports, driver.list_ports(ctxt))
+        self.assertEqual(driver.list_storage_pools(ctxt),
+                         same_driver.list_storage_pools(ctxt))
+        self.assertEqual(driver.get_storage(ctxt)['total_capacity'],
+                         driver.get_storage(ctxt)['total_capacity'])
+
+    def test_perf_metrics_of_resources(self):
+        driver = fake_storage.FakeStorageDriver(storage_id='storage_1')
+        resource_metrics = driver.get_capabilities(ctxt)['resource_metrics']
+        metrics = driver.collect_perf_metrics(
+            ctxt, 'storage_1',
+            {constants.ResourceType.VOLUME:
+             resource_metrics[constants.ResourceType.VOLUME]},
+            0, 5 * 60 * 1000)
+
+        resource_ids = set(metric.labels['resource_id'] for metric in metrics)
+        self.assertEqual(600, len(resource_ids))
+        self.assertEqual(
+            600 * len(resource_metrics[constants.ResourceType.VOLUME]),
+            len(metrics))
+        self.assertEqual(5, len(metrics[0].values))
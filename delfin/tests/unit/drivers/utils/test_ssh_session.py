@@ -0,0 +1,214 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+import eventlet
+import paramiko
+
+from delfin import test
+from delfin.drivers.utils import ssh_client
+from delfin.drivers.utils import ssh_session
+
+ACCESS_INFO = {
+    'ssh': {
+        'host': '110.143.132.231',
+        'port': 22,
+        'username': 'user',
+        'password': 'cGFzc3dvcmQ=',
+    }
+}
+
+
+def fake_ssh(active=True):
+    ssh = mock.Mock()
+    transport = mock.Mock(spec=paramiko.Transport)
+    transport.is_active.return_value = active
+    ssh.get_transport.return_value = transport
+    return ssh
+
+
+class TestSSHSessionManager(test.TestCase):
+
+    def setUp(self):
+        super(TestSSHSessionManager, self).setUp()
+        self.manager = ssh_session.SSHSessionManager()
+        self.connect = mock.Mock(side_effect=lambda: fake_ssh())
+
+    def test_reuse_session(self):
+        ssh = self.manager.acquire('array', self.connect)
+        self.manager.release(ssh)
+        self.assertIs(ssh, self.manager.acquire('array', self.connect))
+        self.assertEqual(1, self.connect.call_count)
+        self.assertEqual(1, self.manager.get_stats()['reused'])
+
+    def test_max_channels(self):
+        self.override_config('ssh_session_max_channels', 2)
+        ssh_list = [self.manager.acquire('array', self.connect)
+                    for _ in range(3)]
+        self.assertIs(ssh_list[0], ssh_list[1])
+        self.assertIsNot(ssh_list[0], ssh_list[2])
+        self.assertEqual(2, self.connect.call_count)
+        stats = self.manager.get_stats()
+        self.assertEqual(2, stats['sessions'])
+        self.assertEqual(3, stats['channels'])
+
+    def test_dead_session(self):
+        ssh = self.manager.acquire('array', self.connect)
+        self.manager.release(ssh)
+        ssh.get_transport.return_value.is_active.return_value = False
+        self.assertIsNot(ssh, self.manager.acquire('array', self.connect))
+        ssh.close.assert_called_once_with()
+
+        # Broken session is not reused
+        ssh = self.manager.acquire('array', self.connect)
+        self.manager.release(ssh, discard=True)
+        self.assertIsNot(ssh, self.manager.acquire('array', self.connect))
+
+    def test_liveness_probe(self):
+        self.override_config('ssh_session_liveness_interval', 0)
+        ssh = self.manager.acquire('array', self.connect)
+        self.manager.release(ssh)
+        ssh.get_transport.return_value.send_ignore.side_effect = \
+            EOFError()
+        self.assertIsNot(ssh, self.manager.acquire('array', self.connect))
+
+    def test_evict_idle_sessions(self):
+        self.override_config('ssh_session_idle_timeout', 0)
+        ssh = self.manager.acquire('array', self.connect)
+        self.manager.release(ssh)
+        ssh_session_obj = self.manager._sessions['array'][0]
+        ssh_session_obj.last_used -= 1
+
+        self.manager.acquire('other_array', self.connect)
+        ssh.close.assert_called_once_with()
+        self.assertEqual(1, self.manager.get_stats()['evicted'])
+
+    def test_connect_failed(self):
+        self.override_config('ssh_session_max_per_array', 1)
+        self.override_config('ssh_session_max_channels', 1)
+        self.connect.side_effect = paramiko.SSHException()
+        self.assertRaises(paramiko.SSHException,
+                          self.manager.acquire, 'array', self.connect)
+        # The slot of the failed connection is released
+        self.connect.side_effect = lambda: fake_ssh()
+        self.manager.acquire('array', self.connect)
+
+    def test_concurrent_connect(self):
+        self.override_config('ssh_session_max_per_array', 3)
+        self.override_config('ssh_session_max_channels', 4)
+
+        def slow_connect():
+            eventlet.sleep(0.01)
+            return fake_ssh()
+
+        self.connect.side_effect = slow_connect
+        pool = eventlet.GreenPool()
+        ssh_list = list(pool.imap(
+            lambda _: self.manager.acquire('array', self.connect),
+            range(12)))
+
+        # The callers beyond the sessions of the array wait for a channel
+        # instead of connecting sessions of their own
+        self.assertEqual(3, self.connect.call_count)
+        self.assertEqual(3, len(set(map(id, ssh_list))))
+        stats = self.manager.get_stats()
+        self.assertEqual(3, stats['sessions'])
+        self.assertEqual(12, stats['channels'])
+
+    def test_concurrent_connect_failed(self):
+        self.override_config('ssh_session_max_per_array', 1)
+        connected = []
+
+        def failing_connect():
+            eventlet.sleep(0.01)
+            if not connected:
+                connected.append(None)
+                raise paramiko.SSHException()
+            return fake_ssh()
+
+        self.connect.side_effect = failing_connect
+        pool = eventlet.GreenPool()
+        threads = [pool.spawn(self.manager.acquire, 'array', self.connect)
+                   for _ in range(3)]
+        self.assertRaises(paramiko.SSHException, threads[0].wait)
+        # A waiting caller connects in place of the failed one
+        ssh_list = [thread.wait() for thread in threads[1:]]
+        self.assertIs(ssh_list[0], ssh_list[1])
+        self.assertEqual(2, self.connect.call_count)
+
+
+class TestSSHClientSession(test.TestCase):
+
+    def setUp(self):
+        super(TestSSHClientSession, self).setUp()
+        manager = ssh_session.SSHSessionManager()
+        self.mock_object(ssh_session, 'SESSION_MANAGER', manager)
+
+    @mock.patch.object(paramiko, 'SSHClient')
+    def test_do_exec(self, mock_ssh):
+        ssh = fake_ssh()
+        ssh.exec_command.return_value = (
+            None, mock.Mock(**{'read.return_value': b'result'}),
+            mock.Mock(**{'read.return_value': b''}))
+        mock_ssh.return_value = ssh
+
+        client = ssh_client.SSHClient(reuse_session=True, **ACCESS_INFO)
+        self.assertEqual('result', client.do_exec('lssystem'))
+        self.assertEqual('result', client.do_exec('lssystem'))
+        self.assertEqual(1, ssh.connect.call_count)
+        ssh.close.assert_not_called()
+
+        # Sessions are shared with the pools connecting in the same way
+        pool = ssh_client.SSHPool(**ACCESS_INFO)
+        self.assertEqual(client._session_key(), pool._session_key())
+
+    @mock.patch.object(paramiko, 'SSHClient')
+    def test_do_exec_without_reuse(self, mock_ssh):
+        self.override_config('ssh_session_reuse', False)
+        ssh = mock_ssh.return_value
+        ssh.exec_command.return_value = (
+            None, mock.Mock(**{'read.return_value': b'result'}),
+            mock.Mock(**{'read.return_value': b''}))
+
+        client = ssh_client.SSHClient(reuse_session=True, **ACCESS_INFO)
+        self.assertEqual('result', client.do_exec('lssystem'))
+        self.assertEqual('result', client.do_exec('lssystem'))
+        self.assertEqual(2, ssh.connect.call_count)
+        self.assertEqual(2, ssh.close.call_count)
+
+    @mock.patch.object(paramiko, 'SSHClient')
+    def test_do_exec_not_opted_in(self, mock_ssh):
+        ssh = mock_ssh.return_value
+        ssh.exec_command.return_value = (
+            None, mock.Mock(**{'read.return_value': b'result'}),
+            mock.Mock(**{'read.return_value': b''}))
+
+        # The clients connect for each command unless they opt in
+        client = ssh_client.SSHClient(**ACCESS_INFO)
+        self.assertEqual('result', client.do_exec('lssystem'))
+        self.assertEqual('result', client.do_exec('lssystem'))
+        self.assertEqual(2, ssh.connect.call_count)
+        self.assertEqual(2, ssh.close.call_count)
+
+    def test_pool_reuses_session(self):
+        # The pools keep their own connections unless they opt in
+        self.assertFalse(ssh_client.SSHPool(**ACCESS_INFO).reuses_session())
+
+        class SharedSSHPool(ssh_client.SSHPool):
+            REUSE_SESSION = True
+
+        pool = SharedSSHPool(**ACCESS_INFO)
+        self.assertTrue(pool.reuses_session())
+        self.override_config('ssh_session_reuse', False)
+        self.assertFalse(pool.reuses_session())
@@ -0,0 +1,70 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import TestCase, mock
+
+from kafka import errors as kafka_errors
+
+from delfin.common.constants import metric_struct
+from delfin.exporter.kafka import kafka
+
+fake_metrics = [metric_struct(name='throughput',
+                              labels={'storage_id': '12345',
+                                      'resource_type': 'storage',
+                                      'resource_id': 'storage0',
+                                      'type': 'RAW', 'unit': 'MB/s'},
+                              values={1622808000000: 61.9388895680357}),
+                metric_struct(name='iops',
+                              labels={'storage_id': '12345',
+                                      'resource_type': 'volume',
+                                      'resource_id': 'volume0',
+                                      'type': 'RAW', 'unit': 'IOPS'},
+                              values={1622808000000: 100.0})]
+
+
+class TestKafkaExporter(TestCase):
+
+    def setUp(self):
+        kafka.close_producer()
+        self.addCleanup(kafka.close_producer)
+
+    @mock.patch.object(kafka, 'KafkaProducer')
+    def test_push_to_kafka(self, mock_producer):
+        kafka_obj = kafka.KafkaExporter()
+        kafka_obj.push_to_kafka(fake_metrics)
+        kafka_obj.push_to_kafka(fake_metrics)
+
+        # One producer is shared by all the pushes
+        self.assertEqual(1, mock_producer.call_count)
+        producer = mock_producer.return_value
+        self.assertEqual(4, producer.send.call_count)
+        producer.send.assert_any_call(
+            'delfin-kafka', key='12345/volume/volume0',
+            value={'name': 'iops',
+                   'labels': fake_metrics[1].labels,
+                   'values': fake_metrics[1].values})
+
+        kafka.close_producer()
+        producer.flush.assert_called_once_with(timeout=10)
+        producer.close.assert_called_once_with(timeout=10)
+
+    @mock.patch.object(kafka, 'KafkaProducer')
+    def test_push_to_kafka_buffer_full(self, mock_producer):
+        producer = mock_producer.return_value
+        producer.send.side_effect = kafka_errors.KafkaTimeoutError()
+        dropped = kafka.STATS.dropped
+
+        kafka.KafkaExporter().push_to_kafka(fake_metrics)
+        self.assertEqual(dropped + 2, kafka.STATS.dropped)
+        # The records after the first one timed out are not sent
+        self.assertEqual(1, producer.send.call_count)
@@ -0,0 +1,85 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import TestCase, mock
+
+import requests
+
+from delfin.exporter.prometheus import alert_manager
+
+fake_alerts = [{'alert_id': str(i), 'severity': 'Major',
+                'storage_id': '12345', 'description': 'alert %d' % i}
+               for i in range(5)]
+
+
+class TestPrometheusAlertExporter(TestCase):
+
+    def setUp(self):
+        alert_manager.close_session()
+        self.addCleanup(alert_manager.close_session)
+        alert_manager.STATS.clear()
+        session_patcher = mock.patch.object(alert_manager.requests,
+                                            'Session')
+        self.session = session_patcher.start().return_value
+        self.addCleanup(session_patcher.stop)
+        self.session.post.return_value = mock.Mock(status_code=200)
+
+    def _posted_alert_ids(self, call):
+        return [alert['labels']['alert_id'] for alert in call[1]['json']]
+
+    def test_push_prometheus_alert(self):
+        exporter = alert_manager.PrometheusAlertExporter()
+        exporter.push_prometheus_alert(fake_alerts[:2])
+        exporter.push_prometheus_alert(fake_alerts[2:3] + [
+            dict(fake_alerts[3], occurrence_count=4)])
+
+        # Each post carries only the new alerts on the same session
+        calls = self.session.post.call_args_list
+        self.assertEqual([['0', '1'], ['2', '3']],
+                         [self._posted_alert_ids(call) for call in calls])
+        self.assertEqual('http://localhost:9093/api/v1/alerts', calls[0][0][0])
+        self.assertEqual({'summary': 'alert 3', 'occurrence_count': '4'},
+                         calls[1][1]['json'][1]['annotations'])
+        self.assertEqual(4, alert_manager.STATS['sent'])
+
+    @mock.patch.object(alert_manager.alert_cfg, 'alert_batch_size', 2)
+    def test_push_prometheus_alert_batches(self):
+        alert_manager.PrometheusAlertExporter().push_prometheus_alert(
+            fake_alerts)
+        self.assertEqual([['0', '1'], ['2', '3'], ['4']],
+                         [self._posted_alert_ids(call) for call
+                          in self.session.post.call_args_list])
+
+    @mock.patch.object(alert_manager.alert_cfg, 'alert_retry_queue_size', 3)
+    def test_push_prometheus_alert_retry(self):
+        exporter = alert_manager.PrometheusAlertExporter()
+        self.session.post.side_effect = requests.ConnectionError()
+        exporter.push_prometheus_alert(fake_alerts[:2])
+        exporter.push_prometheus_alert(fake_alerts[2:4])
+        # The oldest is dropped from the bounded retry queue
+        self.assertEqual(1, alert_manager.STATS['dropped'])
+
+        self.session.post.reset_mock()
+        self.session.post.side_effect = None
+        exporter.push_prometheus_alert(fake_alerts[4:])
+        self.assertEqual([['1', '2', '3', '4']],
+                         [self._posted_alert_ids(call) for call
+                          in self.session.post.call_args_list])
+
+        # Rejected alerts are not retried
+        self.session.post.return_value = mock.Mock(status_code=400)
+        exporter.push_prometheus_alert(fake_alerts[:1])
+        self.session.post.reset_mock()
+        self.session.post.return_value = mock.Mock(status_code=200)
+        exporter.push_prometheus_alert([])
+        self.assertFalse(self.session.post.called)
@@ -11,11 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import glob
-import os
+import shutil
+import tempfile
 from unittest import TestCase
 
-from delfin.exporter.prometheus import prometheus
+from delfin.exporter.prometheus import prometheus, registry
 from delfin.common.constants import metric_struct
 
 fake_metrics = [metric_struct(name='throughput',
@@ -23,13 +23,43 @@ fake_metrics = [metric_struct(name='throughput',
                                       'resource_type': 'storage',
                                       'resource_id': 'storage0',
                                       'type': 'RAW', 'unit': 'MB/s'},
-                              values={1622808000000: 61.9388895680357})]
+                              values={1622808000000: 61.9388895680357,
+                                      1622808060000: 62.5})]
 
 
 class TestPrometheusExporter(TestCase):
 
+    def setUp(self):
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir)
+        self.addCleanup(registry.close_registries)
+
     def test_push_to_prometheus(self):
         prometheus_obj = prometheus.PrometheusExporter()
-        prometheus_obj.metrics_dir = os.getcwd()
+        prometheus_obj.metrics_dir = self.metrics_dir
+        prometheus_obj.push_to_prometheus(fake_metrics)
+        # The series is updated in place
         prometheus_obj.push_to_prometheus(fake_metrics)
-        self.assertTrue(glob.glob(prometheus_obj.metrics_dir + '/' + '*.prom'))
+
+        # The registry is opened once by a process
+        self.assertIs(registry.get_registry(self.metrics_dir),
+                      registry.get_registry(self.metrics_dir))
+        data = registry.get_registry(self.metrics_dir).render()
+        lines = data.splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertEqual('# TYPE storage_throughput gauge', lines[1])
+        self.assertTrue(lines[2].startswith(
+            'storage_throughput{storage_id="12345",'))
+        self.assertTrue(lines[2].endswith(' 62.500000 1622808060000'))
+
+    def test_registry_retention(self):
+        metrics_registry = registry.MetricsRegistry(self.metrics_dir,
+                                                    retention=-1)
+        self.assertEqual('', metrics_registry.render())
+        # Series older than the retention are removed on update
+        metrics_registry.update([('storage_iops', 'storage_id="1"', 1.0, 1)])
+        self.assertEqual('', metrics_registry.render())
+        # They are removed at most once per prune interval
+        metrics_registry.update([('storage_iops', 'storage_id="1"', 1.0, 1)])
+        self.assertIn('storage_iops', metrics_registry.render())
+        metrics_registry.close()
@@ -0,0 +1,114 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import eventlet
+
+from delfin import test
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_executor
+
+
+class FakeCollection(object):
+    def __init__(self):
+        self.windows = []
+        self.running = {}
+        self.max_running = {}
+
+    def collect(self, driver_type):
+        def _collect(start_time, end_time):
+            self.running[driver_type] = self.running.get(driver_type, 0) + 1
+            self.max_running[driver_type] = max(
+                self.max_running.get(driver_type, 0),
+                self.running[driver_type])
+            eventlet.sleep(0.01)
+            self.running[driver_type] -= 1
+            self.windows.append((start_time, end_time))
+        return _collect
+
+
+class TestCollectionExecutor(test.TestCase):
+
+    def setUp(self):
+        super(TestCollectionExecutor, self).setUp()
+        self.executor = collection_executor.CollectionExecutor()
+        self.collection = FakeCollection()
+
+    def _submit_overran(self):
+        collect = self.collection.collect('fake')
+        results = [self.executor.submit('fake_task', 'fake', collect,
+                                        end_time - 60, end_time)
+                   for end_time in (60, 120, 180, 240)]
+        self.executor.wait()
+        return results
+
+    def test_overrun_skip(self):
+        self.override_config('collection_overrun_policy', 'skip',
+                             group='telemetry')
+        self.assertEqual([True, False, False, False], self._submit_overran())
+        self.assertEqual([(0, 60)], self.collection.windows)
+        self.assertEqual(3, self.executor.get_stats()['skipped'])
+
+    def test_overrun_coalesce(self):
+        self.override_config('collection_overrun_policy', 'coalesce',
+                             group='telemetry')
+        self.assertEqual([True] * 4, self._submit_overran())
+        self.assertEqual([(0, 60), (60, 240)], self.collection.windows)
+        self.assertEqual(3, self.executor.get_stats()['coalesced'])
+
+    def test_overrun_queue(self):
+        self.override_config('collection_overrun_policy', 'queue',
+                             group='telemetry')
+        self.override_config('collection_queue_size', 2, group='telemetry')
+        self.assertEqual([True, True, True, False], self._submit_overran())
+        self.assertEqual([(0, 60), (60, 120), (120, 180)],
+                         self.collection.windows)
+        stats = self.executor.get_stats()
+        self.assertEqual(2, stats['queued'])
+        self.assertEqual(1, stats['skipped'])
+        self.assertEqual(0, stats['running'])
+        self.assertEqual(3, stats['durations']['fake_task']['count'])
+        self.assertEqual(3, stats['durations']['fake_task']['buckets'][1])
+
+    def test_driver_workers(self):
+        self.override_config('collection_workers', 3, group='telemetry')
+        self.override_config('driver_collection_workers', {'slow': 1},
+                             group='telemetry')
+        for task_id in range(5):
+            for driver_type in ('slow model', 'fast model'):
+                self.executor.submit('%s %s' % (driver_type, task_id),
+                                     driver_type,
+                                     self.collection.collect(driver_type),
+                                     0, 60)
+        self.executor.wait()
+
+        self.assertEqual({'slow model': 1, 'fast model': 3},
+                         self.collection.max_running)
+        self.assertEqual(10, len(self.collection.windows))
+
+    @mock.patch.object(collection_executor, 'LOG')
+    def test_log_stats(self, mock_log):
+        # Nothing collected, nothing logged
+        self.executor.log_stats()
+        self.assertFalse(mock_log.info.called)
+
+        self.override_config('collection_overrun_policy', 'skip',
+                             group='telemetry')
+        self._submit_overran()
+        self.executor.log_stats()
+        args = mock_log.info.call_args[0]
+        self.assertEqual(3, args[1]['skipped'])
+        self.assertEqual(1, args[2])
+        self.assertTrue(args[3].startswith('fake_task '))
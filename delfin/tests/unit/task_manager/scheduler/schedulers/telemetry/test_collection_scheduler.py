@@ -0,0 +1,45 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+
+from delfin import test
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_scheduler
+
+
+class TestCollectionScheduler(test.TestCase):
+
+    def test_get_next_run_time(self):
+        now = 1700000000
+        next_run_time = collection_scheduler.get_next_run_time(
+            'fake_task_id', 900, now=now).timestamp()
+        phase = collection_scheduler.get_phase('fake_task_id', 900)
+
+        self.assertEqual(phase, next_run_time % 900)
+        self.assertTrue(now < next_run_time <= now + 900)
+        # The slot of the task doesn't depend on when it's scheduled
+        self.assertEqual(next_run_time, collection_scheduler.get_next_run_time(
+            'fake_task_id', 900, now=now + 100).timestamp())
+
+    def test_get_next_run_time_spread(self):
+        phases = {collection_scheduler.get_phase(task_id, 60)
+                  for task_id in range(100)}
+        self.assertGreater(len(phases), 30)
+
+    def test_get_next_run_time_not_spread(self):
+        self.override_config('collection_spread', False, group='telemetry')
+        self.assertEqual(datetime.fromtimestamp(1700000900),
+                         collection_scheduler.get_next_run_time(
+                             'fake_task_id', 900, now=1700000000))
@@ -205,3 +205,80 @@ class TestFailedPerformanceCollectionHandler(test.TestCase):
         # Verify that no action performed for deleted storage failed tasks
         self.assertEqual(mock_collect_telemetry.call_count, 0)
         self.assertEqual(mock_failed_task_update.call_count, 0)
+
+    @mock.patch.object(db, 'task_get',
+                       mock.Mock(return_value=fake_telemetry_job))
+    @mock.patch.object(db, 'failed_task_get')
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.remove_failed_job')
+    @mock.patch('delfin.db.failed_task_update')
+    @mock.patch('delfin.task_manager.tasks.telemetry'
+                '.PerformanceCollectionTask.collect')
+    @mock.patch('delfin.drivers.api.API.get_latest_perf_timestamp')
+    @mock.patch('delfin.drivers.api.API.get_capabilities')
+    def test_failed_job_backfill_chunk(self, mock_get_capabilities,
+                                       mock_get_latest_perf_timestamp,
+                                       mock_collect_telemetry,
+                                       mock_failed_task_update,
+                                       mock_remove_job,
+                                       mock_failed_task_get):
+        failed_job = fake_failed_job.copy()
+        failed_job[FailedTask.start_time.name] = 1000000
+        failed_job[FailedTask.end_time.name] = 9000000
+        mock_failed_task_get.return_value = failed_job
+        mock_get_capabilities.return_value = {
+            'performance_metric_retention_window': 3000}
+        mock_get_latest_perf_timestamp.return_value = 9000000
+        mock_collect_telemetry.return_value = TelemetryTaskStatus. \
+            TASK_EXEC_STATUS_SUCCESS
+        ctx = context.get_admin_context()
+        failed_job_handler = FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)
+        failed_job_handler()
+
+        # The range older than the retention window is skipped, and one
+        # retention window of it is collected
+        mock_collect_telemetry.assert_called_once_with(
+            ctx, fake_telemetry_job[Task.storage_id.name], {},
+            6000000, 9000000)
+        self.assertEqual(mock_remove_job.call_count, 1)
+
+        failed_job[FailedTask.start_time.name] = 6000000
+        failed_job[FailedTask.end_time.name] = 12000000
+        failed_job_handler()
+
+        # The rest of the range is collected by the next run
+        mock_collect_telemetry.assert_called_with(
+            ctx, fake_telemetry_job[Task.storage_id.name], {},
+            6000000, 9000000)
+        mock_failed_task_update.assert_called_with(
+            ctx, fake_failed_job_id,
+            {FailedTask.start_time.name: 9000000,
+             FailedTask.retry_count.name: 0,
+             FailedTask.result.name:
+                 TelemetryJobStatus.FAILED_JOB_STATUS_RETRYING})
+        self.assertEqual(mock_remove_job.call_count, 1)
+
+    @mock.patch.object(db, 'task_get',
+                       mock.Mock(return_value=fake_telemetry_job))
+    @mock.patch.object(db, 'failed_task_get',
+                       mock.Mock(return_value=fake_failed_job))
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.remove_failed_job')
+    @mock.patch('delfin.db.failed_task_update', mock.Mock())
+    @mock.patch('delfin.task_manager.tasks.telemetry'
+                '.PerformanceCollectionTask.collect')
+    @mock.patch('delfin.drivers.api.API.get_latest_perf_timestamp')
+    @mock.patch('delfin.drivers.api.API.get_capabilities')
+    def test_failed_job_aged_out(self, mock_get_capabilities,
+                                 mock_get_latest_perf_timestamp,
+                                 mock_collect_telemetry, mock_remove_job):
+        mock_get_capabilities.return_value = {
+            'performance_metric_retention_window': 60}
+        mock_get_latest_perf_timestamp.return_value = \
+            fake_failed_job[FailedTask.end_time.name] + 60 * 1000
+        ctx = context.get_admin_context()
+        failed_job_handler = FailedPerformanceCollectionHandler.get_instance(
+            ctx, fake_failed_job_id)
+        failed_job_handler()
+
+        self.assertEqual(mock_collect_telemetry.call_count, 0)
+        self.assertEqual(mock_remove_job.call_count, 1)
@@ -0,0 +1,107 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from delfin import context
+from delfin import db
+from delfin import test
+from delfin.common.constants import TelemetryJobStatus, TelemetryCollection
+from delfin.db.sqlalchemy.models import FailedTask
+from delfin.task_manager.scheduler.schedulers.telemetry import gap_ledger
+
+fake_storage_id = '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6'
+
+
+def fake_gap(failed_task_id, start_time, end_time):
+    return {FailedTask.id.name: failed_task_id,
+            FailedTask.storage_id.name: fake_storage_id,
+            FailedTask.task_id.name: 2,
+            FailedTask.start_time.name: start_time,
+            FailedTask.end_time.name: end_time,
+            FailedTask.retry_count.name: 3,
+            FailedTask.result.name:
+                TelemetryJobStatus.FAILED_JOB_STATUS_RETRYING,
+            FailedTask.executor.name: 'node1'}
+
+
+class TestGapLedger(test.TestCase):
+
+    def test_merge_window(self):
+        gaps = [fake_gap(1, 0, 100), fake_gap(2, 300, 400),
+                fake_gap(3, 150, 250)]
+        overlapped, window = gap_ledger.merge_window(gaps, 90, 160)
+        self.assertEqual([1, 3], [gap['id'] for gap in overlapped])
+        self.assertEqual((0, 250), window)
+
+        overlapped, window = gap_ledger.merge_window(gaps, 500, 600)
+        self.assertEqual([], overlapped)
+        self.assertEqual((500, 600), window)
+
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.assign_failed_job')
+    @mock.patch.object(db, 'failed_task_create')
+    @mock.patch.object(db, 'failed_task_get_all')
+    def test_add_new_gap(self, mock_get_all, mock_create, mock_assign):
+        mock_get_all.return_value = [fake_gap(1, 0, 100)]
+        mock_create.return_value = fake_gap(2, 200, 300)
+        ctx = context.get_admin_context()
+        gap = gap_ledger.GapLedger(ctx).add(fake_gap(None, 200, 300))
+
+        self.assertEqual(2, gap['id'])
+        mock_assign.assert_called_once_with(ctx, 2, 'node1')
+
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.remove_failed_job')
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.assign_failed_job')
+    @mock.patch.object(db, 'failed_task_update')
+    @mock.patch.object(db, 'failed_task_create')
+    @mock.patch.object(db, 'failed_task_get_all')
+    def test_add_merged_gap(self, mock_get_all, mock_create, mock_update,
+                            mock_assign, mock_remove):
+        mock_get_all.return_value = [fake_gap(1, 0, 100),
+                                     fake_gap(2, 150, 250)]
+        ctx = context.get_admin_context()
+        gap = gap_ledger.GapLedger(ctx).add(fake_gap(None, 90, 160))
+
+        self.assertEqual(1, gap['id'])
+        self.assertEqual(0, mock_create.call_count)
+        self.assertEqual(0, mock_assign.call_count)
+        mock_update.assert_called_once_with(
+            ctx, 1, {FailedTask.start_time.name: 0,
+                     FailedTask.end_time.name: 250,
+                     FailedTask.retry_count.name: 0})
+        mock_remove.assert_called_once_with(ctx, 2, 'node1')
+
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.remove_failed_job')
+    @mock.patch('delfin.task_manager.metrics_rpcapi.TaskAPI.assign_failed_job')
+    @mock.patch.object(db, 'failed_task_update')
+    @mock.patch.object(db, 'failed_task_create')
+    @mock.patch.object(db, 'failed_task_get_all')
+    def test_add_stopped_gap(self, mock_get_all, mock_create, mock_update,
+                             mock_assign, mock_remove):
+        succeeded = fake_gap(1, 0, 100)
+        succeeded[FailedTask.result.name] = \
+            TelemetryJobStatus.FAILED_JOB_STATUS_SUCCESS
+        given_up = fake_gap(2, 150, 250)
+        given_up[FailedTask.retry_count.name] = \
+            TelemetryCollection.MAX_FAILED_JOB_RETRY_COUNT
+        mock_get_all.return_value = [succeeded, given_up]
+        mock_create.return_value = fake_gap(3, 90, 160)
+        ctx = context.get_admin_context()
+        gap = gap_ledger.GapLedger(ctx).add(fake_gap(None, 90, 160))
+
+        # The window gets a gap of its own instead of the stopped ones
+        self.assertEqual(3, gap['id'])
+        self.assertEqual(0, mock_update.call_count)
+        self.assertEqual(0, mock_remove.call_count)
+        mock_assign.assert_called_once_with(ctx, 3, 'node1')
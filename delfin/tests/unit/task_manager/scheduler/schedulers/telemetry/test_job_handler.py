@@ -18,6 +18,7 @@ from oslo_utils import uuidutils
 
 from delfin import context
 from delfin import db
+from delfin import exception
 from delfin import test
 from delfin.common import constants
 from delfin.db.sqlalchemy.models import Task
@@ -139,6 +140,21 @@ class TestTelemetryJob(test.TestCase):
         telemetry_job.remove_job(fake_telemetry_job['id'])
         self.assertEqual(mock_log_error.call_count, 0)
 
+    @mock.patch.object(db, 'task_update', mock.Mock())
+    @mock.patch.object(db, 'task_get')
+    @mock.patch.object(db, 'tasks_get_by_ids')
+    @mock.patch(
+        'apscheduler.schedulers.background.BackgroundScheduler.add_job')
+    def test_telemetry_jobs_scheduling(self, mock_add_job,
+                                       mock_tasks_get_by_ids, mock_task_get):
+        mock_tasks_get_by_ids.return_value = [
+            dict(fake_telemetry_job, id=task_id) for task_id in (1, 2, 3)]
+        JobHandler.schedule_jobs(context.get_admin_context(), [1, 2, 3])
+        self.assertEqual(mock_add_job.call_count, 3)
+        # The tasks are got in one query
+        mock_tasks_get_by_ids.assert_called_once_with(mock.ANY, [1, 2, 3])
+        self.assertFalse(mock_task_get.called)
+
 
 class TestFailedTelemetryJob(test.TestCase):
 
@@ -158,6 +174,39 @@ class TestFailedTelemetryJob(test.TestCase):
         failed_job.schedule_failed_job(fake_failed_job['id'])
         self.assertEqual(mock_add_job.call_count, 1)
 
+    @mock.patch.object(db, 'failed_task_update', mock.Mock())
+    @mock.patch.object(db, 'failed_task_get',
+                       mock.Mock(return_value=fake_failed_job))
+    @mock.patch.object(db, 'failed_task_delete')
+    @mock.patch.object(db, 'task_get')
+    @mock.patch.object(db, 'tasks_get_by_ids')
+    @mock.patch.object(db, 'failed_tasks_get_by_ids')
+    @mock.patch(
+        'apscheduler.schedulers.background.BackgroundScheduler.add_job')
+    def test_failed_jobs_scheduling(self, mock_add_job,
+                                    mock_failed_tasks_get_by_ids,
+                                    mock_tasks_get_by_ids, mock_task_get,
+                                    mock_failed_task_delete):
+        failed_jobs = [dict(fake_failed_job, id=failed_task_id,
+                            task_id=task_id, retry_count=0, job_id=None)
+                       for failed_task_id, task_id in ((1, 10), (2, 20))]
+        mock_failed_tasks_get_by_ids.return_value = failed_jobs
+        mock_tasks_get_by_ids.return_value = [
+            dict(fake_telemetry_job, id=10)]
+        mock_task_get.side_effect = exception.TaskNotFound(20)
+        FailedJobHandler.schedule_failed_jobs(context.get_admin_context(),
+                                              [1, 2])
+        self.assertEqual(mock_add_job.call_count, 1)
+        # The loaded failed task is passed on with its new job id
+        instance = mock_add_job.call_args[0][0]
+        self.assertEqual(instance.failed_task_id, 1)
+        self.assertEqual(instance.job_id, mock_add_job.call_args[1]['id'])
+        self.assertFalse(db.failed_task_get.called)
+        mock_tasks_get_by_ids.assert_called_once_with(mock.ANY, [10, 20])
+        # Only the failed task without parent task is looked up again
+        mock_task_get.assert_called_once_with(mock.ANY, 20)
+        mock_failed_task_delete.assert_called_once_with(mock.ANY, 2)
+
     @mock.patch.object(db, 'failed_task_get',
                        mock.Mock(return_value=fake_failed_job))
     @mock.patch(
@@ -23,6 +23,8 @@ from delfin import test
 from delfin.common import constants
 from delfin.common.constants import TelemetryTaskStatus
 from delfin.db.sqlalchemy.models import Task
+from delfin.task_manager.scheduler.schedulers.telemetry import \
+    collection_executor
 from delfin.task_manager.scheduler.schedulers.telemetry. \
     performance_collection_handler import \
     PerformanceCollectionHandler
@@ -71,6 +73,7 @@ class TestPerformanceCollectionHandler(test.TestCase):
             ctx, fake_task_id)
         # call performance collection handler
         perf_collection_handler()
+        collection_executor.COLLECTION_EXECUTOR.wait()
 
         self.assertEqual(mock_collect_telemetry.call_count, 1)
         self.assertEqual(mock_task_update.call_count, 1)
@@ -97,6 +100,7 @@ class TestPerformanceCollectionHandler(test.TestCase):
             ctx, fake_task_id)
         # call performance collection handler
         perf_collection_handler()
+        collection_executor.COLLECTION_EXECUTOR.wait()
 
         # Verify that failed task create is called if collect telemetry fails
         self.assertEqual(mock_failed_task_create.call_count, 1)
@@ -117,6 +121,7 @@ class TestPerformanceCollectionHandler(test.TestCase):
         perf_collection_handler = PerformanceCollectionHandler.get_instance(
             ctx, fake_task_id)
         perf_collection_handler()
+        collection_executor.COLLECTION_EXECUTOR.wait()
 
         # Verify that collect telemetry and db updated is not called
         # for deleted storage
@@ -135,6 +140,7 @@ class TestPerformanceCollectionHandler(test.TestCase):
                                                                "", 100,
                                                                fake_executor)
         perf_collection_handler()
+        collection_executor.COLLECTION_EXECUTOR.wait()
 
         # Verify that collect telemetry for deleted storage
         self.assertEqual(mock_collect_telemetry.call_count, 0)
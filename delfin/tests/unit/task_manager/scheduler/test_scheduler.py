@@ -18,9 +18,6 @@ from apscheduler.schedulers.background import BackgroundScheduler
 
 from delfin import db
 from delfin import test
-from delfin.coordination import ConsistentHashing
-from delfin.leader_election.distributor.task_distributor \
-    import TaskDistributor
 from delfin.task_manager.metrics_rpcapi import TaskAPI
 from delfin.task_manager.scheduler import schedule_manager
 
@@ -59,47 +56,80 @@ class TestScheduler(test.TestCase):
         manager.start()
         self.assertEqual(mock_scheduler_start.call_count, 1)
 
-    @mock.patch('tooz.coordination.get_coordinator', mock.Mock())
-    @mock.patch.object(ConsistentHashing, 'get_task_executor')
-    @mock.patch.object(TaskAPI, 'remove_job')
-    @mock.patch.object(TaskDistributor, 'distribute_new_job')
+    @mock.patch.object(schedule_manager.SchedulerManager, 'get_partitioner')
+    @mock.patch.object(TaskAPI, 'assign_failed_jobs')
+    @mock.patch.object(TaskAPI, 'assign_jobs')
+    @mock.patch.object(TaskAPI, 'remove_jobs')
+    @mock.patch.object(db, 'failed_task_executors_update')
+    @mock.patch.object(db, 'task_executors_update')
+    @mock.patch.object(db, 'failed_task_get_all')
     @mock.patch.object(db, 'task_get_all')
-    def test_on_node_join(self, mock_task_get_all, mock_distribute_new_job,
-                          mock_remove_job, mock_get_task_executor):
-        node1_job_count = 0
-        node2_job_count = 0
-        for job in FAKE_TASKS:
-            if job['executor'] == 'node1':
-                node1_job_count += 1
-            elif job['executor'] == 'node2':
-                node2_job_count += 1
+    def test_on_node_join(self, mock_task_get_all, mock_failed_task_get_all,
+                          mock_task_executors_update,
+                          mock_failed_task_executors_update,
+                          mock_remove_job, mock_assign_job,
+                          mock_assign_failed_job, mock_get_partitioner):
         mock_task_get_all.return_value = FAKE_TASKS
-        mock_get_task_executor.return_value = 'node1'
+        mock_failed_task_get_all.return_value = [
+            {'id': 10, 'task_id': 2, 'executor': 'node2'},
+            {'id': 11, 'task_id': 3, 'executor': 'node1'}]
+        partitioner = mock_get_partitioner.return_value
+        partitioner.get_task_executors.side_effect = \
+            lambda task_ids: {task_id: 'node1' for task_id in task_ids}
         manager = schedule_manager.SchedulerManager()
         manager.on_node_join(mock.Mock(member_id=b'fake_member_id',
                                        group_id='node1'))
         self.assertEqual(mock_task_get_all.call_count, 1)
-        self.assertEqual(mock_distribute_new_job.call_count,
-                         node1_job_count + node2_job_count)
-        self.assertEqual(mock_remove_job.call_count, node2_job_count)
-        self.assertEqual(mock_get_task_executor.call_count,
-                         node1_job_count + node2_job_count)
+        # Only the job moved from node2 is updated and sent
+        mock_task_executors_update.assert_called_once_with(
+            manager.ctx, {2: 'node1'})
+        mock_remove_job.assert_called_once_with(manager.ctx, [2], 'node2')
+        mock_assign_job.assert_called_once_with(manager.ctx, [2], 'node1')
+        mock_failed_task_executors_update.assert_called_once_with(
+            manager.ctx, {10: 'node1'})
+        mock_assign_failed_job.assert_called_once_with(manager.ctx, [10],
+                                                       'node1')
+        self.assertEqual(2, partitioner.get_task_executors.call_count)
 
-    @mock.patch.object(TaskDistributor, 'distribute_new_job')
+    @mock.patch.object(schedule_manager.SchedulerManager, 'get_partitioner')
+    @mock.patch.object(TaskAPI, 'assign_jobs')
+    @mock.patch.object(TaskAPI, 'remove_jobs')
+    @mock.patch.object(db, 'task_executors_update')
+    @mock.patch.object(db, 'failed_task_get_all', mock.Mock(return_value=[]))
     @mock.patch.object(db, 'task_get_all')
-    def test_on_node_leave(self, mock_task_get_all, mock_distribute_new_job):
+    def test_on_node_leave(self, mock_task_get_all,
+                           mock_task_executors_update, mock_remove_job,
+                           mock_assign_job, mock_get_partitioner):
         mock_task_get_all.return_value = FAKE_TASKS
+        mock_get_partitioner.return_value.get_task_executors.return_value = \
+            {1: 'node2', 2: 'node2', 3: 'node2'}
         manager = schedule_manager.SchedulerManager()
         manager.on_node_leave(mock.Mock(member_id=b'fake_member_id',
                                         group_id='fake_group_id'))
         self.assertEqual(mock_task_get_all.call_count, 1)
-        self.assertEqual(mock_distribute_new_job.call_count, len(FAKE_TASKS))
+        mock_task_executors_update.assert_called_once_with(
+            manager.ctx, {1: 'node2', 3: 'node2'})
+        self.assertFalse(mock_remove_job.called)
+        # One message for the jobs of the executor
+        mock_assign_job.assert_called_once_with(manager.ctx, [1, 3], 'node2')
 
-    @mock.patch.object(TaskDistributor, 'distribute_new_job')
+    @mock.patch.object(schedule_manager.SchedulerManager, 'get_partitioner')
+    @mock.patch.object(TaskAPI, 'assign_jobs')
+    @mock.patch.object(TaskAPI, 'remove_jobs')
+    @mock.patch.object(db, 'task_executors_update')
     @mock.patch.object(db, 'task_get_all')
-    def test_recover_job(self, mock_task_get_all, mock_distribute_new_job):
+    def test_recover_job(self, mock_task_get_all, mock_task_executors_update,
+                         mock_remove_jobs, mock_assign_jobs,
+                         mock_get_partitioner):
         mock_task_get_all.return_value = FAKE_TASKS
+        mock_get_partitioner.return_value.get_task_executors.return_value = \
+            {1: 'node1', 2: 'node1', 3: 'node1'}
         manager = schedule_manager.SchedulerManager()
         manager.recover_job()
         self.assertEqual(mock_task_get_all.call_count, 1)
-        self.assertEqual(mock_distribute_new_job.call_count, len(FAKE_TASKS))
+        mock_task_executors_update.assert_called_once_with(
+            manager.ctx, {2: 'node1'})
+        mock_remove_jobs.assert_called_once_with(manager.ctx, [2], 'node2')
+        # All the jobs are sent to the restarted executors
+        mock_assign_jobs.assert_called_once_with(manager.ctx, [1, 2, 3],
+                                                 'node1')
@@ -11,15 +11,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-
-
+import copy
 from unittest import mock
 from delfin.common import config # noqa
+from delfin.common import constants
 from delfin.drivers import fake_storage
 from delfin.task_manager.tasks import resources
 from delfin.task_manager.tasks.resources import StorageDeviceTask
 
-from delfin import test, context, coordination
+from delfin import test, context, exception
 
 storage = {
     'id': '12c2d52f-01bc-41f5-b73f-7abf6f38a2a6',
@@ -269,6 +269,46 @@ masking_views_list = [{
 ]
 
 
+def changed(resources):
+    """Copy the resources with a changed field, so that they need update"""
+    return [dict(resource, description='changed') for resource in resources]
+
+
+class TestSetSyncedAfter(test.TestCase):
+    @mock.patch('delfin.db.storage_sync_status_decrease')
+    @mock.patch('delfin.db.resource_sync_state_update')
+    def test_set_synced_after(self, mock_state_update, mock_decrease):
+        class FakeTask(object):
+            def __init__(self, failed):
+                self.context = context
+                self.storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda'
+                self.failed = failed
+
+            @resources.set_synced_after()
+            def sync(self):
+                if self.failed:
+                    raise exception.DelfinException()
+
+        task = FakeTask(False)
+        task.sync()
+        self.assertEqual(constants.ResourceSync.SUCCEED, task.sync_result)
+        self.assertEqual(constants.ResourceSyncStatus.SYNCING,
+                         mock_state_update.call_args_list[0][0][3]['status'])
+        self.assertEqual(constants.ResourceSyncStatus.SYNCED,
+                         mock_state_update.call_args_list[1][0][3]['status'])
+        self.assertEqual('FakeTask', mock_state_update.call_args[0][2])
+        mock_decrease.assert_called_with(
+            context, task.storage_id, constants.ResourceSync.SUCCEED)
+
+        task = FakeTask(True)
+        task.sync()
+        self.assertEqual(constants.ResourceSync.FAILED, task.sync_result)
+        self.assertEqual(constants.ResourceSyncStatus.FAILED,
+                         mock_state_update.call_args[0][3]['status'])
+        mock_decrease.assert_called_with(
+            context, task.storage_id, constants.ResourceSync.FAILED)
+
+
 class TestStorageDeviceTask(test.TestCase):
     def setUp(self):
         super(TestStorageDeviceTask, self).setUp()
@@ -277,7 +317,7 @@ class TestStorageDeviceTask(test.TestCase):
             context, "12c2d52f-01bc-41f5-b73f-7abf6f38a2a6")
         self.mock_object(self.task_manager, 'driver_api', self.driver_api)
 
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.get_storage')
     @mock.patch('delfin.db.storage_update')
     @mock.patch('delfin.db.storage_get')
@@ -286,12 +326,13 @@ class TestStorageDeviceTask(test.TestCase):
     @mock.patch('delfin.db.alert_source_delete')
     def test_sync_successful(self, alert_source_delete, access_info_delete,
                              mock_storage_delete, mock_storage_get,
-                             mock_storage_update, mock_get_storage, get_lock):
+                             mock_storage_update, mock_get_storage,
+                             set_synced):
         storage_obj = resources.StorageDeviceTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
 
         storage_obj.sync()
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
         self.assertTrue(mock_storage_get.called)
         self.assertTrue(mock_storage_delete.called)
         self.assertTrue(access_info_delete.called)
@@ -318,7 +359,7 @@ class TestStorageDeviceTask(test.TestCase):
 
 
 class TestStoragePoolTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_storage_pools')
     @mock.patch('delfin.db.storage_pool_get_all')
     @mock.patch('delfin.db.storage_pools_delete')
@@ -326,14 +367,14 @@ class TestStoragePoolTask(test.TestCase):
     @mock.patch('delfin.db.storage_pools_create')
     def test_sync_successful(self, mock_pool_create, mock_pool_update,
                              mock_pool_del, mock_pool_get_all,
-                             mock_list_pools, get_lock):
+                             mock_list_pools, set_synced):
         pool_obj = resources.StoragePoolTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         pool_obj.sync()
 
         self.assertTrue(mock_list_pools.called)
         self.assertTrue(mock_pool_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the pools from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -346,7 +387,7 @@ class TestStoragePoolTask(test.TestCase):
         self.assertTrue(mock_pool_create.called)
 
         # update the new pool of DB
-        mock_list_pools.return_value = pools_list
+        mock_list_pools.return_value = changed(pools_list)
         mock_pool_get_all.return_value = pools_list
         pool_obj.sync()
         self.assertTrue(mock_pool_update.called)
@@ -366,7 +407,7 @@ class TestStoragePoolTask(test.TestCase):
 
 
 class TestStorageVolumeTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_volumes')
     @mock.patch('delfin.db.volume_get_all')
     @mock.patch('delfin.db.volumes_delete')
@@ -374,13 +415,13 @@ class TestStorageVolumeTask(test.TestCase):
     @mock.patch('delfin.db.volumes_create')
     def test_sync_successful(self, mock_vol_create, mock_vol_update,
                              mock_vol_del, mock_vol_get_all, mock_list_vols,
-                             get_lock):
+                             set_synced):
         vol_obj = resources.StorageVolumeTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         vol_obj.sync()
         self.assertTrue(mock_list_vols.called)
         self.assertTrue(mock_vol_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the volumes from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -392,7 +433,7 @@ class TestStorageVolumeTask(test.TestCase):
         self.assertTrue(mock_vol_create.called)
 
         # update the volumes to DB
-        mock_list_vols.return_value = vols_list
+        mock_list_vols.return_value = changed(vols_list)
         mock_vol_get_all.return_value = vols_list
         vol_obj.sync()
         self.assertTrue(mock_vol_update.called)
@@ -403,6 +444,102 @@ class TestStorageVolumeTask(test.TestCase):
         vol_obj.sync()
         self.assertTrue(mock_vol_del.called)
 
+    @mock.patch('delfin.db.storage_generation_increase')
+    @mock.patch('delfin.db.resource_digest_get')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
+    @mock.patch('delfin.drivers.api.API.list_volumes')
+    @mock.patch('delfin.db.volume_get_all')
+    @mock.patch('delfin.db.volumes_delete')
+    @mock.patch('delfin.db.volumes_update')
+    @mock.patch('delfin.db.volumes_create')
+    def test_sync_with_fingerprints(self, mock_vol_create, mock_vol_update,
+                                    mock_vol_del, mock_vol_get_all,
+                                    mock_list_vols, set_synced, mock_digest,
+                                    mock_generation):
+        self.override_config('resource_fingerprint_expiration', 3600)
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda'
+        resources.FINGERPRINT_CACHE.invalidate(storage_id)
+        self.addCleanup(resources.FINGERPRINT_CACHE.invalidate, storage_id)
+        vol_obj = resources.StorageVolumeTask(context, storage_id)
+        mock_digest.return_value = (1, None, None)
+        mock_vol_get_all.return_value = vols_list
+
+        # The first sync compares the volumes with db
+        mock_list_vols.return_value = copy.deepcopy(vols_list)
+        vol_obj.sync()
+        self.assertEqual(1, mock_vol_get_all.call_count)
+
+        # Unchanged volumes are compared with the cached fingerprints
+        mock_list_vols.return_value = copy.deepcopy(vols_list)
+        vol_obj.sync()
+        self.assertEqual(1, mock_vol_get_all.call_count)
+        self.assertFalse(mock_vol_create.called)
+        self.assertFalse(mock_vol_update.called)
+        self.assertFalse(mock_vol_del.called)
+        # Nothing written, the generation of the storage is kept
+        self.assertFalse(mock_generation.called)
+
+        # Changed volumes are updated without reading db
+        mock_list_vols.return_value = changed(vols_list)
+        vol_obj.sync()
+        self.assertEqual(1, mock_vol_get_all.call_count)
+        self.assertEqual(1, mock_vol_update.call_count)
+        mock_generation.assert_called_once_with(context, storage_id)
+
+        # Volumes changed by others, compare with db again
+        mock_digest.return_value = (2, None, None)
+        mock_list_vols.return_value = changed(vols_list)
+        vol_obj.sync()
+        self.assertEqual(2, mock_vol_get_all.call_count)
+
+    @mock.patch('delfin.db.storage_generation_increase')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
+    @mock.patch('delfin.drivers.api.API.list_volumes')
+    @mock.patch('delfin.db.volume_get_all')
+    @mock.patch('delfin.db.volumes_delete')
+    @mock.patch('delfin.db.volumes_update')
+    @mock.patch('delfin.db.volumes_create')
+    def test_sync_partially_written(self, mock_vol_create, mock_vol_update,
+                                    mock_vol_del, mock_vol_get_all,
+                                    mock_list_vols, set_synced,
+                                    mock_generation):
+        storage_id = 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda'
+        vol_obj = resources.StorageVolumeTask(context, storage_id)
+        mock_vol_get_all.return_value = vols_list
+        mock_list_vols.return_value = changed(vols_list) + [
+            dict(vols_list[0], native_volume_id='fake_new_id')]
+        mock_vol_create.side_effect = exception.DelfinException()
+
+        # The volumes updated before the failure are seen by the API
+        vol_obj.sync()
+        self.assertEqual(constants.ResourceSync.FAILED, vol_obj.sync_result)
+        self.assertTrue(mock_vol_update.called)
+        mock_generation.assert_called_once_with(context, storage_id)
+
+    def test_classify_resources(self):
+        vol_obj = resources.StorageVolumeTask(
+            context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
+        db_vols = [
+            {'id': 'id_1', 'native_volume_id': 'vol_1', 'status': 'normal'},
+            {'id': 'id_2', 'native_volume_id': 'vol_2', 'status': 'normal'},
+            {'id': 'id_3', 'native_volume_id': 'vol_3', 'status': 'normal'},
+            {'id': 'id_4', 'native_volume_id': 'vol_1', 'status': 'normal'},
+        ]
+        storage_vols = [
+            {'native_volume_id': 'vol_1', 'status': 'normal'},
+            {'native_volume_id': 'vol_2', 'status': 'offline'},
+            {'native_volume_id': 'vol_5', 'status': 'normal'},
+            {'native_volume_id': 'vol_5', 'status': 'normal'},
+        ]
+        add_list, update_list, delete_id_list = vol_obj._classify_resources(
+            storage_vols, db_vols, 'native_volume_id')
+
+        self.assertEqual([{'native_volume_id': 'vol_5', 'status': 'normal'}],
+                         add_list)
+        self.assertEqual([{'id': 'id_2', 'native_volume_id': 'vol_2',
+                           'status': 'offline'}], update_list)
+        self.assertEqual(['id_4', 'id_3'], delete_id_list)
+
     @mock.patch('delfin.db.volume_delete_by_storage')
     def test_remove(self, mock_vol_del):
         vol_obj = resources.StorageVolumeTask(
@@ -412,7 +549,9 @@ class TestStorageVolumeTask(test.TestCase):
 
 
 class TestStoragecontrollerTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.alert_manager.rpcapi.AlertAPI'
+                '.invalidate_controller_cache')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_controllers')
     @mock.patch('delfin.db.controller_get_all')
     @mock.patch('delfin.db.controllers_delete')
@@ -421,14 +560,17 @@ class TestStoragecontrollerTask(test.TestCase):
     def test_sync_successful(self,
                              mock_controller_create, mock_controller_update,
                              mock_controller_del, mock_controller_get_all,
-                             mock_list_controllers, get_lock):
+                             mock_list_controllers, set_synced,
+                             mock_invalidate):
         controller_obj = resources.StorageControllerTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         controller_obj.sync()
 
         self.assertTrue(mock_list_controllers.called)
         self.assertTrue(mock_controller_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
+        # Nothing changed, the cached controllers are still valid
+        self.assertFalse(mock_invalidate.called)
 
         # collect the controllers from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -439,9 +581,11 @@ class TestStoragecontrollerTask(test.TestCase):
         mock_controller_get_all.return_value = list()
         controller_obj.sync()
         self.assertTrue(mock_controller_create.called)
+        mock_invalidate.assert_called_once_with(
+            context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
 
         # update the new controller of DB
-        mock_list_controllers.return_value = controllers_list
+        mock_list_controllers.return_value = changed(controllers_list)
         mock_controller_get_all.return_value = controllers_list
         controller_obj.sync()
         self.assertTrue(mock_controller_update.called)
@@ -461,7 +605,7 @@ class TestStoragecontrollerTask(test.TestCase):
 
 
 class TestStoragePortTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_ports')
     @mock.patch('delfin.db.port_get_all')
     @mock.patch('delfin.db.ports_delete')
@@ -469,13 +613,13 @@ class TestStoragePortTask(test.TestCase):
     @mock.patch('delfin.db.ports_create')
     def test_sync_successful(self, mock_port_create, mock_port_update,
                              mock_port_del, mock_port_get_all, mock_list_ports,
-                             get_lock):
+                             set_synced):
         port_obj = resources.StoragePortTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         port_obj.sync()
         self.assertTrue(mock_list_ports.called)
         self.assertTrue(mock_port_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the ports from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -487,7 +631,7 @@ class TestStoragePortTask(test.TestCase):
         self.assertTrue(mock_port_create.called)
 
         # update the ports to DB
-        mock_list_ports.return_value = ports_list
+        mock_list_ports.return_value = changed(ports_list)
         mock_port_get_all.return_value = ports_list
         port_obj.sync()
         self.assertTrue(mock_port_update.called)
@@ -507,7 +651,7 @@ class TestStoragePortTask(test.TestCase):
 
 
 class TestStorageDiskTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_disks')
     @mock.patch('delfin.db.disk_get_all')
     @mock.patch('delfin.db.disks_delete')
@@ -515,13 +659,13 @@ class TestStorageDiskTask(test.TestCase):
     @mock.patch('delfin.db.disks_create')
     def test_sync_successful(self, mock_disk_create, mock_disk_update,
                              mock_disk_del, mock_disk_get_all, mock_list_disks,
-                             get_lock):
+                             set_synced):
         disk_obj = resources.StorageDiskTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         disk_obj.sync()
         self.assertTrue(mock_list_disks.called)
         self.assertTrue(mock_disk_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the disks from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -533,7 +677,7 @@ class TestStorageDiskTask(test.TestCase):
         self.assertTrue(mock_disk_create.called)
 
         # update the disks to DB
-        mock_list_disks.return_value = disks_list
+        mock_list_disks.return_value = changed(disks_list)
         mock_disk_get_all.return_value = disks_list
         disk_obj.sync()
         self.assertTrue(mock_disk_update.called)
@@ -554,7 +698,7 @@ class TestStorageDiskTask(test.TestCase):
 
 class TestStorageQuotaTask(test.TestCase):
     # @mock.patch('delfin.drivers.api.API.list_quotas', 'get_lock')
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_quotas')
     @mock.patch('delfin.db.quota_get_all')
     @mock.patch('delfin.db.quotas_delete')
@@ -564,13 +708,13 @@ class TestStorageQuotaTask(test.TestCase):
                              mock_quota_update,
                              mock_quota_del, mock_quota_get_all,
                              mock_list_quotas,
-                             get_lock):
+                             set_synced):
         quota_obj = resources.StorageQuotaTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         quota_obj.sync()
         self.assertTrue(mock_list_quotas.called)
         self.assertTrue(mock_quota_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the quotas from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -583,7 +727,7 @@ class TestStorageQuotaTask(test.TestCase):
         self.assertTrue(mock_quota_create.called)
 
         # update the quotas to DB
-        mock_list_quotas.return_value = quotas_list
+        mock_list_quotas.return_value = changed(quotas_list)
         mock_quota_get_all.return_value = quotas_list
         quota_obj.sync()
         self.assertTrue(mock_quota_update.called)
@@ -603,7 +747,7 @@ class TestStorageQuotaTask(test.TestCase):
 
 
 class TestStorageFilesystemTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_filesystems')
     @mock.patch('delfin.db.filesystem_get_all')
     @mock.patch('delfin.db.filesystems_delete')
@@ -613,13 +757,13 @@ class TestStorageFilesystemTask(test.TestCase):
                              mock_filesystem_update,
                              mock_filesystem_del, mock_filesystem_get_all,
                              mock_list_filesystems,
-                             get_lock):
+                             set_synced):
         filesystem_obj = resources.StorageFilesystemTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         filesystem_obj.sync()
         self.assertTrue(mock_list_filesystems.called)
         self.assertTrue(mock_filesystem_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the filesystems from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -632,7 +776,7 @@ class TestStorageFilesystemTask(test.TestCase):
         self.assertTrue(mock_filesystem_create.called)
 
         # update the filesystems to DB
-        mock_list_filesystems.return_value = filesystems_list
+        mock_list_filesystems.return_value = changed(filesystems_list)
         mock_filesystem_get_all.return_value = filesystems_list
         filesystem_obj.sync()
         self.assertTrue(mock_filesystem_update.called)
@@ -653,7 +797,7 @@ class TestStorageFilesystemTask(test.TestCase):
 
 class TestStorageQtreeTask(test.TestCase):
     # @mock.patch('delfin.drivers.api.API.list_qtrees', 'get_lock')
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_qtrees')
     @mock.patch('delfin.db.qtree_get_all')
     @mock.patch('delfin.db.qtrees_delete')
@@ -663,13 +807,13 @@ class TestStorageQtreeTask(test.TestCase):
                              mock_qtree_update,
                              mock_qtree_del, mock_qtree_get_all,
                              mock_list_qtrees,
-                             get_lock):
+                             set_synced):
         qtree_obj = resources.StorageQtreeTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         qtree_obj.sync()
         self.assertTrue(mock_list_qtrees.called)
         self.assertTrue(mock_qtree_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the qtrees from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -682,7 +826,7 @@ class TestStorageQtreeTask(test.TestCase):
         self.assertTrue(mock_qtree_create.called)
 
         # update the qtrees to DB
-        mock_list_qtrees.return_value = qtrees_list
+        mock_list_qtrees.return_value = changed(qtrees_list)
         mock_qtree_get_all.return_value = qtrees_list
         qtree_obj.sync()
         self.assertTrue(mock_qtree_update.called)
@@ -702,7 +846,7 @@ class TestStorageQtreeTask(test.TestCase):
 
 
 class TestStorageShareTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_shares')
     @mock.patch('delfin.db.share_get_all')
     @mock.patch('delfin.db.shares_delete')
@@ -710,13 +854,13 @@ class TestStorageShareTask(test.TestCase):
     @mock.patch('delfin.db.shares_create')
     def test_sync_successful(self, mock_share_create, mock_share_update,
                              mock_share_del, mock_share_get_all,
-                             mock_list_shares, get_lock):
+                             mock_list_shares, set_synced):
         share_obj = resources.StorageShareTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         share_obj.sync()
         self.assertTrue(mock_list_shares.called)
         self.assertTrue(mock_share_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # collect the shares from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -728,7 +872,7 @@ class TestStorageShareTask(test.TestCase):
         self.assertTrue(mock_share_create.called)
 
         # update the shares to DB
-        mock_list_shares.return_value = shares_list
+        mock_list_shares.return_value = changed(shares_list)
         mock_share_get_all.return_value = shares_list
         share_obj.sync()
         self.assertTrue(mock_share_update.called)
@@ -748,13 +892,13 @@ class TestStorageShareTask(test.TestCase):
 
 
 class TestStorageHostInitiatorTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_storage_host_initiators')
     @mock.patch('delfin.db.storage_host_initiators_delete_by_storage')
     @mock.patch('delfin.db.storage_host_initiators_create')
     def test_sync_successful(self, mock_storage_host_initiator_create,
                              mock_storage_host_initiator_delete_by_storage,
-                             mock_list_storage_host_initiators, get_lock):
+                             mock_list_storage_host_initiators, set_synced):
         storage_host_initiator_obj = resources.StorageHostInitiatorTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
 
@@ -768,6 +912,38 @@ class TestStorageHostInitiatorTask(test.TestCase):
         self.assertTrue(mock_storage_host_initiator_delete_by_storage.called)
         self.assertTrue(mock_storage_host_initiator_create.called)
 
+    @mock.patch('delfin.db.storage_generation_increase')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
+    @mock.patch('delfin.drivers.api.API.list_storage_host_initiators')
+    @mock.patch('delfin.db.storage_host_initiators_get_all')
+    @mock.patch('delfin.db.storage_host_initiators_delete_by_storage')
+    @mock.patch('delfin.db.storage_host_initiators_create')
+    def test_sync_unchanged(self, mock_initiator_create,
+                            mock_initiator_delete_by_storage,
+                            mock_initiator_get_all, mock_list_initiators,
+                            set_synced, mock_generation):
+        storage_host_initiator_obj = resources.StorageHostInitiatorTask(
+            context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
+        mock_list_initiators.return_value = copy.deepcopy(
+            storage_host_initiators_list)
+        db_initiators = copy.deepcopy(storage_host_initiators_list)
+        for index, db_initiator in enumerate(db_initiators):
+            db_initiator['id'] = 'initiator_%s' % index
+        mock_initiator_get_all.return_value = list(reversed(db_initiators))
+
+        # Same initiators in db, nothing is rewritten
+        storage_host_initiator_obj.sync()
+        self.assertFalse(mock_initiator_delete_by_storage.called)
+        self.assertFalse(mock_initiator_create.called)
+        self.assertFalse(mock_generation.called)
+
+        mock_list_initiators.return_value = changed(
+            storage_host_initiators_list)
+        storage_host_initiator_obj.sync()
+        self.assertTrue(mock_initiator_delete_by_storage.called)
+        self.assertTrue(mock_initiator_create.called)
+        self.assertTrue(mock_generation.called)
+
     @mock.patch('delfin.db.storage_host_initiators_delete_by_storage')
     def test_remove(self, mock_storage_host_initiators_del):
         storage_host_initiator_obj = resources.StorageHostInitiatorTask(
@@ -777,7 +953,7 @@ class TestStorageHostInitiatorTask(test.TestCase):
 
 
 class TestStorageHostTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_storage_hosts')
     @mock.patch('delfin.db.storage_hosts_get_all')
     @mock.patch('delfin.db.storage_hosts_delete')
@@ -787,13 +963,13 @@ class TestStorageHostTask(test.TestCase):
                              mock_storage_host_update,
                              mock_storage_host_del,
                              mock_storage_hosts_get_all,
-                             mock_list_storage_hosts, get_lock):
+                             mock_list_storage_hosts, set_synced):
         storage_host_obj = resources.StorageHostTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         storage_host_obj.sync()
         self.assertTrue(mock_list_storage_hosts.called)
         self.assertTrue(mock_storage_hosts_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # Collect the storage hosts from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -807,7 +983,7 @@ class TestStorageHostTask(test.TestCase):
 
         # Update the storage hosts to DB
         mock_list_storage_hosts.return_value \
-            = storage_hosts_list
+            = changed(storage_hosts_list)
         mock_storage_hosts_get_all.return_value \
             = storage_hosts_list
         storage_host_obj.sync()
@@ -829,7 +1005,7 @@ class TestStorageHostTask(test.TestCase):
 
 
 class TestStorageHostGroupTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_storage_host_groups')
     @mock.patch('delfin.db.storage_host_groups_get_all')
     @mock.patch('delfin.db.storage_host_groups_delete')
@@ -839,13 +1015,13 @@ class TestStorageHostGroupTask(test.TestCase):
                              mock_storage_host_group_update,
                              mock_storage_host_group_del,
                              mock_storage_host_groups_get_all,
-                             mock_list_storage_host_groups, get_lock):
+                             mock_list_storage_host_groups, set_synced):
         storage_host_group_obj = resources.StorageHostGroupTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         storage_host_group_obj.sync()
         self.assertTrue(mock_list_storage_host_groups.called)
         self.assertTrue(mock_storage_host_groups_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # Collect the storage host groups from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -861,7 +1037,7 @@ class TestStorageHostGroupTask(test.TestCase):
         mock_list_storage_host_groups.return_value \
             = storage_host_groups_list
         mock_storage_host_groups_get_all.return_value \
-            = storage_hg_list
+            = changed(storage_hg_list)
         storage_host_group_obj.sync()
         self.assertTrue(mock_storage_host_group_update.called)
 
@@ -881,7 +1057,7 @@ class TestStorageHostGroupTask(test.TestCase):
 
 
 class TestVolumeGroupTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_volume_groups')
     @mock.patch('delfin.db.volume_groups_get_all')
     @mock.patch('delfin.db.volume_groups_delete')
@@ -891,13 +1067,13 @@ class TestVolumeGroupTask(test.TestCase):
                              mock_volume_group_update,
                              mock_volume_group_del,
                              mock_volume_groups_get_all,
-                             mock_list_volume_groups, get_lock):
+                             mock_list_volume_groups, set_synced):
         volume_group_obj = resources.VolumeGroupTask(
             context, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         volume_group_obj.sync()
         self.assertTrue(mock_list_volume_groups.called)
         self.assertTrue(mock_volume_groups_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # Collect the volume groups from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -913,7 +1089,7 @@ class TestVolumeGroupTask(test.TestCase):
         mock_list_volume_groups.return_value \
             = volume_groups_list
         mock_volume_groups_get_all.return_value \
-            = vg_list
+            = changed(vg_list)
         volume_group_obj.sync()
         self.assertTrue(mock_volume_group_update.called)
 
@@ -933,7 +1109,7 @@ class TestVolumeGroupTask(test.TestCase):
 
 
 class TestPortGroupTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_port_groups')
     @mock.patch('delfin.db.port_groups_get_all')
     @mock.patch('delfin.db.port_groups_delete')
@@ -943,14 +1119,14 @@ class TestPortGroupTask(test.TestCase):
                              mock_port_group_update,
                              mock_port_group_del,
                              mock_port_groups_get_all,
-                             mock_list_port_groups, get_lock):
+                             mock_list_port_groups, set_synced):
         ctxt = context.get_admin_context()
         port_group_obj = resources.PortGroupTask(
             ctxt, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         port_group_obj.sync()
         self.assertTrue(mock_list_port_groups.called)
         self.assertTrue(mock_port_groups_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # Collect the storage host groups from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -966,7 +1142,7 @@ class TestPortGroupTask(test.TestCase):
         mock_list_port_groups.return_value \
             = port_groups_list
         mock_port_groups_get_all.return_value \
-            = pg_list
+            = changed(pg_list)
         port_group_obj.sync()
         self.assertTrue(mock_port_group_update.called)
 
@@ -986,7 +1162,7 @@ class TestPortGroupTask(test.TestCase):
 
 
 class TestMaskingViewTask(test.TestCase):
-    @mock.patch.object(coordination.LOCK_COORDINATOR, 'get_lock')
+    @mock.patch('delfin.db.storage_sync_status_decrease')
     @mock.patch('delfin.drivers.api.API.list_masking_views')
     @mock.patch('delfin.db.masking_views_get_all')
     @mock.patch('delfin.db.masking_views_delete')
@@ -996,14 +1172,14 @@ class TestMaskingViewTask(test.TestCase):
                              mock_masking_view_update,
                              mock_masking_view_del,
                              mock_masking_views_get_all,
-                             mock_list_masking_views, get_lock):
+                             mock_list_masking_views, set_synced):
         cntxt = context.get_admin_context()
         masking_view_obj = resources.MaskingViewTask(
             cntxt, 'c5c91c98-91aa-40e6-85ac-37a1d3b32bda')
         masking_view_obj.sync()
         self.assertTrue(mock_list_masking_views.called)
         self.assertTrue(mock_masking_views_get_all.called)
-        self.assertTrue(get_lock.called)
+        self.assertTrue(set_synced.called)
 
         # Collect the volume groups from fake_storage
         fake_storage_obj = fake_storage.FakeStorageDriver()
@@ -1017,7 +1193,7 @@ class TestMaskingViewTask(test.TestCase):
 
         # Update the volume groups to DB
         mock_list_masking_views.return_value \
-            = masking_views_list
+            = changed(masking_views_list)
         mock_masking_views_get_all.return_value \
             = masking_views_list
         masking_view_obj.sync()
@@ -0,0 +1,76 @@
+# Copyright 2022 The SODA Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import eventlet
+
+from delfin import context, test
+from delfin.common import constants
+from delfin.task_manager import sync_orchestrator
+
+running = {'current': 0, 'max': 0}
+
+
+class FakeResourceTask(object):
+    def __init__(self, context, storage_id):
+        self.storage_id = storage_id
+        self.sync_result = None
+
+    def sync(self):
+        running['current'] += 1
+        running['max'] = max(running['max'], running['current'])
+        eventlet.sleep(0.01)
+        running['current'] -= 1
+        self.sync_result = constants.ResourceSync.SUCCEED
+
+
+class FakeFailedResourceTask(FakeResourceTask):
+    def sync(self):
+        self.sync_result = constants.ResourceSync.FAILED
+
+
+FAKE_TASK = __name__ + '.FakeResourceTask'
+FAKE_FAILED_TASK = __name__ + '.FakeFailedResourceTask'
+
+
+class TestSyncOrchestrator(test.TestCase):
+    def setUp(self):
+        super(TestSyncOrchestrator, self).setUp()
+        running.update(current=0, max=0)
+        self.ctxt = context.get_admin_context()
+
+    def test_sync(self):
+        orchestrator = sync_orchestrator.SyncOrchestrator()
+        result = orchestrator.sync(self.ctxt, 'fake_storage_id',
+                                   [FAKE_TASK, FAKE_FAILED_TASK,
+                                    'delfin.fake.NotExistTask'])
+        self.assertEqual({FAKE_TASK: constants.ResourceSync.SUCCEED,
+                          FAKE_FAILED_TASK: constants.ResourceSync.FAILED,
+                          'delfin.fake.NotExistTask':
+                              constants.ResourceSync.FAILED}, result)
+
+    def test_sync_concurrency(self):
+        self.override_config('storage_sync_concurrency', 3)
+        orchestrator = sync_orchestrator.SyncOrchestrator()
+        orchestrator.sync(self.ctxt, 'fake_storage_id', [FAKE_TASK] * 10)
+        self.assertEqual(3, running['max'])
+
+    def test_sync_node_concurrency(self):
+        self.override_config('sync_pool_size', 2)
+        orchestrator = sync_orchestrator.SyncOrchestrator()
+        pool = eventlet.GreenPool()
+        for storage_id in ('fake_storage_1', 'fake_storage_2'):
+            pool.spawn(orchestrator.sync, self.ctxt, storage_id,
+                       [FAKE_TASK] * 4)
+        pool.waitall()
+        self.assertEqual(2, running['max'])
@@ -134,8 +134,24 @@ class ConsistentHashingTestCase(test.TestCase):
         part.join_group()
         self.assertTrue(crd.join_partitioned_group.called)
 
+    def test_get_task_executors(self):
+        crd = self.get_coordinator.return_value
+        crd.get_members.return_value.get.return_value = [b'node1', b'node2']
+        crd.get_member_capabilities.return_value.get.return_value = {}
+        part = coordination.ConsistentHashing()
+        part.start()
+        executors = part.get_task_executors(range(100))
+        self.assertEqual({'node1', 'node2'}, set(executors.values()))
+        self.assertEqual(executors[7], part.get_task_executor(7))
+        # The ring is built once
+        self.assertEqual(1, crd.get_members.call_count)
+
+        part.stop()
+        self.assertTrue(crd.unwatch_join_group.called)
+
     def test_register_watcher_func(self):
         crd = self.get_coordinator.return_value
+        crd.get_members.return_value.get.return_value = []
         part = coordination.ConsistentHashing()
         part.start()
         part.register_watcher_func(mock.Mock(), mock.Mock())
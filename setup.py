@@ -23,6 +23,11 @@ setup(
     author_email="Opensds-tech-discuss@lists.opensds.io",
     license="Apache 2.0",
     packages=find_packages(exclude=("tests", "tests.*")),
+    package_data={
+        'delfin.db.migrations': ['alembic.ini', 'alembic/*.py',
+                                 'alembic/script.py.mako',
+                                 'alembic/versions/*.py'],
+    },
     python_requires=">=2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*",
     entry_points={
         'delfin.alert.exporters': [